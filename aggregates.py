@@ -0,0 +1,157 @@
+import threading
+import weakref
+import pandas as pd
+from wordclouds import term_frequencies
+
+# Cubo de agregados da base: contagens, percentuais e N de cada coluna usada
+# pelos gráficos, legendas, relatório em texto e PDF, mais as tabelas cruzadas
+# dos gráficos por gênero. É montado numa única passada quando uma versão do
+# dataset aparece pela primeira vez e reaproveitado por todos os consumidores.
+GENDER_COLUMN = 'Identidade de Gênero'
+# Modelo A: variantes trans agrupadas em 'Feminina' (ver nota metodológica)
+GENDER_MODEL_A = 'Identidade de Gênero (Modelo A)'
+TRANS_VARIANTS = ['MULHER TRANS', 'Mulher trans', 'mulher trans', 'Mulher Trans']
+
+# Colunas contadas já na construção do cubo (as demais são contadas sob demanda)
+CUBE_COLUMNS = [
+    'Race_Group', 'Identidade de Gênero', 'Faixa Etária', 'Cidade', 'Employment_Status',
+    'Vínculo de Trabalho', 'Renda Familiar', 'Uso do Dinheiro (Trabalho)', 'CadÚnico',
+    'Possui Internet?', 'Tipo de Internet', 'Condição de Moradia', 'Frequência',
+    'Busca_Ativa_Result', 'Orientação Sexual', 'Tipo de Escola', 'Escolaridade da Mãe',
+    'Escolaridade do Pai', 'Plano de Saúde', 'Recebe Benefícios', 'Meio de Transporte',
+    'Sinal de Internet', 'Tipo de Moradia', 'Tem Filhos?', 'Possui Deficiência?',
+    'Tipo Sanguíneo', 'Entrevistador', 'Estado Civil', 'Uso de Substâncias',
+    'cotidiano_mora_com_quem', 'Ajuda no Sustento Familiar?', 'transporte_auxilio',
+    'cesta_basica', 'objetivo_frequencia',
+]
+
+# Tabelas cruzadas (linhas, colunas) usadas pelos gráficos 3, 7 e 15
+CUBE_CROSSTABS = [
+    (GENDER_MODEL_A, 'Race_Group'),
+    (GENDER_COLUMN, 'Employment_Status'),
+    ('Employment_Status', 'Frequência'),
+]
+
+def value_counts(series):
+    """value_counts sem categorias vazias (colunas categóricas) e com rótulos em texto simples."""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    if isinstance(counts.index, pd.CategoricalIndex):
+        counts.index = counts.index.astype(object)
+    return counts
+
+def gender_model_a(genders):
+    return genders.astype(object).replace(TRANS_VARIANTS, 'Feminina')
+
+class AggregateCube:
+    """Agregados de uma versão do dataset. As séries devolvidas são cópias."""
+
+    def __init__(self, df, columns=CUBE_COLUMNS, crosstabs=CUBE_CROSSTABS):
+        self.n = len(df)
+        self._df = weakref.ref(df)
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._crosstabs = {}
+        self._present = {}
+        self._terms = {}
+        for col in columns:
+            if col in df.columns:
+                self._counts[col] = value_counts(df[col])
+        for rows, cols in crosstabs:
+            self._build_crosstab(df, rows, cols)
+
+    def _series(self, df, col):
+        if col == GENDER_MODEL_A:
+            return gender_model_a(df[GENDER_COLUMN])
+        return df[col]
+
+    def _has(self, df, col):
+        return col in df.columns or (col == GENDER_MODEL_A and GENDER_COLUMN in df.columns)
+
+    def _build_crosstab(self, df, rows, cols):
+        if self._has(df, rows) and self._has(df, cols):
+            self._crosstabs[(rows, cols)] = pd.crosstab(self._series(df, rows), self._series(df, cols))
+
+    def _frame(self):
+        df = self._df()
+        if df is None:
+            raise RuntimeError("O DataFrame deste cubo não existe mais.")
+        return df
+
+    def counts(self, col):
+        """Contagem por valor (sem ausentes), em ordem decrescente."""
+        if col not in self._counts:
+            df = self._frame()
+            with self._lock:
+                if col not in self._counts:
+                    self._counts[col] = value_counts(self._series(df, col))
+        return self._counts[col].copy()
+
+    def percentages(self, col):
+        """Percentual de cada valor sobre o total de linhas da base."""
+        return self.counts(col) / max(self.n, 1) * 100
+
+    def answered(self, col):
+        """N de respostas preenchidas na coluna."""
+        return int(self.counts(col).sum())
+
+    def count_of(self, col, value):
+        return int(self.counts(col).get(value, 0))
+
+    def crosstab(self, rows, cols):
+        """Tabela cruzada de frequências absolutas (linhas com ausentes ficam de fora)."""
+        if (rows, cols) not in self._crosstabs:
+            df = self._frame()
+            with self._lock:
+                if (rows, cols) not in self._crosstabs:
+                    self._build_crosstab(df, rows, cols)
+        return self._crosstabs[(rows, cols)].copy()
+
+    def present(self, cols, how='any'):
+        """Linhas com as colunas preenchidas: todas (how='any') ou ao menos uma (how='all')."""
+        key = (tuple(cols), how)
+        if key not in self._present:
+            df = self._frame()
+            with self._lock:
+                self._present[key] = len(df[list(cols)].dropna(how=how))
+        return self._present[key]
+
+    def terms(self, *cols):
+        """Frequência dos termos do texto livre das colunas (nuvens de palavras); {} se nenhuma existir."""
+        if cols not in self._terms:
+            df = self._frame()
+            with self._lock:
+                if cols not in self._terms:
+                    self._terms[cols] = term_frequencies(*(df[col] for col in cols if col in df.columns))
+        return dict(self._terms[cols])
+
+    def summary(self, col, template="{label}: {count} ({percent:.1f}%)"):
+        """Uma linha formatada por valor, com contagem e percentual sobre a base."""
+        return [template.format(label=label, count=count, percent=percent)
+                for (label, count), percent in zip(self.counts(col).items(), self.percentages(col))]
+
+_cubes = {}
+_cubes_lock = threading.Lock()
+
+def cube_for(df):
+    """Cubo da versão do dataset `df`, montado na primeira chamada e liberado junto com o df.
+
+    A identidade do objeto é a versão: o df compartilhado pelo app (e o usado
+    numa geração de PDF) não é alterado depois de carregado.
+    """
+    key = id(df)
+    cube = _cubes.get(key)
+    if cube is not None and cube._df() is df:
+        return cube
+    with _cubes_lock:
+        cube = _cubes.get(key)
+        if cube is None or cube._df() is not df:
+            cube = AggregateCube(df)
+            _cubes[key] = cube
+            weakref.finalize(df, _discard, key, cube)
+    return cube
+
+def _discard(key, cube):
+    with _cubes_lock:
+        if _cubes.get(key) is cube:
+            del _cubes[key]
@@ -1,10 +1,20 @@
 import streamlit as st
 import pandas as pd
-from data_loader import load_data
-import visualizations as viz
+from data_cache import load_data_cached, dataset_key
+from shared_cache import shared_cache
+from snapshot import preferred_source
+from cras_mapping import default_resolver
+from aggregates import cube_for, GENDER_MODEL_A, TRANS_VARIANTS
+from indicators import indicator_flags, indicator_tags, row_styles, eligibility_styles
+import eligibility
+from table_view import index_for, paged_table
+from cohort_filters import BitmapIndex, sidebar_filters, selection_key, filtered_frame, describe_selection
+import io
 import os
+import sys
 from datetime import datetime
-from export_pdf import generate_student_profile_pdf
+from pdf_profiles import QUALITY_PROFILES, QUALITY_LABELS
+from pdf_jobs import pdf_jobs, STATUS_FAILED
 
 # v1.1 - Added data captions
 
@@ -94,17 +104,63 @@ section = st.sidebar.radio("Ir para:", [
     "Gestão e Operacionalização da Pesquisa"
 ])
 
+# Colunas da busca e dos filtros da tabela do Resumo Geral
+SUMMARY_SEARCH_COLUMNS = ['nome_completo', 'Perfil', 'Bairro', 'Cidade', 'CRAS de Referência', 'Entrevistador',
+                          'email', 'cpf']
+SUMMARY_FILTER_COLUMNS = ['status_formulario', 'Cidade', 'CRAS de Referência', 'Entrevistador', 'Faixa Etária',
+                          'Race_Group', 'Identidade de Gênero']
+
 # Load Data
 CSV_PATH = 'data/entrevistas_backup.csv'
+# Snapshot Parquet da mesma base (python snapshot.py importar data/entrevistas_backup.csv): usado
+# só se foi gerado a partir do conteúdo atual do CSV; senão o CSV é lido diretamente
+SNAPSHOT_PATH = 'data/entrevistas_backup.parquet'
+CSV_PATH, snapshot_stale = preferred_source(CSV_PATH, SNAPSHOT_PATH)
+if snapshot_stale:
+    st.sidebar.warning(f"{SNAPSHOT_PATH} é de uma versão anterior do CSV e foi ignorado. "
+                       f"Para atualizá-lo: python snapshot.py importar {CSV_PATH}")
 try:
-    df = load_data(CSV_PATH)
+    # A mesma versão do dataset é compartilhada por todas as sessões abertas
+    REFERENCE_DATE = datetime.now().date()  # idades calculadas em relação a hoje
+    # Colunas de baixa cardinalidade como categóricas: menos memória por sessão
+    DATASET_KEY = dataset_key(CSV_PATH, REFERENCE_DATE, compact=True)
+    df = shared_cache.get_or_compute(('dataset', DATASET_KEY), lambda: load_data_cached(CSV_PATH, REFERENCE_DATE, compact=True))
 except Exception as e:
     st.error(f"Erro ao carregar os dados: {e}")
     st.stop()
 
+# Filtros de coorte da barra lateral, resolvidos sobre bitmaps por valor (cohort_filters.py).
+# Valem para os Eixos: a base filtrada e o que é calculado sobre ela (gráficos, cubo de
+# agregados, elegibilidade) ficam no cache pela chave da coorte (VIEW_KEY)
+full_df = df
+cohort_index = shared_cache.get_or_compute(('bitmaps', DATASET_KEY), lambda: BitmapIndex(full_df))
+cohort = sidebar_filters(cohort_index)
+VIEW_KEY = DATASET_KEY
+if section.startswith("Eixo") and cohort:
+    VIEW_KEY = selection_key(DATASET_KEY, cohort)
+    df = shared_cache.get_or_compute(('dataset', VIEW_KEY), lambda: filtered_frame(full_df, cohort_index, cohort))
+    st.sidebar.caption(f"Coorte filtrada: {len(df)} de {len(full_df)} estudantes")
+
+def cached_chart(chart_func, df):
+    """Gera o gráfico uma única vez por versão do dataset e o reaproveita entre sessões."""
+    def build():
+        fig = chart_func(df)
+        # Nuvens de palavras vêm como BytesIO: guardamos os bytes para não
+        # compartilhar a posição de leitura do buffer entre sessões
+        if fig is not None and not hasattr(fig, 'to_json'):
+            return fig.getvalue()
+        return fig
+
+    result = shared_cache.get_or_compute(('chart', VIEW_KEY, chart_func.__name__), build)
+    if isinstance(result, bytes):
+        return io.BytesIO(result)
+    return result
+
 def render_chart_with_stats(chart_func, df, column_name=None, custom_stats=None, **kwargs):
     """Renderiza um gráfico e adiciona uma legenda com estatísticas em baixo."""
-    fig = chart_func(df)
+    import visualizations as viz
+
+    fig = cached_chart(chart_func, df)
     
     if fig is None:
         st.warning("Gráfico indisponível para os filtros selecionados.")
@@ -113,7 +169,7 @@ def render_chart_with_stats(chart_func, df, column_name=None, custom_stats=None,
     # Check if fig is a Plotly figure or an image buffer (WordCloud)
     if hasattr(fig, 'to_json'): # Plotly figure
         st.plotly_chart(fig, use_container_width=True, **kwargs)
-    else: # Matplotlib/WordCloud buffer
+    else: # PNG em BytesIO (nuvem de palavras)
         st.image(fig, use_container_width=True)
     
     if custom_stats:
@@ -126,7 +182,12 @@ def render_chart_with_stats(chart_func, df, column_name=None, custom_stats=None,
     if stats_text:
         st.caption(f"**Dados:** {stats_text}")
 
-if section == "Resumo Geral":
+if VIEW_KEY != DATASET_KEY and df.empty:
+    # A base carregou; é a combinação de filtros da coorte que não tem ninguém
+    st.header(section)
+    st.info(f"Nenhum estudante na coorte filtrada ({describe_selection(cohort)}). "
+            "Ajuste ou limpe os filtros da coorte na barra lateral.")
+elif section == "Resumo Geral":
 
     st.markdown("""
     Esta síntese apresenta os principais indicadores sociodemográficos dos estudantes do cursinho Educafro 2026, com base nas entrevistas realizadas até o momento.
@@ -170,56 +231,25 @@ if section == "Resumo Geral":
     filhos_count = len(df_completo[df_completo['Tem Filhos?'] == 'Sim'])
     col6.metric("Com Filhos", filhos_count)
 
-    # Function to generate indicator tags (professional)
-    def get_indicators(row):
-        tags = []
-        if pd.notnull(row.get('Tem Filhos?')) and str(row.get('Tem Filhos?')).strip() == 'Sim':
-            tags.append("[FIL]") # Children
-        if (pd.notnull(row.get('Possui Deficiência?')) and str(row.get('Possui Deficiência?')).strip() == 'Sim') or \
-           (pd.notnull(row.get('Familiar com Deficiência?')) and str(row.get('Familiar com Deficiência?')).strip() == 'Sim'):
-            tags.append("[PCD]") # Disability
-        if pd.notnull(row.get('Recebe Benefícios')) and str(row.get('Recebe Benefícios')).strip() == 'Sim':
-            tags.append("[BEN]") # Benefits
-        if row.get('Status_Emprego_Simplificado') == 'Empregado' or row.get('Employment_Status') == 'Empregado':
-            tags.append("[TRB]") # Employment
-        return " ".join(tags)
-
-    # Prepare DataFrame for Display
-    display_df = df.copy()
-    display_df['nome_completo'] = display_df['nome_completo'].str.title()
-
-    def get_indicators_full(row):
-        if str(row.get('status_formulario', '')).strip() == 'falta entrevistar':
-            return '[FALTA]'
-        return get_indicators(row)
-
-    display_df.insert(0, 'Perfil', display_df.apply(get_indicators_full, axis=1))
-
-    # Combined Styling Function
-    def style_row(row):
-        # Falta entrevistar — fundo cinza
-        if str(row.get('status_formulario', '')).strip() == 'falta entrevistar':
-            return ['background-color: #E2E8F0; color: #718096; font-style: italic'] * len(row)
-
-        # 1. Background logic (Workers)
-        is_worker = pd.notnull(row.get('Vínculo de Trabalho')) and row.get('Vínculo de Trabalho') != 'Não'
-        row_bg = 'background-color: #FED7D7' if is_worker else ''
-
-        # 2. Text Color logic (Benefits)
-        receives_benefits = pd.notnull(row.get('Recebe Benefícios')) and str(row.get('Recebe Benefícios')).strip() == 'Sim'
-        name_color = 'color: #D63031; font-weight: bold' if receives_benefits else 'color: #2D3436; font-weight: bold'
-
-        styles = [row_bg] * len(row)
-
-        if 'nome_completo' in row.index:
-            name_idx = row.index.get_loc('nome_completo')
-            styles[name_idx] = f"{row_bg}; {name_color}"
-
-        return styles
-
-    # Apply the styling
-    styled_df = display_df.style.apply(style_row, axis=1)
-    st.dataframe(styled_df, use_container_width=True, hide_index=True)
+    # Tags e estilos saem de máscaras por coluna, calculadas uma vez por versão do dataset.
+    # Busca, filtros e ordem rodam no servidor (table_view); só a página exibida é
+    # copiada, estilizada e enviada ao navegador
+    flags = shared_cache.get_or_compute(('indicadores', VIEW_KEY), lambda: indicator_flags(df))
+    index_for(df).derive('Perfil', lambda _: indicator_tags(flags))
+
+    def summary_page(positions):
+        # Prepare DataFrame for Display
+        display_df = df.iloc[positions].copy()
+        display_df['nome_completo'] = display_df['nome_completo'].str.title()
+        page_flags = flags.iloc[positions]
+        display_df.insert(0, 'Perfil', indicator_tags(page_flags))
+
+        # Apply the styling (cinza: falta entrevistar, rosado: trabalhador, nome em vermelho: benefícios)
+        page_styles = row_styles(page_flags, list(display_df.columns))
+        return display_df.style.apply(lambda _: page_styles, axis=None)
+
+    paged_table(df, 'resumo', summary_page, search_columns=SUMMARY_SEARCH_COLUMNS,
+                filter_columns=SUMMARY_FILTER_COLUMNS, sort_columns=['Perfil'] + list(df.columns))
         
     st.markdown("""
     <div style='background-color: #F8F9FA; padding: 10px; border-radius: 5px; border: 1px solid #E9ECEF;'>
@@ -241,82 +271,43 @@ elif section == "Eixo 0: Secras de Referência do Estudante":
     else:
         st.markdown("Esta seção acompanha o status e o CRAS de cada estudante para fins de inscrição no CadÚnico.")
 
-        # ── Elegibilidade ao CadÚnico ────────────────────────────────────────
-        # Salário mínimo 2026: R$ 1.518,00
-        # Critérios: renda familiar total ≤ 3 SM (R$ 4.554,00)
-        #            OU renda per capita ≤ ½ SM (R$ 759,00)
-        # Como não temos nº de pessoas por faixa de renda per capita com precisão,
-        # classificamos pela renda familiar total usando as faixas do formulário.
-
-        ELEGIVEL_RENDA = {
-            # Faixas claramente abaixo de 3 SM (R$ 4.554,00)
-            "De R$ 1.046,00 R$ 2080,00":    "✅ Elegível",
-            "De R$ 2081,00 a R$ 3.120,00":  "✅ Elegível",
-            "De R$ 3.120,00 a R$ 4.160,00": "✅ Elegível",
-            # R$ 4.161 a R$ 5.200 — parte inferior abaixo de 3 SM; marcamos como provável
-            "De R$ 4.161,00 a 5.200,00":    "⚠️ Verificar (pode ser elegível)",
-            # Acima de 3 SM
-            "Acima de R$ 5.201,00":          "❌ Não elegível",
-            # Declarados como Outro — requer análise manual
-            "Outro":                          "⚠️ Verificar",
-            "Outro:":                         "⚠️ Verificar",
-        }
-
-        def check_cadunico_elegibility(row):
-            # Se já tem CadÚnico, não precisa requerer
-            cadunico_val = str(row.get('CadÚnico', '')).strip().lower()
-            if 'sim' in cadunico_val:
-                return "✅ Já possui CadÚnico"
-            renda = str(row.get('Renda Familiar', '')).strip()
-            return ELEGIVEL_RENDA.get(renda, "⚠️ Verificar")
-
-        df_eixo0 = df.copy()
-        df_eixo0['Pode Requerer CadÚnico?'] = df_eixo0.apply(check_cadunico_elegibility, axis=1)
+        # ── Elegibilidade ao CadÚnico (regras versionadas em regras_cadunico.json) ──
+        # Situação de cada estudante e contagens saem da mesma passada, por versão do dataset e das regras
+        cadunico_rules = eligibility.load_rules()
+        cadunico = shared_cache.get_or_compute(('cadunico', VIEW_KEY, cadunico_rules.key),
+                                               lambda: eligibility.evaluate(df, cadunico_rules))
 
         # ── Métricas de elegibilidade ────────────────────────────────────────
-        total = len(df_eixo0)
-        ja_tem    = (df_eixo0['Pode Requerer CadÚnico?'] == "✅ Já possui CadÚnico").sum()
-        elegiveis = (df_eixo0['Pode Requerer CadÚnico?'] == "✅ Elegível").sum()
-        verificar = df_eixo0['Pode Requerer CadÚnico?'].str.startswith("⚠️").sum()
-        nao_eleg  = (df_eixo0['Pode Requerer CadÚnico?'] == "❌ Não elegível").sum()
-
         col_m1, col_m2, col_m3, col_m4 = st.columns(4)
-        col_m1.metric("👥 Total de Estudantes", total)
-        col_m2.metric("✅ Já possuem CadÚnico", ja_tem)
-        col_m3.metric("📋 Elegíveis (sem CadÚnico)", elegiveis)
-        col_m4.metric("⚠️ Verificar / Não elegíveis", verificar + nao_eleg)
+        col_m1.metric("👥 Total de Estudantes", cadunico.total)
+        col_m2.metric("✅ Já possuem CadÚnico", cadunico.has)
+        col_m3.metric("📋 Elegíveis (sem CadÚnico)", cadunico.eligible)
+        col_m4.metric("⚠️ Verificar / Não elegíveis", cadunico.check + cadunico.not_eligible)
 
         st.info(
-            "**Critérios de Elegibilidade ao CadÚnico (Lei nº 10.836/2004):** "
-            "Renda familiar total de até **3 salários mínimos** (R\\$ 4.554,00 em 2026) "
-            "**ou** renda mensal per capita de até **meio salário mínimo** (R\\$ 759,00)."
+            f"**Critérios de Elegibilidade ao CadÚnico (Lei nº 10.836/2004), regras {cadunico_rules.version}:** "
+            f"{cadunico_rules.summary()} O tamanho da família para a renda per capita é estimado "
+            "pela resposta \"com quem mora\"."
         )
 
         st.divider()
 
         # ── Tabela principal ─────────────────────────────────────────────────
-        display_cols = ['nome_completo', 'Bairro', 'CRAS de Referência', 'Renda Familiar',
-                        'CadÚnico', 'Pode Requerer CadÚnico?']
-        available_cols = [c for c in display_cols if c in df_eixo0.columns]
-
-        subset_df = df_eixo0[available_cols].copy()
-        if 'nome_completo' in subset_df.columns:
-            subset_df['nome_completo'] = subset_df['nome_completo'].str.title()
-
-        def style_eixo_0(row):
-            val = str(row.get('Pode Requerer CadÚnico?', ''))
-            if 'Já possui' in val:
-                return ['background-color: #D4EDDA; color: #155724'] * len(row)
-            elif val.startswith('✅'):
-                return ['background-color: #CCE5FF; color: #004085'] * len(row)
-            elif val.startswith('⚠️'):
-                return ['background-color: #FFF3CD; color: #856404'] * len(row)
-            elif val.startswith('❌'):
-                return ['background-color: #F8D7DA; color: #721C24'] * len(row)
-            return [''] * len(row)
-
-        styled_subset = subset_df.style.apply(style_eixo_0, axis=1)
-        st.dataframe(styled_subset, use_container_width=True, hide_index=True)
+        display_cols = ['nome_completo', 'Bairro', 'CRAS de Referência', 'Renda Familiar', 'CadÚnico']
+        available_cols = [c for c in display_cols if c in df.columns]
+        index_for(df).derive('Pode Requerer CadÚnico?', lambda _: cadunico.labels, version=cadunico.rules_key)
+
+        def eixo0_page(positions):
+            subset_df = df.iloc[positions][available_cols].copy()
+            if 'nome_completo' in subset_df.columns:
+                subset_df['nome_completo'] = subset_df['nome_completo'].str.title()
+            subset_df['Pode Requerer CadÚnico?'] = cadunico.labels.iloc[positions]
+            page_styles = eligibility_styles(subset_df['Pode Requerer CadÚnico?'], list(subset_df.columns))
+            return subset_df.style.apply(lambda _: page_styles, axis=None)
+
+        paged_table(df, 'eixo0', eixo0_page, search_columns=['nome_completo', 'Bairro', 'CRAS de Referência'],
+                    filter_columns=['Pode Requerer CadÚnico?', 'CRAS de Referência', 'CadÚnico', 'Renda Familiar'],
+                    sort_columns=available_cols + ['Pode Requerer CadÚnico?'])
 
         st.markdown("""
         <div style='background-color: #F8F9FA; padding: 10px; border-radius: 5px; border: 1px solid #E9ECEF;'>
@@ -329,7 +320,17 @@ elif section == "Eixo 0: Secras de Referência do Estudante":
         </div>
         """, unsafe_allow_html=True)
 
+        # ── Curadoria do mapeamento bairro → CRAS ────────────────────────────
+        if 'Bairro' in df.columns:
+            cras_report = default_resolver.report(df['Bairro'])
+            pending = cras_report[cras_report['Método'] != 'exato']
+            with st.expander(f"Bairros sem correspondência exata no mapeamento de CRAS ({len(pending)})"):
+                st.caption("Correspondências aproximadas mostram o bairro de referência e a confiança (0-1). "
+                           "Bairros não resolvidos devem ser incluídos no mapeamento em cras_mapping.py.")
+                st.dataframe(pending, use_container_width=True, hide_index=True)
+
 elif section == "Eixo 1: Perfil Sociodemográfico":
+    import visualizations as viz  # plotly/wordcloud só nas seções com gráficos
     st.header("Eixo 1: Perfil Sociodemográfico")
     
     if len(df) == 0:
@@ -340,10 +341,10 @@ elif section == "Eixo 1: Perfil Sociodemográfico":
             render_chart_with_stats(viz.chart_1_race_composition, df, 'Race_Group')
         with col2:
             # Gera estatísticas de gênero dinamicamente (Modelo A: MULHER TRANS agrupada em Feminina)
-            _trans = ['MULHER TRANS', 'Mulher trans', 'mulher trans', 'Mulher Trans']
-            _g_series = df['Identidade de Gênero'].replace(_trans, 'Feminina').value_counts()
+            _cube = cube_for(df)
+            _g_series = _cube.counts(GENDER_MODEL_A)
             _n = _g_series.sum()
-            _trans_count = df['Identidade de Gênero'].isin(_trans).sum()
+            _trans_count = sum(_cube.count_of('Identidade de Gênero', v) for v in TRANS_VARIANTS)
             _parts = [f"{lbl}: {cnt} ({cnt/_n*100:.1f}%)" for lbl, cnt in _g_series.items()]
             _nota = f" — Nota: {_trans_count} estudante(s) se declarou mulher trans (inclusa em Feminina)." if _trans_count > 0 else ""
             gender_note = " | ".join(_parts) + _nota
@@ -372,6 +373,7 @@ elif section == "Eixo 1: Perfil Sociodemográfico":
         render_chart_with_stats(viz.chart_38_parental_professions_cloud, df)
 
 elif section == "Eixo 2: Trabalho, Renda e Condições Socioeconômicas":
+    import visualizations as viz
     st.header("🔹 EIXO 2 — Trabalho, Renda e Condições Socioeconômicas")
     
     if len(df) == 0:
@@ -388,7 +390,7 @@ elif section == "Eixo 2: Trabalho, Renda e Condições Socioeconômicas":
             render_chart_with_stats(viz.chart_8_job_categories, df, 'Vínculo de Trabalho')
         with col_job2:
             st.subheader("Vínculos Diversos")
-            wc_jobs = viz.chart_8b_job_wordcloud(df)
+            wc_jobs = cached_chart(viz.chart_8b_job_wordcloud, df)
             if wc_jobs:
                 st.image(wc_jobs)
             else:
@@ -438,6 +440,7 @@ elif section == "Eixo 2: Trabalho, Renda e Condições Socioeconômicas":
         st.info("Os dados de infrequência não constam no formulário atual.")
 
 elif section == "Eixo 3: Mobilidade e Interesses Formativos":
+    import visualizations as viz
     st.header("🔹 EIXO 3 — Mobilidade e Interesses Formativos")
     
     if len(df) == 0:
@@ -447,7 +450,7 @@ elif section == "Eixo 3: Mobilidade e Interesses Formativos":
         
         with col1:
             st.subheader("Temas de Interesse")
-            wc_interests = viz.chart_16_interests(df)
+            wc_interests = cached_chart(viz.chart_16_interests, df)
             if wc_interests:
                 st.image(wc_interests)
             else:
@@ -455,7 +458,7 @@ elif section == "Eixo 3: Mobilidade e Interesses Formativos":
                 
         with col2:
             st.subheader("Cursos Desejados")
-            wc_courses = viz.chart_17_courses(df)
+            wc_courses = cached_chart(viz.chart_17_courses, df)
             if wc_courses:
                 st.image(wc_courses)
             else:
@@ -468,6 +471,7 @@ elif section == "Eixo 3: Mobilidade e Interesses Formativos":
         render_chart_with_stats(viz.chart_40_study_availability, df)
 
 elif section == "Eixo 4: Saúde e Assistência":
+    import visualizations as viz
     st.header("🔹 EIXO 4 — Saúde e Assistência")
     
     if len(df) == 0:
@@ -497,6 +501,7 @@ elif section == "Eixo 4: Saúde e Assistência":
         render_chart_with_stats(viz.chart_41_health_needs_cloud, df)
 
 elif section == "Gestão e Operacionalização da Pesquisa":
+    import visualizations as viz
     st.header("🔹 Gestão e Operacionalização da Pesquisa")
     
     if len(df) == 0:
@@ -509,16 +514,61 @@ st.sidebar.markdown("---")
 # PDF Export Button
 st.sidebar.subheader("Relat\u00f3rio")
 try:
+    pdf_quality = st.sidebar.selectbox(
+        "Qualidade das imagens", list(QUALITY_PROFILES),
+        format_func=lambda q: QUALITY_LABELS.get(q, q),
+    )
     if st.sidebar.button("📄 Gerar Relatório PDF"):
-        with st.spinner("Gerando PDF... Isso pode levar alguns segundos."):
-            pdf_bytes = generate_student_profile_pdf(df)
-            st.sidebar.download_button(
-                label="⬇️ Baixar Relatório PDF",
-                data=pdf_bytes,
-                file_name=f"Perfil_Educafro_2026_{datetime.now().strftime('%Y%m%d')}.pdf",
-                mime="application/pdf"
-            )
+        # A geração roda na fila em segundo plano; pedidos iguais reaproveitam o mesmo job.
+        # O relatório é sempre da base inteira (relatórios por coorte: batch_reports.py)
+        job = pdf_jobs.submit(('pdf', DATASET_KEY, pdf_quality), full_df, quality=pdf_quality)
+        st.session_state['pdf_job'] = job.id
+
+    pdf_job = pdf_jobs.get(st.session_state.get('pdf_job'))
+
+    @st.fragment(run_every=1.0 if pdf_job is not None and pdf_job.active else None)
+    def pdf_job_status():
+        """Progresso do PDF na barra lateral; só este trecho é reexecutado enquanto ele é gerado."""
+        job = pdf_jobs.get(st.session_state.get('pdf_job'))
+        if job is None:
+            return
+        if job.active:
+            fraction, text = job.progress()
+            st.progress(fraction, text=text)
+            return
+        if pdf_job is not None and pdf_job.active:
+            st.rerun()  # terminou: recarrega o app para parar a atualização periódica
+        if job.status == STATUS_FAILED:
+            st.error(f"Erro ao gerar PDF: {job.error}")
+            return
+        if job.render_errors:
+            st.warning(f"{len(job.render_errors)} gráfico(s) não puderam ser renderizados e ficaram de fora do PDF.")
+        st.download_button(
+            label="⬇️ Baixar Relatório PDF",
+            data=job.result,
+            file_name=f"Perfil_Educafro_2026_{datetime.now().strftime('%Y%m%d')}.pdf",
+            mime="application/pdf"
+        )
+
+    with st.sidebar:
+        pdf_job_status()
 except Exception as e:
     st.sidebar.error(f"Erro ao gerar PDF: {e}")
 
+# Cache compartilhado entre sessões (para operadores)
+_cache_stats = shared_cache.stats()
+st.sidebar.caption(
+    f"Cache: {_cache_stats['hits']} acertos / {_cache_stats['misses']} falhas "
+    f"({_cache_stats['hit_rate']:.0f}%) · {_cache_stats['entries']} itens · "
+    f"{_cache_stats['bytes_used'] / 1024 / 1024:.1f} de {_cache_stats['max_bytes'] / 1024 / 1024:.0f} MB"
+)
+# Só há estatísticas de renderização depois de um PDF ter importado o pool
+_render_pool = sys.modules.get('renderer_pool')
+_render_stats = _render_pool.renderer_pool.stats() if _render_pool else {'renders': 0}
+if _render_stats['renders']:
+    st.sidebar.caption(
+        f"Renderização: {_render_stats['renders']} gráficos · mediana {_render_stats['p50_ms']:.0f} ms · "
+        f"p95 {_render_stats['p95_ms']:.0f} ms · {_render_stats['restarts']} reinícios"
+    )
+
 st.sidebar.caption("Desenvolvido por Heric Moura para Educafro Valongo \u00a9 2026")
@@ -1,21 +1,37 @@
 import pandas as pd
+import hashlib
+import json
 import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snapshot import is_snapshot, read_snapshot, csv_to_snapshot, KIND_RAW
 
 # Paths
 CONSOLIDATED_OLD = 'entrevistas_educafro_consolidated_final_20260308.csv'
 NEW_DATA = 'entrevistas atualizada.csv'
 DATA_DIR = 'data'
 CONSOLIDATED_NEW = os.path.join(DATA_DIR, 'entrevistas_consolidated.csv')
+# Snapshot colunar da base consolidada (leitura rápida e tipada por load_data)
+CONSOLIDATED_SNAPSHOT = os.path.join(DATA_DIR, 'entrevistas_consolidated.parquet')
+# Base indexada (SQLite, chave primária = form_uuid) usada pela ingestão incremental
+STORE_PATH = os.path.join(DATA_DIR, 'entrevistas.sqlite')
+
+def read_base(path):
+    """Lê um export CSV ou um snapshot Parquet bruto."""
+    return read_snapshot(path, expected_kind=KIND_RAW) if is_snapshot(path) else pd.read_csv(path)
 
 def merge():
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
         
     print(f"Lendo {CONSOLIDATED_OLD}...")
-    df_old = pd.read_csv(CONSOLIDATED_OLD)
+    df_old = read_base(CONSOLIDATED_OLD)
     
     print(f"Lendo {NEW_DATA}...")
-    df_new = pd.read_csv(NEW_DATA)
+    df_new = read_base(NEW_DATA)
     
     # Combinar ambos
     # Priorizar o 'form_uuid' para identificar registros únicos
@@ -38,10 +54,181 @@ def merge():
         df_merged = df_combined.drop_duplicates(subset=['id'], keep='first')
         print(f"Removidas {initial_count - len(df_merged)} duplicatas por id (form_uuid ausente).")
 
-    # Salvar o novo consolidado
+    # Salvar o novo consolidado (CSV para exportação e o snapshot gerado dele, que os
+    # leitores usam enquanto estiver em dia com o CSV; ver snapshot.preferred_source)
     df_merged.to_csv(CONSOLIDATED_NEW, index=False)
+    csv_to_snapshot(CONSOLIDATED_NEW, CONSOLIDATED_SNAPSHOT)
     print(f"Sucesso! Total de registros únicos: {len(df_merged)}")
-    print(f"Arquivo salvo em: {CONSOLIDATED_NEW}")
+    print(f"Arquivos salvos em: {CONSOLIDATED_SNAPSHOT} e {CONSOLIDATED_NEW}")
+
+# ── Ingestão incremental ────────────────────────────────────────────────
+# Em vez de reler e reescrever todo o histórico, guardamos a marca d'água
+# (maior updated_at/id já ingerido) e fazemos upsert por form_uuid só das
+# linhas mais novas. O custo passa a ser proporcional às entrevistas novas.
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def _row_hash(row, columns):
+    payload = json.dumps([row.get(c, '') for c in columns], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _row_key(row, columns):
+    """form_uuid identifica a entrevista; sem ele, caímos para id, CPF e, por fim, o conteúdo da linha
+    (registros 'falta entrevistar' lançados à mão não têm nenhum identificador)."""
+    if row.get('form_uuid'):
+        return row['form_uuid']
+    if row.get('id'):
+        return f"id:{row['id']}"
+    if row.get('cpf'):
+        return f"cpf:{row['cpf']}"
+    return f"linha:{_row_hash(row, columns)}"
+
+def open_store(store_path=STORE_PATH):
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(store_path)
+    conn.execute('CREATE TABLE IF NOT EXISTS estado (chave TEXT PRIMARY KEY, valor TEXT)')
+    conn.execute('''CREATE TABLE IF NOT EXISTS entrevistas (
+        _chave TEXT PRIMARY KEY, _atualizado_utc TEXT, _hash TEXT)''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS execucoes (
+        executado_em TEXT, arquivo TEXT, lidas INTEGER, ignoradas_marca INTEGER,
+        inseridas INTEGER, atualizadas INTEGER, inalteradas INTEGER, marca TEXT)''')
+    return conn
+
+def _get_state(conn, key, default=None):
+    row = conn.execute('SELECT valor FROM estado WHERE chave = ?', (key,)).fetchone()
+    return json.loads(row[0]) if row else default
+
+def _set_state(conn, key, value):
+    conn.execute('INSERT OR REPLACE INTO estado (chave, valor) VALUES (?, ?)', (key, json.dumps(value)))
+
+def _ensure_columns(conn, columns):
+    """Acompanha a evolução do formulário: colunas novas viram colunas novas na base."""
+    order = _get_state(conn, 'colunas', [])
+    existing = {r[1] for r in conn.execute('PRAGMA table_info(entrevistas)')}
+    for col in columns:
+        if col not in existing:
+            conn.execute(f'ALTER TABLE entrevistas ADD COLUMN {_quote(col)} TEXT')
+        if col not in order:
+            order.append(col)
+    _set_state(conn, 'colunas', order)
+    return order
+
+def merge_incremental(new_path=NEW_DATA, store_path=STORE_PATH):
+    """Upsert por form_uuid das linhas mais novas que a marca d'água. Retorna o resumo da execução."""
+    # Tudo como texto, exatamente como veio no export (vazio continua vazio)
+    df_new = pd.read_csv(new_path, dtype=str, keep_default_na=False)
+    conn = open_store(store_path)
+    try:
+        columns = _ensure_columns(conn, list(df_new.columns))
+        watermark = _get_state(conn, 'marca_dagua')  # [updated_at ISO UTC, id]
+
+        ts = pd.to_datetime(df_new.get('updated_at', pd.Series('', index=df_new.index)), errors='coerce', utc=True)
+        df_new['_atualizado_utc'] = ts.map(lambda t: t.isoformat() if pd.notna(t) else '')
+        ids = pd.to_numeric(df_new.get('id', pd.Series('', index=df_new.index)), errors='coerce').fillna(-1).astype(int)
+        df_new['_id'] = ids
+
+        total_read = len(df_new)
+        if watermark:
+            # Linhas sem data não podem ser comparadas com a marca: sempre reavaliadas
+            newer = (df_new['_atualizado_utc'] > watermark[0]) | \
+                    ((df_new['_atualizado_utc'] == watermark[0]) & (df_new['_id'] > watermark[1])) | \
+                    (df_new['_atualizado_utc'] == '')
+            df_new = df_new[newer]
+        skipped = total_read - len(df_new)
+
+        # Dentro do próprio lote, fica só a versão mais recente de cada entrevista
+        df_new = df_new.sort_values(['_atualizado_utc', '_id'])
+        records = df_new.to_dict('records')
+        latest = {}
+        for row in records:
+            latest[_row_key(row, columns)] = row
+
+        # Busca pelo índice da chave primária só as entrevistas do lote
+        existing = {}
+        keys = list(latest)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for key, updated, row_hash in conn.execute(
+                    f'SELECT _chave, _atualizado_utc, _hash FROM entrevistas WHERE _chave IN ({placeholders})', chunk):
+                existing[key] = (updated, row_hash)
+
+        inserted, updated, unchanged = [], [], 0
+        for key, row in latest.items():
+            row_hash = _row_hash(row, columns)
+            if key not in existing:
+                inserted.append((key, row, row_hash))
+            elif existing[key][1] == row_hash or row['_atualizado_utc'] < existing[key][0]:
+                unchanged += 1  # igual, ou mais antiga que a versão guardada
+            else:
+                updated.append((key, row, row_hash))
+
+        cols_sql = ', '.join(['_chave', '_atualizado_utc', '_hash'] + [_quote(c) for c in columns])
+        placeholders = ', '.join('?' * (len(columns) + 3))
+        conn.executemany(
+            f'INSERT OR REPLACE INTO entrevistas ({cols_sql}) VALUES ({placeholders})',
+            [[key, row['_atualizado_utc'], row_hash] + [row.get(c, '') for c in columns]
+             for key, row, row_hash in inserted + updated]
+        )
+
+        if records:
+            last = max(records, key=lambda r: (r['_atualizado_utc'], r['_id']))
+            candidate = [last['_atualizado_utc'], int(last['_id'])]
+            if last['_atualizado_utc'] and (not watermark or candidate > watermark):
+                watermark = candidate
+                _set_state(conn, 'marca_dagua', watermark)
+
+        summary = {
+            'arquivo': os.path.basename(new_path),
+            'lidas': total_read,
+            'ignoradas_marca': skipped,
+            'inseridas': len(inserted),
+            'atualizadas': len(updated),
+            'inalteradas': unchanged,
+            'marca': watermark,
+        }
+        conn.execute('INSERT INTO execucoes VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (
+            datetime.now(timezone.utc).isoformat(), summary['arquivo'], total_read, skipped,
+            len(inserted), len(updated), unchanged, json.dumps(watermark)))
+        conn.commit()
+        return summary
+    finally:
+        conn.close()
+
+def export_store(store_path=STORE_PATH, csv_path=CONSOLIDATED_NEW, snapshot_path=CONSOLIDATED_SNAPSHOT):
+    """Gera o CSV consolidado (exportação) e o snapshot Parquet a partir da base indexada."""
+    conn = open_store(store_path)
+    try:
+        columns = _get_state(conn, 'colunas', [])
+        cols_sql = ', '.join(_quote(c) for c in columns)
+        df = pd.read_sql_query(f'SELECT {cols_sql} FROM entrevistas ORDER BY _atualizado_utc DESC', conn)
+    finally:
+        conn.close()
+    df.to_csv(csv_path, index=False)
+    # Relê o CSV para o snapshot ter os mesmos tipos que load_data teria a partir do CSV
+    csv_to_snapshot(csv_path, snapshot_path)
+    return len(df)
+
+def print_summary(summary):
+    print(f"[{summary['arquivo']}] lidas: {summary['lidas']} | ignoradas pela marca d'água: {summary['ignoradas_marca']} | "
+          f"inseridas: {summary['inseridas']} | atualizadas: {summary['atualizadas']} | inalteradas: {summary['inalteradas']}")
+    if summary['marca']:
+        print(f"  marca d'água: updated_at={summary['marca'][0]} id={summary['marca'][1]}")
 
 if __name__ == "__main__":
-    merge()
+    # Uso: python merge_new_data.py                         -> merge completo (comportamento original)
+    #      python merge_new_data.py --incremental [arq ...]  -> upsert incremental na base indexada
+    #      python merge_new_data.py --exportar               -> CSV consolidado + snapshot, a partir da base
+    # A ingestão não reescreve o consolidado: a exportação lê a base inteira,
+    # então roda só quando alguém precisa do arquivo.
+    args = sys.argv[1:]
+    if args and args[0] == '--incremental':
+        for path in (args[1:] or [NEW_DATA]):
+            print_summary(merge_incremental(path))
+        print(f"Base indexada atualizada em {STORE_PATH}. Para gerar o consolidado: python merge_new_data.py --exportar")
+    elif args and args[0] == '--exportar':
+        total = export_store()
+        print(f"Base consolidada exportada: {total} registros em {CONSOLIDATED_SNAPSHOT} e {CONSOLIDATED_NEW}")
+    else:
+        merge()
@@ -0,0 +1,154 @@
+import gc
+import json
+import os
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from data_cache import load_data_cached, cache_path
+from snapshot import read_snapshot
+
+# Relatórios PDF por grupo (CRAS, entrevistador(a), cidade...) em lote.
+# A base é limpa uma única vez (snapshot Parquet do data_cache); cada processo
+# do pool lê esse snapshot uma vez no initializer e gera os PDFs dos grupos que
+# receber, gravando direto em disco. O processo principal só guarda a coluna
+# de partição e as linhas do manifesto, então a memória fica limitada a
+# `processos` cópias da base, independentemente do número de grupos.
+BATCH_COLUMNS = {
+    'cras': 'CRAS de Referência',
+    'entrevistador': 'Entrevistador',
+    'cidade': 'Cidade',
+}
+BATCH_PROCESSES = int(os.environ.get('EDUCAFRO_BATCH_PROCESSES', str(min(4, os.cpu_count() or 1))))
+# Cada processo abre o próprio navegador; poucas abas por processo bastam
+BATCH_RENDER_TABS = os.environ.get('EDUCAFRO_BATCH_RENDER_TABS', '1')
+MIN_COHORT_ROWS = 1
+MANIFEST_NAME = 'manifesto.json'
+SOURCE_CSV = 'data/entrevistas_backup.csv'
+OUTPUT_DIR = os.path.join('artifacts', 'relatorios')
+
+# Estado de cada processo do pool (preenchido pelo initializer)
+_worker = {}
+
+def slugify(value):
+    """Nome de arquivo seguro a partir do valor do grupo."""
+    text = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii')
+    slug = ''.join(c if c.isalnum() else '_' for c in text).strip('_')
+    while '__' in slug:
+        slug = slug.replace('__', '_')
+    return slug[:80] or 'sem_nome'
+
+def resolve_column(name):
+    return BATCH_COLUMNS.get(name.lower(), name)
+
+def plan_cohorts(snapshot_path, column, min_rows=MIN_COHORT_ROWS):
+    """[(valor, linhas)] dos grupos da coluna, maiores primeiro (balanceia o pool)."""
+    values = read_snapshot(snapshot_path, columns=[column])
+    if column not in values.columns:
+        raise KeyError(f"Coluna '{column}' não existe na base.")
+    counts = values[column].value_counts()
+    counts = counts[counts >= min_rows]
+    return [(value, int(n)) for value, n in counts.items()], int(values[column].isna().sum())
+
+def _init_worker(snapshot_path, column):
+    df = read_snapshot(snapshot_path)
+    _worker['df'] = df
+    _worker['column'] = column
+    _worker['groups'] = df.groupby(column, observed=True, sort=False).indices
+
+def _render_cohort(value, output_path, options):
+    """Gera o PDF de um grupo (no processo do pool) e devolve a linha do manifesto."""
+    from export_pdf import generate_student_profile_pdf
+
+    started = time.perf_counter()
+    entry = {'valor': str(value), 'arquivo': os.path.basename(output_path), 'linhas': 0,
+             'bytes': 0, 'segundos': None, 'erros_renderizacao': 0, 'erro': None, 'pid': os.getpid()}
+    try:
+        cohort = _worker['df'].iloc[_worker['groups'][value]]
+        entry['linhas'] = len(cohort)
+        render_errors = []
+        pdf_bytes = generate_student_profile_pdf(cohort, errors=render_errors, **options)
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, output_path)
+        entry['bytes'] = len(pdf_bytes)
+        entry['erros_renderizacao'] = len(render_errors)
+        del cohort, pdf_bytes
+    except Exception as e:
+        entry['erro'] = f"{type(e).__name__}: {e}"
+    finally:
+        gc.collect()  # libera figuras/imagens antes do próximo grupo
+    entry['segundos'] = round(time.perf_counter() - started, 3)
+    return entry
+
+def generate_batch(column, source=SOURCE_CSV, output_dir=OUTPUT_DIR, processes=BATCH_PROCESSES,
+                   min_rows=MIN_COHORT_ROWS, **options):
+    """Gera um PDF por valor de `column` e grava o manifesto; devolve o manifesto."""
+    column = resolve_column(column)
+    started = time.perf_counter()
+
+    # Limpa a base uma vez (ou reaproveita o snapshot) e solta o DataFrame aqui
+    load_data_cached(source, compact=True)
+    snapshot_path = cache_path(source, compact=True)
+    cohorts, unassigned = plan_cohorts(snapshot_path, column, min_rows)
+    load_seconds = time.perf_counter() - started
+
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = slugify(next((k for k, v in BATCH_COLUMNS.items() if v == column), column))
+    names = {}
+    for value, _ in cohorts:
+        name = f"Relatorio_{prefix}_{slugify(value)}"
+        names[value] = name if name not in names.values() else f"{name}_{len(names)}"
+
+    entries = []
+    os.environ.setdefault('EDUCAFRO_RENDER_TABS', BATCH_RENDER_TABS)
+    workers = max(1, min(processes, len(cohorts)))
+    if cohorts:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(snapshot_path, column)) as executor:
+            futures = [executor.submit(_render_cohort, value, os.path.join(output_dir, f"{names[value]}.pdf"), options)
+                       for value, _ in cohorts]
+            for future in as_completed(futures):
+                entry = future.result()
+                entries.append(entry)
+                status = entry['erro'] or f"{entry['bytes'] / 1024:.0f} KB"
+                if entry['erros_renderizacao']:
+                    status += f", {entry['erros_renderizacao']} gráfico(s) sem imagem"
+                print(f"  [{len(entries)}/{len(futures)}] {entry['valor']} ({entry['linhas']} linhas): "
+                      f"{status} em {entry['segundos']:.1f}s")
+
+    order = {str(value): i for i, (value, _) in enumerate(cohorts)}
+    entries.sort(key=lambda e: order[e['valor']])
+    manifest = {
+        'coluna': column,
+        'origem': source,
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'processos': workers,
+        'opcoes': options,
+        'linhas_sem_valor': unassigned,
+        'carga_segundos': round(load_seconds, 3),
+        'total_segundos': round(time.perf_counter() - started, 3),
+        'relatorios': entries,
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+if __name__ == "__main__":
+    # Uso: python batch_reports.py <cras|entrevistador|cidade|coluna> [pasta_saida] [processos]
+    if len(sys.argv) < 2:
+        print("Uso: python batch_reports.py <cras|entrevistador|cidade|coluna> [pasta_saida] [processos]")
+        sys.exit(1)
+    target_column = sys.argv[1]
+    target_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(OUTPUT_DIR, slugify(target_column).lower())
+    n_processes = int(sys.argv[3]) if len(sys.argv) > 3 else BATCH_PROCESSES
+    result = generate_batch(target_column, output_dir=target_dir, processes=n_processes)
+    failed = [e for e in result['relatorios'] if e['erro']]
+    print(f"{len(result['relatorios']) - len(failed)} relatório(s) em {target_dir} "
+          f"({result['total_segundos']:.1f}s, {result['processos']} processo(s)); manifesto: {MANIFEST_NAME}")
+    if failed:
+        sys.exit(2)
@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import time
+import warnings
+import numpy as np
+import pandas as pd
+import data_loader
+from data_loader import load_data, map_distinct, SIM_REGEX, NAO_REGEX
+from generate_synthetic_data import write_synthetic
+
+# Benchmark da etapa de normalização de `load_data`.
+# Uso: python benchmark_load_data.py [linhas]   (padrão: 100.000)
+def normalize_legacy(df):
+    """Implementação anterior: regex em todas as linhas de todas as colunas de texto."""
+    df = df.copy()
+    for col in df.select_dtypes(include=['object']).columns:
+        df[col] = df[col].astype(str).str.strip()
+        df[col] = df[col].replace(SIM_REGEX, 'Sim', regex=True)
+        df[col] = df[col].replace(NAO_REGEX, 'Não', regex=True)
+        df[col] = df[col].replace('nan', np.nan)
+    return df
+
+def normalize_distinct(df):
+    """Implementação atual: regex uma vez por valor distinto de cada coluna."""
+    df = df.copy()
+    for col in df.select_dtypes(include=['object']).columns:
+        df[col] = map_distinct(df[col], data_loader._normalize_responses)
+    return df
+
+def build_synthetic_csv(n_rows, path, seed=42):
+    """Entrevistas sintéticas (generate_synthetic_data), com as variantes 'sujas' de Sim/Não."""
+    return write_synthetic(path, n_rows, seed)
+
+def timed(func, *args, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    warnings.simplefilter('ignore')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_synthetic_csv(n_rows, os.path.join(tmp, 'sintetico.csv'))
+        raw = pd.read_csv(path)
+        print(f"Arquivo sintético: {n_rows} linhas x {len(raw.columns)} colunas")
+
+        t_legacy, legacy = timed(normalize_legacy, raw, repeat=1)
+        t_new, new = timed(normalize_distinct, raw)
+        pd.testing.assert_frame_equal(legacy, new)
+
+        print(f"Normalização (regex por linha):         {t_legacy:8.2f} s")
+        print(f"Normalização (por valor distinto):      {t_new:8.2f} s")
+        print(f"Ganho: {t_legacy / t_new:.1f}x  (saídas idênticas)")
+
+        t_total, _ = timed(load_data, path, repeat=1)
+        print(f"load_data completo:                     {t_total:8.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Benchmark de inicialização (cold start) do dashboard e dos scripts.
+# Uso: python benchmark_startup.py [repetições]   (padrão: 3; vale o menor tempo)
+# Cada medição roda num processo novo do Python. Para os scripts, o tempo de
+# `import` vem do `-X importtime`, e as dependências mais caras são listadas.
+# Para o app, o AppTest do Streamlit executa o script até a tela de senha e
+# até o Resumo Geral, e a saída mostra quais bibliotecas pesadas foram carregadas.
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = [
+    'export_stats', 'exportar_csv_humanizado', 'generate_final_pdf', 'batch_reports',
+    'student_sheets', 'eligibility', 'data_cache', 'snapshot', 'image_cache', 'renderer_pool', 'cras_mapping',
+]
+# Bibliotecas que só deveriam carregar quando uma seção com gráficos ou o PDF é usado.
+# O próprio Streamlit já importa plotly/plotly.io; para o app só contam as que o
+# script carrega além delas.
+HEAVY_MODULES = ['plotly', 'plotly.io', 'plotly.express', 'wordcloud', 'matplotlib', 'fpdf', 'kaleido']
+TOP_DEPENDENCIES = 3
+
+_APP_SNIPPET = """
+import json, sys, time, warnings
+warnings.simplefilter('ignore')
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+preloaded = set(sys.modules)
+at = AppTest.from_file('app.py', default_timeout=300)
+at.secrets['password'] = 'benchmark'
+if {logged_in}:
+    at.session_state['password_correct'] = True
+at.run()
+print(json.dumps({{'segundos': time.perf_counter() - started,
+                   'erros': [str(e.value) for e in at.exception],
+                   'pesados': [m for m in {heavy} if m in sys.modules and m not in preloaded]}}))
+"""
+
+def _run(args):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=REPO_DIR, capture_output=True, text=True)
+    return time.perf_counter() - started, result
+
+def parse_importtime(stderr, module):
+    """(tempo cumulativo do módulo em s, [(dependência direta, s)] mais caras)."""
+    total, deps = None, []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        name = name.strip()
+        if depth == 0 and name == module:
+            total = int(cumulative) / 1e6
+        elif depth == 1:
+            deps.append((name, int(cumulative) / 1e6))
+    deps.sort(key=lambda item: -item[1])
+    return total, deps[:TOP_DEPENDENCIES]
+
+def script_startup(module, repeat=3):
+    """Menor tempo de `import module` (e do processo inteiro) em `repeat` processos novos."""
+    best = None
+    for _ in range(repeat):
+        wall, result = _run(['-X', 'importtime', '-c', f'import {module}'])
+        if result.returncode != 0:
+            return {'script': module, 'erro': result.stderr.strip().splitlines()[-1]}
+        total, deps = parse_importtime(result.stderr, module)
+        if best is None or total < best['import_s']:
+            best = {'script': module, 'import_s': total, 'processo_s': wall, 'dependencias': deps}
+    return best
+
+def app_startup(logged_in=True, repeat=3):
+    """Menor tempo do AppTest até a tela de senha (logged_in=False) ou até o Resumo Geral."""
+    best = None
+    snippet = _APP_SNIPPET.format(logged_in=logged_in, heavy=HEAVY_MODULES)
+    for _ in range(repeat):
+        wall, result = _run(['-c', snippet])
+        if result.returncode != 0:
+            return {'erro': result.stderr.strip().splitlines()[-1]}
+        info = json.loads(result.stdout.strip().splitlines()[-1])
+        info['processo_s'] = wall
+        if best is None or info['segundos'] < best['segundos']:
+            best = info
+    return best
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"Cold start ({repeat} repetições, menor tempo)\n")
+
+    for label, logged_in in (("app.py até a senha", False), ("app.py até o Resumo Geral", True)):
+        info = app_startup(logged_in, repeat)
+        if 'erro' in info:
+            print(f"{label:<28} ERRO: {info['erro']}")
+            continue
+        heavy = ', '.join(info['pesados']) or 'nenhuma'
+        print(f"{label:<28} {info['segundos'] * 1000:7.0f} ms  (processo {info['processo_s'] * 1000:.0f} ms)"
+              f"  libs pesadas: {heavy}")
+        for error in info['erros']:
+            print(f"{'':<28} exceção: {error}")
+
+    print(f"\n{'script':<28} {'import':>9} {'processo':>10}  dependências mais caras")
+    for module in SCRIPTS:
+        info = script_startup(module, repeat)
+        if 'erro' in info:
+            print(f"{module:<28} ERRO: {info['erro']}")
+            continue
+        deps = ', '.join(f"{name} {seconds * 1000:.0f}" for name, seconds in info['dependencias'])
+        print(f"{module:<28} {info['import_s'] * 1000:7.0f} ms {info['processo_s'] * 1000:8.0f} ms  {deps}")
+
+if __name__ == "__main__":
+    main()
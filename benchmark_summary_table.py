@@ -0,0 +1,96 @@
+import sys
+import time
+import warnings
+import pandas as pd
+from data_cache import load_data_cached
+from indicators import get_indicators_full, indicator_flags, indicator_tags, row_styles, STYLE_MISSING, \
+    STYLE_WORKER, STYLE_NAME_BENEFITS, STYLE_NAME_DEFAULT
+from table_view import PAGE_ROWS, TableIndex
+
+# Benchmark da tabela do Resumo Geral: tags de perfil + estilo por linha + serialização do Streamlit.
+# Uso: python benchmark_summary_table.py [csv] [tamanhos separados por vírgula]
+# A base é replicada até cada tamanho. "antes" é o caminho antigo (apply por
+# linha na base inteira, "erro" quando passa do limite de células do
+# Styler); as outras colunas são o caminho atual (máscaras calculadas uma vez por
+# versão do dataset, consulta no índice do table_view e só uma página
+# estilizada a cada render). A consulta medida é uma busca por nome com a
+# tabela ordenada por bairro, num índice novo (pior caso: nada indexado ainda).
+CSV_PATH = 'data/entrevistas_backup.csv'
+SIZES = [100, 1_000, 5_000, 20_000, 50_000]
+REPEAT = 3
+
+def _legacy_style_row(row):
+    # Cópia da função que o app.py usava antes das máscaras vetorizadas
+    if str(row.get('status_formulario', '')).strip() == 'falta entrevistar':
+        return [STYLE_MISSING] * len(row)
+    is_worker = pd.notnull(row.get('Vínculo de Trabalho')) and row.get('Vínculo de Trabalho') != 'Não'
+    row_bg = STYLE_WORKER if is_worker else ''
+    receives_benefits = pd.notnull(row.get('Recebe Benefícios')) and str(row.get('Recebe Benefícios')).strip() == 'Sim'
+    name_color = STYLE_NAME_BENEFITS if receives_benefits else STYLE_NAME_DEFAULT
+    styles = [row_bg] * len(row)
+    if 'nome_completo' in row.index:
+        styles[row.index.get_loc('nome_completo')] = f"{row_bg}; {name_color}"
+    return styles
+
+def serialize(styler):
+    """O que o st.dataframe faz com um Styler: gera o CSS e converte os dados para Arrow."""
+    from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+    from streamlit.proto.ArrowData_pb2 import ArrowData as ArrowProto
+    from streamlit import dataframe_util
+    marshall_styler(ArrowProto(), styler, default_uuid='benchmark')
+    dataframe_util.convert_anything_to_arrow_bytes(styler.data)
+
+def legacy_render(df):
+    display_df = df.copy()
+    display_df['nome_completo'] = display_df['nome_completo'].str.title()
+    display_df.insert(0, 'Perfil', display_df.apply(get_indicators_full, axis=1))
+    serialize(display_df.style.apply(_legacy_style_row, axis=1))
+
+def cold_query(df):
+    return TableIndex(df).query('silva', ['nome_completo', 'Bairro'], sort='Bairro')
+
+def page_render(df, flags, positions):
+    rows = positions[:PAGE_ROWS]
+    display_df = df.iloc[rows].copy()
+    display_df['nome_completo'] = display_df['nome_completo'].str.title()
+    page_flags = flags.iloc[rows]
+    display_df.insert(0, 'Perfil', indicator_tags(page_flags))
+    page_styles = row_styles(page_flags, list(display_df.columns))
+    serialize(display_df.style.apply(lambda _: page_styles, axis=None))
+
+def best_time(func, repeat=REPEAT):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def replicate(base, n):
+    reps = -(-n // len(base))
+    return pd.concat([base] * reps, ignore_index=True).iloc[:n]
+
+def main():
+    warnings.simplefilter('ignore')
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    sizes = [int(s) for s in sys.argv[2].split(',')] if len(sys.argv) > 2 else SIZES
+    base = load_data_cached(csv_path, compact=True)
+    print(f"Base: {len(base)} linhas x {base.shape[1]} colunas; página de {PAGE_ROWS} linhas")
+    print(f"Limite do Styler: {pd.options.styler.render.max_elements} células\n")
+    print(f"{'linhas':>8} {'antes':>12} {'máscaras (1x)':>15} {'consulta (1x)':>15} {'render (página)':>17}")
+    for n in sizes:
+        df = replicate(base, n)
+        try:
+            legacy = f"{best_time(lambda: legacy_render(df), 1) * 1000:9.0f} ms"
+        except Exception:  # o st.dataframe recusa Stylers acima de styler.render.max_elements
+            legacy = "erro"
+        flags_s = best_time(lambda: indicator_flags(df))
+        flags = indicator_flags(df)
+        query_s = best_time(lambda: cold_query(df))
+        positions = TableIndex(df).query('', sort='Bairro')
+        page_s = best_time(lambda: page_render(df, flags, positions))
+        print(f"{n:>8} {legacy:>12} {flags_s * 1000:12.1f} ms {query_s * 1000:12.1f} ms {page_s * 1000:14.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+from text_utils import fold
+
+# Filtros de coorte da barra lateral (valem para as seções dos Eixos).
+# Para cada coluna filtrável e cada valor dela há um bitmap (np.packbits) com
+# um bit por estudante, montado uma vez por versão do dataset. Uma combinação
+# de filtros é resolvida só com operações bit a bit: OR entre os valores
+# escolhidos de uma coluna e AND entre as colunas. As contagens mostradas em
+# cada opção levam em conta os filtros das outras colunas (filtro cruzado).
+FILTERS = {  # rótulo na barra lateral -> coluna da base limpa
+    'CRAS': 'CRAS de Referência',
+    'Gênero': 'Identidade de Gênero',
+    'Raça/Cor': 'Race_Group',
+    'Faixa etária': 'Faixa Etária',
+    'Cidade': 'Cidade',
+    'Trabalho': 'Employment_Status',
+    'Recebe benefícios': 'Recebe Benefícios',
+}
+MISSING_LABEL = 'Não informado'
+
+class BitmapIndex:
+    """Bitmaps por valor das colunas de filtro de uma versão do dataset (não guarda o DataFrame)."""
+
+    def __init__(self, df, columns=tuple(FILTERS.values())):
+        self.n = len(df)
+        self.options = {}   # coluna -> valores na ordem de exibição
+        self._bitmaps = {}  # coluna -> {valor: bitmap}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            codes, uniques = pd.factorize(series)
+            bitmaps = {}
+            for code, value in enumerate(pd.Series(uniques, dtype=object)):
+                self._add(bitmaps, str(value), codes == code)
+            if (codes == -1).any():
+                self._add(bitmaps, MISSING_LABEL, codes == -1)
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                order = [str(c) for c in series.cat.categories]
+                labels = [v for v in order if v in bitmaps] + sorted((v for v in bitmaps if v not in order), key=fold)
+            else:
+                labels = sorted(bitmaps, key=fold)
+            self.options[col] = labels
+            self._bitmaps[col] = bitmaps
+
+    def _add(self, bitmaps, label, mask):
+        bits = np.packbits(mask)
+        bitmaps[label] = bitmaps[label] | bits if label in bitmaps else bits
+
+    def _column_bits(self, col, labels):
+        known = [self._bitmaps[col][label] for label in labels if label in self._bitmaps.get(col, {})]
+        if not known:
+            return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce(known)
+
+    def bits(self, selection, exclude=None):
+        """Bitmap da combinação {coluna: valores} (None = nenhum filtro ativo)."""
+        result = None
+        for col, labels in selection.items():
+            if not labels or col == exclude:
+                continue
+            col_bits = self._column_bits(col, labels)
+            result = col_bits if result is None else result & col_bits
+        return result
+
+    def positions(self, selection):
+        """Posições (iloc) dos estudantes que passam nos filtros, em ordem."""
+        bits = self.bits(selection)
+        if bits is None:
+            return np.arange(self.n)
+        return np.flatnonzero(np.unpackbits(bits, count=self.n))
+
+    def count(self, selection):
+        bits = self.bits(selection)
+        return self.n if bits is None else int(np.bitwise_count(bits).sum())
+
+    def option_counts(self, selection, col):
+        """{valor: estudantes} da coluna, com os filtros das demais colunas aplicados."""
+        others = self.bits(selection, exclude=col)
+        counts = {}
+        for label, bits in self._bitmaps.get(col, {}).items():
+            counts[label] = int(np.bitwise_count(bits if others is None else bits & others).sum())
+        return counts
+
+def normalize_selection(selection):
+    """Só os filtros ativos, em ordem estável: {coluna: [valores]}."""
+    return {col: sorted(labels) for col, labels in sorted(selection.items()) if labels}
+
+def selection_key(dataset_key, selection):
+    """Chave da versão filtrada do dataset (igual a `dataset_key` sem filtros), usada nos caches."""
+    selection = normalize_selection(selection)
+    if not selection:
+        return dataset_key
+    digest = hashlib.sha256(json.dumps(selection, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return f"{dataset_key}-coorte-{digest[:16]}"
+
+def describe_selection(selection):
+    """Filtros ativos em texto, com os rótulos da barra lateral ('CRAS: X; Gênero: Y, Z')."""
+    labels = {col: label for label, col in FILTERS.items()}
+    return '; '.join(f"{labels.get(col, col)}: {', '.join(values)}"
+                     for col, values in normalize_selection(selection).items())
+
+def filtered_frame(df, index, selection):
+    """Linhas de `df` que passam nos filtros (o próprio `df` se nenhum filtro estiver ativo)."""
+    if not normalize_selection(selection):
+        return df
+    return df.iloc[index.positions(selection)]
+
+def sidebar_filters(index, key='coorte'):
+    """Multiselects dos filtros na barra lateral; devolve a seleção {coluna: [valores]}."""
+    import streamlit as st
+
+    widget_keys = {col: f"{key}_{col}" for col in index.options}
+    # Contagens cruzadas a partir da seleção atual (estado dos widgets antes de desenhá-los)
+    current = {col: st.session_state.get(widget_key, []) for col, widget_key in widget_keys.items()}
+
+    def clear():
+        for widget_key in widget_keys.values():
+            st.session_state[widget_key] = []
+
+    active = normalize_selection(current)
+    with st.sidebar.expander("Filtros da coorte" + (f" ({len(active)})" if active else ""), expanded=bool(active)):
+        st.caption("Valem para as seções dos Eixos. O número ao lado de cada opção considera os demais filtros.")
+        selection = {}
+        for label, col in FILTERS.items():
+            if col not in index.options:
+                continue
+            counts = index.option_counts(current, col)
+            selection[col] = st.multiselect(label, index.options[col], key=widget_keys[col],
+                                            format_func=lambda value, counts=counts: f"{value} ({counts.get(value, 0)})")
+        st.button("Limpar filtros", on_click=clear, disabled=not active, key=f"{key}_limpar")
+    return normalize_selection(selection)
@@ -0,0 +1 @@
+# Raiz do projeto no sys.path dos testes (os módulos ficam na raiz, sem pacote)
@@ -0,0 +1,169 @@
+import re
+import sys
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+import numpy as np
+import pandas as pd
+from text_utils import fold
+
+# Mapeamento bairro -> SECRAS de referência (chaves já sem acento e em minúsculas)
+CRAS_MAP = {
+    "alemoa": "SECRAS Chico de Paula",
+    "saboo": "SECRAS Chico de Paula",
+    "chico de paula": "SECRAS Chico de Paula",
+    "sao manoel": "SECRAS São Manoel",
+    "jardim sao manoel": "SECRAS São Manoel",
+    "piratininga": "SECRAS Chico de Paula",
+    "bom retiro": "SECRAS Bom Retiro",
+    "castelo": "SECRAS Bom Retiro",
+    "jardim castelo": "SECRAS Bom Retiro",
+    "caneleira": "SECRAS Bom Retiro",
+    "areia branca": "SECRAS Bom Retiro",
+    "vila sao jorge": "SECRAS Bom Retiro",
+    "santa maria": "SECRAS Bom Retiro",
+    "radio clube": "SECRAS Rádio Clube",
+    "nova cintra": "SECRAS Nova Cintra",
+    "morro nova cintra": "SECRAS Nova Cintra",
+    "sao bento": "SECRAS São Bento",
+    "morro sao bento": "SECRAS São Bento",
+    "morro do sao bento": "SECRAS São Bento",
+    "centro": "SECRAS Centro",
+    "vila nova": "SECRAS Centro",
+    "paqueta": "SECRAS Centro",
+    "valongo": "SECRAS Centro",
+    "estuario": "SECRAS ZOI",
+    "macuco": "SECRAS ZOI",
+    "aparecida": "SECRAS ZOI",
+    "embare": "SECRAS ZOI",
+    "boqueirao": "SECRAS ZOI",
+    "gonzaga": "SECRAS ZOI",
+    "pompeia": "SECRAS ZOI",
+    "jose menino": "SECRAS ZOI",
+    "marape": "SECRAS ZOI",
+    "campo grande": "SECRAS ZOI",
+    "encruzilhada": "SECRAS ZOI",
+    "humaita": "SECRAS Chico de Paula",
+    "humaita/morro sao bento": "SECRAS Chico de Paula (pode variar)",
+    "japui": "SECRAS Chico de Paula (Área Continental)",
+    "morro da penha": "SECRAS São Bento (aprox.)",
+    "morro do pacheco": "SECRAS São Bento (aprox.)",
+    "paecara": "SECRAS ZOI (São Vicente - verificar)",
+    "parque continental": "SECRAS Chico de Paula (Área Continental)",
+    "ponta da praia": "SECRAS ZOI",
+    "vila aurea": "SECRAS ZOI (São Vicente - verificar)",
+    "vila belmiro": "SECRAS ZOI",
+    "vila matias": "SECRAS ZOI",
+    "vila sao jose": "SECRAS ZOI",
+    "vila tupi": "SECRAS ZOI (Praia Grande - verificar)",
+    "vila tupi 332": "SECRAS ZOI (Praia Grande - verificar)",
+    "vila voturua": "SECRAS ZOI (São Vicente - verificar)",
+    "vila zilda": "SECRAS Chico de Paula (aprox.)",
+    "zona noroeste": "SECRAS Chico de Paula (genérico)"
+}
+
+UNRESOLVED_CRAS = "SECRAS não identificado"
+
+# Abreviações comuns digitadas nas entrevistas
+ABBREVIATIONS = {'jd': 'jardim', 'jdm': 'jardim', 'vl': 'vila', 'pq': 'parque', 'pca': 'praca'}
+
+# Similaridade mínima (0-1) para aceitar uma correspondência aproximada
+MIN_SIMILARITY = 0.85
+
+def fold_bairro(value):
+    """Minúsculas, sem acentos, abreviações expandidas e espaços colapsados."""
+    words = [ABBREVIATIONS.get(w.rstrip('.'), w) for w in fold(str(value)).split()]
+    return ' '.join(words)
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class BairroResolver:
+    """Resolve bairro -> CRAS por índice exato e, na falta, por trigramas + similaridade."""
+
+    def __init__(self, mapping=CRAS_MAP, min_similarity=MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self.index = {fold_bairro(k): v for k, v in mapping.items()}
+        self.trigram_index = defaultdict(set)
+        for key in self.index:
+            for gram in _trigrams(key):
+                self.trigram_index[gram].add(key)
+        self._memo = {}
+
+    def match(self, bairro):
+        """Retorna (cras, bairro_de_referencia, confianca, metodo) para um bairro."""
+        if pd.isna(bairro) or not str(bairro).strip():
+            return UNRESOLVED_CRAS, None, 0.0, 'vazio'
+        folded = fold_bairro(bairro)
+        if folded not in self._memo:
+            self._memo[folded] = self._match_folded(folded)
+        return self._memo[folded]
+
+    def _match_folded(self, folded):
+        if folded in self.index:
+            return self.index[folded], folded, 1.0, 'exato'
+
+        # "Vila Tupi 332", "Gonzaga 12": número digitado junto ao bairro. Não é exato
+        # (o número pode fazer parte do nome), então vai para a curadoria
+        without_number = re.sub(r'[\s,\-]*\d+$', '', folded).strip()
+        if without_number in self.index:
+            return self.index[without_number], without_number, 0.95, 'sem número'
+
+        # Candidatos = bairros conhecidos que compartilham trigramas com o digitado
+        shared = Counter()
+        for gram in _trigrams(without_number or folded):
+            for key in self.trigram_index.get(gram, ()):
+                shared[key] += 1
+
+        best_key, best_score = None, 0.0
+        for key, _ in shared.most_common(5):
+            score = SequenceMatcher(None, without_number or folded, key).ratio()
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if best_key is not None and best_score >= self.min_similarity:
+            return self.index[best_key], best_key, round(best_score, 2), 'aproximado'
+        return UNRESOLVED_CRAS, best_key, round(best_score, 2), 'não resolvido'
+
+    def resolve(self, bairros):
+        """Mapeia uma série de bairros para CRAS, resolvendo cada bairro distinto uma vez."""
+        codes, uniques = pd.factorize(bairros)
+        cras = [self.match(b)[0] for b in uniques]
+        cras.append(UNRESOLVED_CRAS)  # código -1 (bairro ausente) cai na última posição
+        return pd.Series(np.asarray(cras, dtype=object)[codes], index=bairros.index, dtype=str)
+
+    def report(self, bairros):
+        """Tabela por bairro distinto com CRAS atribuído, método e confiança."""
+        counts = bairros.dropna().value_counts()
+        rows = []
+        for bairro, total in counts.items():
+            cras, reference, confidence, method = self.match(bairro)
+            rows.append({
+                'Bairro': bairro,
+                'Ocorrências': total,
+                'CRAS de Referência': cras,
+                'Correspondência': reference,
+                'Método': method,
+                'Confiança': confidence,
+            })
+        columns = ['Bairro', 'Ocorrências', 'CRAS de Referência', 'Correspondência', 'Método', 'Confiança']
+        return pd.DataFrame(rows, columns=columns).sort_values(['Confiança', 'Ocorrências'], ascending=[True, False])
+
+    def unresolved(self, bairros):
+        """Bairros que não foram associados a nenhum CRAS (para curadoria da equipe)."""
+        report = self.report(bairros)
+        return report[report['Método'] == 'não resolvido']
+
+default_resolver = BairroResolver()
+
+def resolve_cras(bairros):
+    return default_resolver.resolve(bairros)
+
+if __name__ == "__main__":
+    from data_loader import load_data
+    path = sys.argv[1] if len(sys.argv) > 1 else 'data/entrevistas_backup.csv'
+    data = load_data(path)
+    report = default_resolver.report(data['Bairro'])
+    pending = report[report['Método'] != 'exato']
+    print(f"{len(report)} bairros distintos; {len(pending)} sem correspondência exata:\n")
+    print(pending.to_string(index=False))
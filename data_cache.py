@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+import pandas as pd
+from data_loader import load_data, CLEANING_RULES_VERSION
+from snapshot import write_snapshot, read_snapshot, snapshot_info, KIND_CLEAN
+
+# Cache em disco do DataFrame já processado por `load_data`.
+# Cada entrada é um Parquet nomeado pela impressão digital (SHA-256) do
+# arquivo de origem + versão das regras de limpeza, então qualquer mudança
+# no CSV ou nas regras gera uma entrada nova automaticamente.
+CACHE_DIR = os.path.join('data', '.cache')
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # 256 MB
+MAX_CACHE_ENTRIES = 16
+
+# (caminho, tamanho, mtime) -> sha256, para não re-hashear o arquivo a cada rerun
+_fingerprints = {}
+
+def file_fingerprint(filepath):
+    """Retorna o SHA-256 do conteúdo do arquivo (memoizado por tamanho/mtime)."""
+    stat = os.stat(filepath)
+    memo_key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _fingerprints:
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        _fingerprints[memo_key] = digest.hexdigest()
+    return _fingerprints[memo_key]
+
+def _source_prefix(filepath):
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    return ''.join(c if c.isalnum() else '_' for c in name)
+
+def cache_key(filepath, **options):
+    """Chave da entrada: conteúdo do arquivo + versão das regras + opções de carga."""
+    parts = {'fonte': file_fingerprint(filepath), 'regras': CLEANING_RULES_VERSION}
+    parts.update(options)
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+def _reference_date(reference_date=None):
+    return pd.Timestamp(reference_date if reference_date is not None else datetime.now().date())
+
+def dataset_key(filepath, reference_date=None, compact=False):
+    """Identifica uma versão do dataset limpo (arquivo + regras + data de referência das idades)."""
+    return cache_key(filepath, referencia=_reference_date(reference_date).date().isoformat(), compacto=compact)
+
+def cache_path(filepath, cache_dir=CACHE_DIR, reference_date=None, compact=False):
+    return os.path.join(cache_dir, f"{_source_prefix(filepath)}-{dataset_key(filepath, reference_date, compact)}.parquet")
+
+def enforce_cache_limits(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_CACHE_ENTRIES, suffix='.parquet'):
+    """Remove as entradas usadas há mais tempo (mtime) até caber nos limites."""
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    # Mais recentes primeiro; mantemos enquanto couber no orçamento
+    entries.sort(reverse=True)
+    removed = []
+    total = 0
+    for i, (_, size, path) in enumerate(entries):
+        total += size
+        if i >= max_entries or total > max_bytes:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except FileNotFoundError:
+                pass
+    return removed
+
+def load_data_cached(filepath, reference_date=None, compact=False, columns=None, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_CACHE_ENTRIES):
+    """Versão com cache de `load_data`: devolve o snapshot já limpo quando o arquivo não mudou.
+
+    Com `columns`, só essas colunas são lidas do snapshot (projeção).
+    """
+    # As idades dependem da data de referência, então ela também entra na chave
+    reference_date = _reference_date(reference_date)
+    path = cache_path(filepath, cache_dir, reference_date, compact)
+    if os.path.exists(path):
+        try:
+            info = snapshot_info(path)
+            if info.get('tipo') != KIND_CLEAN or info.get('regras_limpeza') != CLEANING_RULES_VERSION:
+                raise ValueError("snapshot gerado com outra versão das regras")
+            df = read_snapshot(path, columns=columns)
+            os.utime(path)  # marca como usada recentemente (LRU)
+            return df
+        except Exception:
+            # Entrada corrompida/incompleta: descarta e reprocessa
+            invalidate_entry(path)
+
+    df = load_data(filepath, reference_date=reference_date, compact=compact)
+
+    try:
+        # Escrita atômica (várias sessões ao mesmo tempo)
+        write_snapshot(df, path, kind=KIND_CLEAN, source=filepath)
+    except Exception:
+        pass
+    else:
+        enforce_cache_limits(cache_dir, max_bytes, max_entries)
+
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+def invalidate_entry(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def invalidate(filepath=None, cache_dir=CACHE_DIR):
+    """Apaga as entradas de um arquivo de origem (ou todo o cache, se `filepath` for None)."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    prefix = f"{_source_prefix(filepath)}-" if filepath else ''
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith('.parquet') and name.startswith(prefix):
+            invalidate_entry(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
+
+if __name__ == "__main__":
+    # Uso: python data_cache.py [arquivo.csv]          -> aquece o cache
+    #      python data_cache.py --limpar [arquivo.csv] -> invalida
+    args = sys.argv[1:]
+    if args and args[0] == '--limpar':
+        target = args[1] if len(args) > 1 else None
+        print(f"{invalidate(target)} entrada(s) removida(s) de {CACHE_DIR}.")
+    else:
+        import time
+        target = args[0] if args else 'data/entrevistas_backup.csv'
+        for label in ('1a carga', '2a carga'):
+            start = time.perf_counter()
+            data = load_data_cached(target)
+            print(f"[{label}] {len(data)} registros em {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -1,19 +1,162 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from cras_mapping import resolve_cras, UNRESOLVED_CRAS
+from snapshot import is_snapshot, read_snapshot, KIND_RAW
+from json_loader import read_json_backup
 
-def load_data(filepath):
-    """Loads and preprocesses the version 2 Educafro CSV (snake_case)."""
-    df = pd.read_csv(filepath)
+# Bump whenever the cleaning rules below change, so cached/snapshotted
+# versions of the processed data are invalidated.
+CLEANING_RULES_VERSION = "2026.4"
+
+# Mapping various forms of "Sim" and "Não" to standard versions
+SIM_REGEX = r'(?i)^sim(\s*\(.*\))?$' # Matches "sim", "Sim", "Sim (1)", "SIM"
+NAO_REGEX = r'(?i)^n[ãa]o$' # Matches "não", "Não", "NAO"
+
+def map_distinct(series, transform):
+    """Applies a vectorized `transform` to the distinct values of `series` only.
+
+    The column is factorized into integer codes, `transform` runs once over the
+    (few) unique strings and the result is broadcast back through the codes.
+    Missing values stay missing.
+    """
+    codes, uniques = pd.factorize(series)
+    normalized = transform(pd.Series(uniques, dtype=series.dtype))
+    values = pd.api.extensions.take(normalized.array, codes, allow_fill=True)
+    return pd.Series(values, index=series.index, name=series.name)
+
+# Age bands used by 'Faixa Etária' (upper bounds are inclusive, ages in completed years)
+AGE_BINS = [-np.inf, 17, 30, np.inf]
+AGE_GROUP_LABELS = ["Menor que 18 anos", "18 a 30 anos", "30 anos ou mais"]
+AGE_MISSING_LABEL = "Não informado"
+
+def parse_birth_dates(values):
+    """Parses birth dates: ISO (YYYY-MM-DD, as exported) first, day-first only for the rest.
+
+    Parsing everything with dayfirst=True would swap day and month of ISO
+    dates whose day is 12 or less (2007-08-03 -> 2007-03-08).
+    """
+    iso = pd.to_datetime(values, errors='coerce', format='ISO8601')
+    rest = iso.isna() & values.notna()
+    if rest.any():
+        iso[rest] = pd.to_datetime(values[rest], errors='coerce', dayfirst=True, format='mixed')
+    return iso
+
+def compute_age(birth_dates, reference_date=None):
+    """Completed years between each birth date and `reference_date` (default: today).
+
+    Vectorized; returns a nullable Int64 series (NA for missing or future dates).
+    """
+    ref = pd.Timestamp(reference_date) if reference_date is not None else pd.Timestamp(datetime.now().date())
+    birth_dates = pd.to_datetime(birth_dates, errors='coerce')
+    years = ref.year - birth_dates.dt.year
+    # Birthday not reached yet in the reference year -> one year less
+    before_birthday = (birth_dates.dt.month > ref.month) | \
+                      ((birth_dates.dt.month == ref.month) & (birth_dates.dt.day > ref.day))
+    age = (years - before_birthday.astype(int)).astype('Int64')
+    return age.mask(age < 0)
+
+def age_group(ages):
+    """Bins ages into the 'Faixa Etária' categories (categorical, NA -> 'Não informado')."""
+    groups = pd.cut(ages.astype('float64'), bins=AGE_BINS, labels=AGE_GROUP_LABELS)
+    groups = groups.cat.add_categories([AGE_MISSING_LABEL])
+    return groups.fillna(AGE_MISSING_LABEL)
+
+# Stable category order for the compacted frame (see compact_dtypes)
+INCOME_BANDS = [
+    "Sem renda", "Até R$ 1.045,00", "De R$ 801,00 a R$ 1.045,00",
+    "De R$ 1.046,00 R$ 2080,00", "De R$ 2081,00 a R$ 3.120,00",
+    "De R$ 3.120,00 a R$ 4.160,00", "De R$ 4.161,00 a 5.200,00",
+    "Acima de R$ 4.161,00", "Acima de R$ 5.201,00"
+]
+CATEGORY_ORDERS = {
+    'Renda Familiar': INCOME_BANDS,
+    'Faixa Etária': AGE_GROUP_LABELS + [AGE_MISSING_LABEL],
+    'Race_Group': ['Pretos(as)', 'Pardos(as)', 'Brancos(as)'],
+    'Identidade de Gênero': ['Feminina', 'Masculina', 'Não binárie', 'Outro'],
+    'Employment_Status': ['Empregado', 'Fora da força de trabalho'],
+}
+YES_NO_ORDER = ['Sim', 'Não']
+
+def compact_dtypes(df, max_unique_ratio=0.5, max_categories=500, exclude=('nome_completo',)):
+    """Converts low-cardinality text columns to categoricals and downcasts numerics.
+
+    Returns the compacted frame and a per-column report of bytes saved.
+    Category order is stable: known orders first (CATEGORY_ORDERS, Sim/Não),
+    then any other observed values alphabetically.
+    """
+    df = df.copy()
+    rows = []
+    n_rows = max(len(df), 1)
+    for col in df.columns:
+        series = df[col]
+        before = int(series.memory_usage(deep=True, index=False))
+        compacted = None
+
+        if col not in exclude and (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)) \
+                and not isinstance(series.dtype, pd.CategoricalDtype):
+            observed = series.dropna().unique()
+            if len(observed) <= max_categories and len(observed) / n_rows <= max_unique_ratio:
+                observed = set(observed)
+                known = CATEGORY_ORDERS.get(col) or (YES_NO_ORDER if observed <= set(YES_NO_ORDER) else [])
+                categories = [c for c in known if c in observed or col in CATEGORY_ORDERS] + \
+                             sorted(str(c) for c in observed if c not in known)
+                compacted = pd.Categorical(series, categories=categories)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            compacted = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series.dtype):
+            downcast = series.astype('float32')
+            # Only keep float32 when it round-trips exactly (e.g. ids, small integers)
+            if downcast.astype(series.dtype).equals(series):
+                compacted = downcast
+
+        if compacted is not None:
+            df[col] = compacted
+        after = int(df[col].memory_usage(deep=True, index=False))
+        rows.append({'Coluna': col, 'Tipo original': str(series.dtype), 'Tipo novo': str(df[col].dtype),
+                     'Bytes antes': before, 'Bytes depois': after, 'Economia (bytes)': before - after})
+
+    report = pd.DataFrame(rows).sort_values('Economia (bytes)', ascending=False, ignore_index=True)
+    return df, report
+
+def _strip_text(values):
+    return values.astype(str).str.strip().replace('nan', np.nan)
+
+def _normalize_responses(values):
+    values = values.astype(str).str.strip()
+    values = values.replace(SIM_REGEX, 'Sim', regex=True)
+    values = values.replace(NAO_REGEX, 'Não', regex=True)
+    # Convert back 'nan' string to actual NaN
+    return values.replace('nan', np.nan)
+
+def _status_mask(df):
+    """Rows kept by load_data: completed forms and "falta entrevistar" records."""
+    if 'status_formulario' in df.columns:
+        return df['status_formulario'].isin(['completo', 'falta entrevistar'])
+    if 'Status' in df.columns:
+        return df['Status'].isin(['completo', 'falta entrevistar'])
+    return pd.Series(True, index=df.index)
+
+def load_data(filepath, reference_date=None, compact=False):
+    """Loads and preprocesses the version 2 Educafro CSV (snake_case).
+
+    `reference_date` is the date ages are computed against (default: today).
+    With `compact=True` low-cardinality columns become categoricals (see compact_dtypes).
+    `filepath` may be a form export CSV, the JSON backup or a raw Parquet snapshot (see snapshot.py).
+    """
+    if is_snapshot(filepath):
+        df = read_snapshot(filepath, expected_kind=KIND_RAW)
+    elif str(filepath).lower().endswith('.json'):
+        # JSON backup: streamed in batches, drafts dropped per batch (see json_loader.py)
+        df = read_json_backup(filepath, row_filter=_status_mask)
+    else:
+        df = pd.read_csv(filepath)
     
     # Cleaning column names
     df.columns = [c.strip() for c in df.columns]
     
     # Filter for completed forms and "falta entrevistar" records
-    if 'status_formulario' in df.columns:
-        df = df[df['status_formulario'].isin(['completo', 'falta entrevistar'])]
-    elif 'Status' in df.columns:
-        df = df[df['Status'].isin(['completo', 'falta entrevistar'])]
+    df = df[_status_mask(df)]
 
     # Remove test records (nome_completo = "teste", "teste2", etc.)
     if 'nome_completo' in df.columns:
@@ -74,20 +217,12 @@ def load_data(filepath):
             mask = df[main_col].astype(str).str.contains('Outro|Outra', case=False, na=False)
             df.loc[mask, main_col] = df.loc[mask, outro_col].fillna(df.loc[mask, main_col])
             # Clean up: strip whitespace
-            df[main_col] = df[main_col].astype(str).str.strip().replace('nan', np.nan)
+            df[main_col] = map_distinct(df[main_col], _strip_text)
 
     # 0. Global Normalization of common responses
-    # Mapping various forms of "Sim" and "Não" to standard versions
-    sim_regex = r'(?i)^sim(\s*\(.*\))?$' # Matches "sim", "Sim", "Sim (1)", "SIM"
-    nao_regex = r'(?i)^n[ãa]o$' # Matches "não", "Não", "NAO"
-    
-    # We apply this to all string columns
+    # We apply this to all string columns, normalizing each distinct answer once
     for col in df.select_dtypes(include=['object']).columns:
-        df[col] = df[col].astype(str).str.strip()
-        df[col] = df[col].replace(sim_regex, 'Sim', regex=True)
-        df[col] = df[col].replace(nao_regex, 'Não', regex=True)
-        # Convert back 'nan' string to actual NaN
-        df[col] = df[col].replace('nan', np.nan)
+        df[col] = map_distinct(df[col], _normalize_responses)
 
     # Normalization of values
     if 'genero' in df.columns:
@@ -99,28 +234,20 @@ def load_data(filepath):
         })
 
     # 1. Processing Age
+    # Legacy exports carry a ready 'Idade' column; used only when the birth date is missing
+    if 'Idade' in df.columns:
+        legacy_age = pd.to_numeric(df['Idade'], errors='coerce').round().astype('Int64')
+    else:
+        legacy_age = pd.Series(pd.NA, index=df.index, dtype='Int64')
+
     birth_col = 'data_nascimento' if 'data_nascimento' in df.columns else 'Data de Nascimento'
     if birth_col in df.columns:
-        df[birth_col] = pd.to_datetime(df[birth_col], errors='coerce', dayfirst=True, format='mixed')
-        current_year = datetime.now().year
-        
-        # Calculate age only for those with missing or null Idade, or recalculate if possible
-        def calculate_age(row):
-            if pd.notnull(row[birth_col]):
-                return current_year - row[birth_col].year
-            if 'Idade' in row and pd.notnull(row['Idade']):
-                return row['Idade']
-            return None
-            
-        df['Idade'] = df.apply(calculate_age, axis=1).astype('Int64')
-    
-    def get_age_group(age):
-        if pd.isna(age): return "Não informado"
-        if age < 18: return "Menor que 18 anos"
-        if age <= 30: return "18 a 30 anos"
-        return "30 anos ou mais"
-    
-    df['Faixa Etária'] = df['Idade'].apply(get_age_group)
+        df[birth_col] = parse_birth_dates(df[birth_col])
+        df['Idade'] = compute_age(df[birth_col], reference_date).fillna(legacy_age)
+    else:
+        df['Idade'] = legacy_age
+
+    df['Faixa Etária'] = age_group(df['Idade'])
     
     # 2. Race Mapping
     race_col = 'raca_cor' if 'raca_cor' in df.columns else 'Raça/Cor'
@@ -180,72 +307,12 @@ def load_data(filepath):
     df['Busca_Ativa_Result'] = "Sem dados"
     
     # 5. Mapeamento de CRAS
-    cras_map_normalized = {
-        "alemoa": "SECRAS Chico de Paula",
-        "saboo": "SECRAS Chico de Paula",
-        "chico de paula": "SECRAS Chico de Paula",
-        "sao manoel": "SECRAS São Manoel",
-        "jardim sao manoel": "SECRAS São Manoel",
-        "piratininga": "SECRAS Chico de Paula",
-        "bom retiro": "SECRAS Bom Retiro",
-        "castelo": "SECRAS Bom Retiro",
-        "jardim castelo": "SECRAS Bom Retiro",
-        "caneleira": "SECRAS Bom Retiro",
-        "areia branca": "SECRAS Bom Retiro",
-        "vila sao jorge": "SECRAS Bom Retiro",
-        "santa maria": "SECRAS Bom Retiro",
-        "radio clube": "SECRAS Rádio Clube",
-        "nova cintra": "SECRAS Nova Cintra",
-        "morro nova cintra": "SECRAS Nova Cintra",
-        "sao bento": "SECRAS São Bento",
-        "morro sao bento": "SECRAS São Bento",
-        "morro do sao bento": "SECRAS São Bento",
-        "centro": "SECRAS Centro",
-        "vila nova": "SECRAS Centro",
-        "paqueta": "SECRAS Centro",
-        "valongo": "SECRAS Centro",
-        "estuario": "SECRAS ZOI",
-        "macuco": "SECRAS ZOI",
-        "aparecida": "SECRAS ZOI",
-        "embare": "SECRAS ZOI",
-        "boqueirao": "SECRAS ZOI",
-        "gonzaga": "SECRAS ZOI",
-        "pompeia": "SECRAS ZOI",
-        "jose menino": "SECRAS ZOI",
-        "marape": "SECRAS ZOI",
-        "campo grande": "SECRAS ZOI",
-        "encruzilhada": "SECRAS ZOI",
-        "humaita": "SECRAS Chico de Paula",
-        "humaita/morro sao bento": "SECRAS Chico de Paula (pode variar)",
-        "japui": "SECRAS Chico de Paula (Área Continental)",
-        "morro da penha": "SECRAS São Bento (aprox.)",
-        "morro do pacheco": "SECRAS São Bento (aprox.)",
-        "paecara": "SECRAS ZOI (São Vicente - verificar)",
-        "parque continental": "SECRAS Chico de Paula (Área Continental)",
-        "ponta da praia": "SECRAS ZOI",
-        "vila aurea": "SECRAS ZOI (São Vicente - verificar)",
-        "vila belmiro": "SECRAS ZOI",
-        "vila matias": "SECRAS ZOI",
-        "vila sao jose": "SECRAS ZOI",
-        "vila tupi": "SECRAS ZOI (Praia Grande - verificar)",
-        "vila tupi 332": "SECRAS ZOI (Praia Grande - verificar)",
-        "vila voturua": "SECRAS ZOI (São Vicente - verificar)",
-        "vila zilda": "SECRAS Chico de Paula (aprox.)",
-        "zona noroeste": "SECRAS Chico de Paula (genérico)"
-    }
-    
-    def normalize_and_map_bairro(val):
-        if pd.isna(val): return "SECRAS não identificado"
-        import unicodedata
-        text = str(val).lower()
-        text = ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-        text = text.strip()
-        return cras_map_normalized.get(text, "SECRAS não identificado")
-
+    # Each distinct bairro is folded once and looked up in a prebuilt index,
+    # with a fuzzy (trigram) fallback for typos; see cras_mapping.py
     if 'bairro' in df.columns:
-        df['CRAS de Referência'] = df['bairro'].apply(normalize_and_map_bairro)
+        df['CRAS de Referência'] = resolve_cras(df['bairro'])
     else:
-        df['CRAS de Referência'] = "SECRAS não identificado"
+        df['CRAS de Referência'] = UNRESOLVED_CRAS
     
     # Map other columns for visualizations.py to stay consistent or update visualizations.py
     # We'll use a mapping dict to ensure compatibility
@@ -315,6 +382,9 @@ def load_data(filepath):
     
     new_order = existing_priority + remaining + existing_metadata
     df = df[new_order]
+
+    if compact:
+        df, _ = compact_dtypes(df)
             
     return df
 
@@ -0,0 +1,202 @@
+import json
+import os
+import re
+import sys
+from datetime import date
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from data_cache import file_fingerprint
+from text_utils import fold
+
+# Elegibilidade ao CadÚnico (Eixo 0 e fichas individuais).
+# As regras ficam num JSON versionado (regras_cadunico.json): salário mínimo
+# de cada ano, limites em salários mínimos (renda total e per capita) e os
+# valores mínimo/máximo de cada faixa de renda do formulário. Cada estudante é
+# avaliado com o salário mínimo do ano da entrevista e, para o critério per
+# capita, com o tamanho da família estimado a partir de "com quem mora".
+# Tudo é calculado como máscaras sobre a base inteira, numa única passada que
+# devolve a coluna de situação e as contagens juntas.
+RULES_PATH = os.environ.get('EDUCAFRO_CADUNICO_RULES', 'regras_cadunico.json')
+
+CADUNICO_HAS = "✅ Já possui CadÚnico"
+CADUNICO_ELIGIBLE = "✅ Elegível"
+CADUNICO_ELIGIBLE_PER_CAPITA = "✅ Elegível (renda per capita)"
+CADUNICO_MAYBE = "⚠️ Verificar (pode ser elegível)"
+CADUNICO_CHECK = "⚠️ Verificar"
+CADUNICO_NOT_ELIGIBLE = "❌ Não elegível"
+
+# Ordem de avaliação: vale a primeira condição verdadeira (np.select)
+OUTCOMES = [CADUNICO_HAS, CADUNICO_ELIGIBLE, CADUNICO_ELIGIBLE_PER_CAPITA,
+            CADUNICO_NOT_ELIGIBLE, CADUNICO_MAYBE, CADUNICO_CHECK]
+
+INCOME_COLUMN = 'Renda Familiar'
+CADUNICO_COLUMN = 'CadÚnico'
+HOUSEHOLD_COLUMN = 'cotidiano_mora_com_quem'
+INTERVIEW_DATE_COLUMN = 'data_entrevista'
+
+_NUMBER_WORDS = {'um': 1, 'uma': 1, 'dois': 2, 'duas': 2, 'tres': 3, 'quatro': 4, 'cinco': 5,
+                 'seis': 6, 'sete': 7, 'oito': 8, 'nove': 9, 'dez': 10}
+# Separadores da lista ("mais novo/velho" não separa) e início de cada número ("MÃE 2 IRMÃOS")
+_HOUSEHOLD_SPLIT = re.compile(r"[,;/+.&]|\b(?:e|com|mais(?!\s+(?:nov|velh)))\b|(?=\b\d)")
+# Idades e observações entre parênteses não são contagens de pessoas
+_HOUSEHOLD_NOISE = re.compile(r"\([^)]*\)|\b\d+\s*anos?\b")
+_LEADING_COUNT = re.compile(r"^(\d+)")
+MAX_HOUSEHOLD_COUNT = 10  # número maior que isso numa parte da lista não é contagem de pessoas
+# Partes que não somam pessoas à casa: o próprio estudante e animais
+_NOT_COUNTED = ('eu', 'aluna', 'aluno', 'estudante', 'cachorr', 'cao', 'caes', 'gato', 'gata', 'pet', 'animal')
+
+class EligibilityRules:
+    """Regras de uma versão do JSON; `key` identifica a versão no cache."""
+
+    def __init__(self, spec, fingerprint=''):
+        self.version = spec['versao']
+        self.key = f"{self.version}-{fingerprint[:12]}" if fingerprint else self.version
+        self.description = spec.get('descricao', '')
+        self.minimum_wages = {int(year): float(value) for year, value in spec['salario_minimo'].items()}
+        criteria = spec['criterios']
+        self.total_max_sm = float(criteria['renda_total_max_sm'])
+        self.per_capita_max_sm = float(criteria['renda_per_capita_max_sm'])
+        # Faixa -> (mínimo, máximo) em R$; máximo None = faixa aberta ("Acima de ...")
+        self.bands = {label: (float(low), np.inf if high is None else float(high))
+                      for label, (low, high) in spec['faixas_renda'].items()}
+
+    def minimum_wage(self, year):
+        """Salário mínimo vigente no ano (o último definido até ele; o primeiro, para anos anteriores)."""
+        years = sorted(self.minimum_wages)
+        known = [y for y in years if y <= year]
+        return self.minimum_wages[known[-1] if known else years[0]]
+
+    def summary(self, year=None):
+        """Texto dos critérios com os valores em reais do ano (padrão: o ano atual)."""
+        wage = self.minimum_wage(year or date.today().year)
+        return (f"Renda familiar total de até **{minimum_wages_text(self.total_max_sm)}** "
+                f"(R\\$ {brl(wage * self.total_max_sm)}) **ou** renda mensal per capita de até "
+                f"**{minimum_wages_text(self.per_capita_max_sm)}** (R\\$ {brl(wage * self.per_capita_max_sm)}).")
+
+def minimum_wages_text(multiple):
+    if multiple == 0.5:
+        return "meio salário mínimo"
+    return f"{multiple:g} salário mínimo" if multiple == 1 else f"{multiple:g} salários mínimos"
+
+def brl(value):
+    return f"{value:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+@lru_cache(maxsize=8)
+def _load_rules(path, fingerprint):
+    with open(path, encoding='utf-8') as f:
+        return EligibilityRules(json.load(f), fingerprint)
+
+def load_rules(path=RULES_PATH):
+    """Regras do JSON, relidas só quando o conteúdo do arquivo muda."""
+    return _load_rules(os.path.abspath(path), file_fingerprint(path))
+
+def household_size(text):
+    """Pessoas na casa (estudante incluído) a partir de "com quem mora"; NaN se não der para estimar.
+
+    Cada parte da lista conta uma pessoa, ou o número escrito na frente dela
+    ("2 irmãos", "dois primos"); plural sem número conta duas ("avós", "pais").
+    """
+    if pd.isna(text):
+        return np.nan
+    text = _HOUSEHOLD_NOISE.sub(' ', fold(str(text)))
+    if 'sozinh' in text:
+        return 1
+    size = 1
+    for part in _HOUSEHOLD_SPLIT.split(text):
+        words = part.split()
+        if not words:
+            continue
+        count = _LEADING_COUNT.match(words[0])
+        if any(word.startswith(_NOT_COUNTED) for word in words):
+            continue
+        if count:
+            size += int(count.group(1)) if int(count.group(1)) <= MAX_HOUSEHOLD_COUNT else 0
+        elif words[0] in _NUMBER_WORDS and len(words) > 1:
+            size += _NUMBER_WORDS[words[0]]
+        elif words[-1].endswith('s'):
+            size += 2
+        else:
+            size += 1
+    return size if size > 1 else np.nan
+
+def _distinct(series, transform, default=np.nan):
+    """`transform` avaliado uma vez por valor distinto, como vetor float (ausentes = `default`)."""
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([transform(value) for value in pd.Series(uniques, dtype=object)], dtype=float)
+    return np.append(mapped, default)[codes]
+
+class EligibilityResult:
+    """Situação de cada estudante (`labels`) e as contagens de cada situação, da mesma passada."""
+
+    def __init__(self, labels, counts, rules):
+        self.labels = labels
+        self.counts = counts
+        self.rules_key = rules.key
+
+    @property
+    def total(self):
+        return len(self.labels)
+
+    @property
+    def has(self):
+        return self.counts[CADUNICO_HAS]
+
+    @property
+    def eligible(self):
+        return self.counts[CADUNICO_ELIGIBLE] + self.counts[CADUNICO_ELIGIBLE_PER_CAPITA]
+
+    @property
+    def check(self):
+        return self.counts[CADUNICO_MAYBE] + self.counts[CADUNICO_CHECK]
+
+    @property
+    def not_eligible(self):
+        return self.counts[CADUNICO_NOT_ELIGIBLE]
+
+def evaluate(df, rules=None, reference_year=None):
+    """Avalia as regras na base inteira; devolve um `EligibilityResult`.
+
+    Quem não tem data de entrevista é avaliado com o salário mínimo de
+    `reference_year` (padrão: o ano atual).
+    """
+    rules = rules or load_rules()
+    n = len(df)
+
+    def column(col):
+        return df[col] if col in df.columns else pd.Series([np.nan] * n, index=df.index, dtype=object)
+
+    has = _distinct(column(CADUNICO_COLUMN), lambda v: 'sim' in str(v).strip().lower(), 0).astype(bool)
+    low = _distinct(column(INCOME_COLUMN), lambda v: rules.bands.get(str(v).strip(), (np.nan,))[0])
+    high = _distinct(column(INCOME_COLUMN), lambda v: rules.bands.get(str(v).strip(), (np.nan, np.nan))[1])
+    size = _distinct(column(HOUSEHOLD_COLUMN), household_size)
+    year = _distinct(column(INTERVIEW_DATE_COLUMN), lambda v: pd.to_datetime(v, errors='coerce').year,
+                     reference_year or date.today().year)
+    year[np.isnan(year)] = reference_year or date.today().year
+    wage = _distinct(pd.Series(year), rules.minimum_wage)
+
+    total_limit = wage * rules.total_max_sm
+    per_capita_limit = wage * rules.per_capita_max_sm
+    with np.errstate(invalid='ignore'):
+        conditions = [
+            has,
+            high <= total_limit,
+            high / size <= per_capita_limit,
+            (low > total_limit) & ~(low / size <= per_capita_limit),
+            (low <= total_limit) | (low / size <= per_capita_limit),
+        ]
+    choice = np.select(conditions, np.arange(len(conditions)), default=len(conditions))
+    labels = pd.Series(np.array(OUTCOMES, dtype=object)[choice], index=df.index,
+                       name='Pode Requerer CadÚnico?', dtype=object)
+    counts = dict(zip(OUTCOMES, np.bincount(choice, minlength=len(OUTCOMES)).tolist()))
+    return EligibilityResult(labels, counts, rules)
+
+# Uso: python eligibility.py [csv]   (contagem de cada situação com as regras atuais)
+if __name__ == "__main__":
+    from data_cache import load_data_cached
+    source = sys.argv[1] if len(sys.argv) > 1 else 'data/entrevistas_backup.csv'
+    rules = load_rules()
+    result = evaluate(load_data_cached(source, compact=True), rules)
+    print(f"Regras {rules.key}: {result.total} estudantes")
+    for label, count in result.counts.items():
+        print(f"  {label:<34} {count}")
@@ -1,13 +1,141 @@
 import pandas as pd
 from fpdf import FPDF
 import visualizations as viz
-import plotly.io as pio
+from aggregates import cube_for
+from renderer_pool import renderer_pool, POOL_TABS
+import image_cache
+from pdf_profiles import QUALITY_PROFILES, DEFAULT_QUALITY
+import hashlib
 import io
 import os
 from datetime import datetime
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from PIL import Image
+
+# Rasterização dos gráficos: as figuras são montadas primeiro e convertidas
+# em PNG por um pool de threads (o trabalho pesado roda no navegador
+# persistente de renderer_pool); as páginas são montadas depois, na ordem original.
+RENDER_WORKERS = int(os.environ.get('EDUCAFRO_PDF_WORKERS', POOL_TABS))  # uma thread por aba do navegador
+RENDER_TIMEOUT = float(os.environ.get('EDUCAFRO_PDF_CHART_TIMEOUT', '60'))  # segundos por gráfico
+IMAGE_OPTIONS = dict(format='png', width=1000, height=600, scale=2)
+
+CHART_WIDTH_MM = 160
+WORDCLOUD_WIDTH_MM = 140
+
+def raster_options(quality=DEFAULT_QUALITY):
+    """Opções do Kaleido para rasterizar os gráficos já na resolução do perfil."""
+    target_px = QUALITY_PROFILES[quality]['dpi'] * CHART_WIDTH_MM / 25.4
+    return dict(IMAGE_OPTIONS, scale=round(target_px / IMAGE_OPTIONS['width'], 2))
+
+def image_options(quality=DEFAULT_QUALITY):
+    """Opções do Kaleido para os gráficos do perfil: SVG no modo vetorial, PNG nos demais."""
+    if QUALITY_PROFILES[quality].get('vector'):
+        return dict(IMAGE_OPTIONS, format='svg', scale=1)
+    return raster_options(quality)
+
+def is_svg(data):
+    head = data[:256].lstrip()
+    return head.startswith(b'<svg') or (head.startswith(b'<?xml') and b'<svg' in data[:1024])
+
+def render_figure(fig, options=IMAGE_OPTIONS):
+    """Imagem de uma figura Plotly: do cache em disco ou pelo navegador persistente do pool."""
+    return image_cache.cached_render(fig, options, lambda: renderer_pool.render(fig, **options))
+
+def rasterize_figures(figures, workers=RENDER_WORKERS, timeout=RENDER_TIMEOUT, options=IMAGE_OPTIONS, on_done=None):
+    """Converte as figuras em PNG em paralelo.
+
+    Devolve, na mesma ordem, os bytes de cada imagem ou a exceção que impediu
+    a conversão (inclusive estouro do tempo limite, contado a partir do início
+    da renderização daquele gráfico). `on_done(i)` é chamado (de qualquer
+    thread) quando cada figura fica pronta.
+    """
+    results = [None] * len(figures)
+    started = {}
+    # Imagens já renderizadas antes (cache em disco) não passam pelo navegador
+    keys = {}
+    for i, fig in enumerate(figures):
+        if fig is not None:
+            keys[i], results[i] = image_cache.lookup(fig, options)
+            if results[i] is not None and on_done is not None:
+                on_done(i)
+    pending = {i: figures[i] for i in keys if results[i] is None}
+    if not pending:
+        return results
+    # Abre (ou reabre) o navegador antes, para o início não contar no tempo dos gráficos
+    renderer_pool.ensure_healthy()
+
+    def render(i, fig):
+        started[i] = time.monotonic()
+        return image_cache.store(keys[i], options, renderer_pool.render(fig, **options))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='pdf-chart')
+    futures = {i: executor.submit(render, i, fig) for i, fig in pending.items()}
+    if on_done is not None:
+        for i, future in futures.items():
+            future.add_done_callback(lambda _, i=i: on_done(i))
+    stalled = 0  # workers presos em gráficos que estouraram o tempo
+    try:
+        for i, future in futures.items():
+            queued_waits = 0
+            while True:
+                begun = started.get(i)
+                wait = timeout if begun is None else begun + timeout - time.monotonic()
+                try:
+                    results[i] = future.result(timeout=max(wait, 0))
+                except FuturesTimeout:
+                    if i not in started:
+                        # Ainda na fila, atrás de outros gráficos. Se todos os
+                        # workers estão presos, espera só mais um tempo limite.
+                        queued_waits += 1
+                        if stalled < workers or queued_waits == 1:
+                            continue
+                    future.cancel()
+                    stalled += 1
+                    results[i] = TimeoutError(f"tempo limite de {timeout:g}s excedido")
+                except Exception as e:
+                    results[i] = e
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
 
 class EducafroPDF(FPDF):
+    def __init__(self, *args, quality=DEFAULT_QUALITY, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.quality = quality
+        self.profile = QUALITY_PROFILES[quality]
+        self._prepared = {}  # (hash da imagem de origem, largura) -> bytes já no perfil
+        self.errors = []     # gráficos que saíram como célula de erro
+
+    def prepare_image(self, data, width):
+        """Redimensiona para o DPI do perfil e recodifica; imagens repetidas são preparadas uma vez.
+
+        Bytes idênticos também são gravados uma única vez no PDF pelo fpdf2.
+        """
+        key = (hashlib.sha256(data).hexdigest(), width)
+        if key not in self._prepared:
+            image = Image.open(io.BytesIO(data))
+            target_px = round(self.profile['dpi'] * width / 25.4)
+            resize = image.width > target_px
+            if resize:
+                image = image.resize((target_px, round(image.height * target_px / image.width)), Image.LANCZOS)
+            out = io.BytesIO()
+            if self.profile['format'] == 'PNG' and not resize and image.format == 'PNG':
+                out.write(data)  # já está no perfil: o fpdf2 recomprime os pixels de qualquer forma
+            elif self.profile['format'] == 'JPEG':
+                if image.mode != 'RGB':
+                    # Transparência sobre fundo branco (JPEG não tem canal alfa)
+                    background = Image.new('RGB', image.size, 'white')
+                    background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+                    image = background
+                image.save(out, format='JPEG', quality=self.profile['jpeg_quality'], optimize=True)
+            else:
+                image.save(out, format='PNG')
+            self._prepared[key] = out.getvalue()
+        return self._prepared[key]
+
     def header(self):
         self.set_font('helvetica', 'B', 15)
         self.set_text_color(29, 53, 87) # viz.COLORS['primary']
@@ -36,15 +164,17 @@ class EducafroPDF(FPDF):
         self.cell(0, 8, title, ln=1)
         # No LN here to keep chart close
 
-    def add_plotly_chart(self, fig, width=160):
+    def add_plotly_chart(self, fig, width=CHART_WIDTH_MM, image=None):
+        """`image`: PNG já rasterizado para `fig` (ou a exceção da rasterização)."""
         if fig is None:
             return
         try:
             # High resolution export for better print quality
-            img_bytes = pio.to_image(fig, format='png', width=1000, height=600, scale=2)
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmpfile:
-                tmpfile.write(img_bytes)
-                tmp_path = tmpfile.name
+            img_bytes = render_figure(fig, image_options(self.quality)) if image is None else image
+            if isinstance(img_bytes, Exception):
+                raise img_bytes
+            if not is_svg(img_bytes):
+                img_bytes = self.prepare_image(img_bytes, width)
             
             page_width = self.w - 2 * self.l_margin
             x = self.l_margin + (page_width - width) / 2
@@ -53,21 +183,26 @@ class EducafroPDF(FPDF):
             if (self.get_y() + 80) > (self.h - 20):
                 self.add_page()
             
-            self.image(tmp_path, x=x, w=width)
-            os.unlink(tmp_path)
+            try:
+                self.image(io.BytesIO(img_bytes), x=x, w=width)
+            except Exception:
+                if not is_svg(img_bytes):
+                    raise
+                # SVG que o fpdf2 não sabe desenhar: o gráfico entra rasterizado
+                png = render_figure(fig, raster_options(self.quality))
+                self.image(io.BytesIO(self.prepare_image(png, width)), x=x, w=width)
             self.ln(3)
         except Exception as e:
+            self.errors.append(e)
             self.set_font('helvetica', 'I', 8)
             self.set_text_color(230, 57, 70)
             self.cell(0, 10, f'Erro ao renderizar gr\u00e1fico Plotly: {str(e)}', ln=1)
 
-    def add_wordcloud(self, buf, width=140):
+    def add_wordcloud(self, buf, width=WORDCLOUD_WIDTH_MM):
         if buf is None:
             return
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmpfile:
-                tmpfile.write(buf.getvalue())
-                tmp_path = tmpfile.name
+            img_bytes = self.prepare_image(buf.getvalue(), width)
             
             page_width = self.w - 2 * self.l_margin
             x = self.l_margin + (page_width - width) / 2
@@ -75,40 +210,16 @@ class EducafroPDF(FPDF):
             if (self.get_y() + 60) > (self.h - 20):
                 self.add_page()
 
-            self.image(tmp_path, x=x, w=width)
-            os.unlink(tmp_path)
+            self.image(io.BytesIO(img_bytes), x=x, w=width)
             self.ln(3)
         except Exception as e:
+            self.errors.append(e)
             self.cell(0, 10, f'Erro ao renderizar WordCloud: {str(e)}', ln=1)
 
-def generate_student_profile_pdf(df):
-    pdf = EducafroPDF()
-    pdf.alias_nb_pages()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    # --- PAGE 1: RESUMO ---
-    pdf.add_page()
-    pdf.chapter_title("Resumo Geral e Indicadores-Chave")
-    
-    total = len(df)
-    mulheres = (len(df[df['Identidade de Gênero'] == 'Feminina']) / total * 100) if total > 0 else 0
-    pcd = len(df[df['Possui Deficiência?'] == 'Sim'])
-    filhos = len(df[df['Tem Filhos?'] == 'Sim'])
-    trabalha = len(df[(df['Vínculo de Trabalho'].notna()) & (df['Vínculo de Trabalho'] != 'Não')])
-
-    pdf.set_font('helvetica', '', 11)
-    text = (f"- Total de estudantes: {total}\n"
-            f"- Representatividade feminina: {mulheres:.1f}%\n"
-            f"- Estudantes com defici\u00eancia: {pcd}\n"
-            f"- Estudantes que s\u00e3o pais/m\u00e3es: {filhos}\n"
-            f"- Estudantes trabalhadores (Risco de evas\u00e3o): {trabalha}\n")
-    pdf.multi_cell(0, 8, text)
-    pdf.ln(5)
-
-    # --- EIXO 1: SOCIODEMOGRÁFICO ---
-    pdf.chapter_title("Eixo 1: Perfil Sociodemogr\u00e1fico")
-    
-    charts_eixo1 = [
+# Capítulos do relatório: (título, itens), cada item = (título da seção, gráfico).
+# Gráficos que devolvem imagem (nuvens de palavras) entram como imagem direta.
+REPORT_CHAPTERS = [
+    ("Eixo 1: Perfil Sociodemogr\u00e1fico", [
         ("Composi\u00e7\u00e3o Racial", viz.chart_1_race_composition),
         ("Distribui\u00e7\u00e3o por G\u00eanero", viz.chart_2_gender_distribution),
         ("Ra\u00e7a por G\u00eanero", viz.chart_3_race_by_gender),
@@ -116,21 +227,10 @@ def generate_student_profile_pdf(df):
         ("Tipo de Escola", viz.chart_19_school_type),
         ("Faixas Et\u00e1rias", viz.chart_4_age_groups),
         ("Cidades de Origem", viz.chart_5_geography),
-        ("Estado Civil", viz.chart_31_marital_status)
-    ]
-    
-    for title, func in charts_eixo1:
-        pdf.section_title(title)
-        pdf.add_plotly_chart(func(df))
-    
-    pdf.section_title("Origem Profissional Familiar (Nuvem)")
-    pdf.add_wordcloud(viz.chart_38_parental_professions_cloud(df))
-
-    # --- EIXO 2: TRABALHO E RENDA ---
-    pdf.add_page()
-    pdf.chapter_title("Eixo 2: Trabalho, Renda e Condi\u00e7\u00f5es Socioecon\u00f4micas")
-    
-    charts_eixo2 = [
+        ("Estado Civil", viz.chart_31_marital_status),
+        ("Origem Profissional Familiar (Nuvem)", viz.chart_38_parental_professions_cloud),
+    ]),
+    ("Eixo 2: Trabalho, Renda e Condi\u00e7\u00f5es Socioecon\u00f4micas", [
         ("Situa\u00e7\u00e3o de Trabalho (Geral)", viz.chart_6_employment_general),
         ("Emprego por G\u00eanero", viz.chart_7_employment_by_gender),
         ("V\u00ednculos de Trabalho", viz.chart_8_job_categories),
@@ -147,58 +247,108 @@ def generate_student_profile_pdf(df):
         ("Tipo de Moradia", viz.chart_26_housing_type),
         ("Estudantes com Filhos", viz.chart_27_parenthood),
         ("Uso do Dinheiro do Trabalho", viz.chart_10_money_usage),
-        ("Cadastro \u00danico (Cad\u00danico)", viz.chart_10b_cadunico)
-    ]
-    
-    for title, func in charts_eixo2:
-        pdf.section_title(title)
-        pdf.add_plotly_chart(func(df))
-
-    pdf.section_title("Detalhamento de V\u00ednculos (Nuvem)")
-    pdf.add_wordcloud(viz.chart_8b_job_wordcloud(df))
-
-    # --- EIXO 3: MOBILIDADE E INTERESSES ---
-    pdf.add_page()
-    pdf.chapter_title("Eixo 3: Mobilidade e Interesses Formativos")
-    
-    pdf.section_title("Temas de Interesse (Nuvem)")
-    pdf.add_wordcloud(viz.chart_16_interests(df))
-    
-    pdf.section_title("Cursos Desejados (Nuvem)")
-    pdf.add_wordcloud(viz.chart_17_courses(df))
-
-    charts_eixo3 = [
+        ("Cadastro \u00danico (Cad\u00danico)", viz.chart_10b_cadunico),
+        ("Detalhamento de V\u00ednculos (Nuvem)", viz.chart_8b_job_wordcloud),
+    ]),
+    ("Eixo 3: Mobilidade e Interesses Formativos", [
+        ("Temas de Interesse (Nuvem)", viz.chart_16_interests),
+        ("Cursos Desejados (Nuvem)", viz.chart_17_courses),
         ("Meio de Transporte", viz.chart_23_transport_modes),
         ("Necessidade de Aux\u00edlio Transporte", viz.chart_37_transport_subsidy),
-        ("Disponibilidade para Estudo", viz.chart_40_study_availability)
-    ]
-    for title, func in charts_eixo3:
-        pdf.section_title(title)
-        pdf.add_plotly_chart(func(df))
-
-    # --- EIXO 4: SAÚDE E ASSISTÊNCIA ---
-    pdf.add_page()
-    pdf.chapter_title("Eixo 4: Sa\u00fade e Assist\u00eancia")
-    
-    charts_eixo4 = [
+        ("Disponibilidade para Estudo", viz.chart_40_study_availability),
+    ]),
+    ("Eixo 4: Sa\u00fade e Assist\u00eancia", [
         ("Cobertura de Sa\u00fade", viz.chart_21_health_access),
         ("Sinal de Internet Local", viz.chart_25_internet_signal),
         ("Representa\u00e7\u00e3o de Defici\u00eancias", viz.chart_28_disability),
         ("Tipo Sangu\u00edneo", viz.chart_29_blood_type),
         ("Uso de Subst\u00e2ncias", viz.chart_34_substance_use),
-        ("Configura\u00e7\u00e3o Familiar (Mora com quem)", viz.chart_35_family_context)
-    ]
-    for title, func in charts_eixo4:
-        pdf.section_title(title)
-        pdf.add_plotly_chart(func(df))
+        ("Configura\u00e7\u00e3o Familiar (Mora com quem)", viz.chart_35_family_context),
+        ("Perfil de Sa\u00fade e Necessidades (Nuvem)", viz.chart_41_health_needs_cloud),
+    ]),
+    ("Gest\u00e3o e Operacionaliza\u00e7\u00e3o", [
+        ("Entrevistas por Entrevistador(a)", viz.chart_30_interviewer_balance),
+    ]),
+]
+
+def is_plotly_figure(result):
+    return hasattr(result, 'to_json')
+
+def generate_student_profile_pdf(df, workers=RENDER_WORKERS, timeout=RENDER_TIMEOUT, quality=DEFAULT_QUALITY,
+                                 errors=None, progress=None):
+    """Relatório completo em PDF.
+
+    Se `errors` (lista) for passado, recebe as falhas de renderização.
+    `progress(etapa, feitos, total, item)` é chamado a cada gráfico montado,
+    renderizado e paginado (etapas 'montando', 'renderizando', 'paginando').
+    """
+    report = progress or (lambda *args: None)
+    n_items = sum(len(items) for _, items in REPORT_CHAPTERS)
+
+    # 1. Monta todas as figuras (rápido) e rasteriza os gráficos Plotly em paralelo
+    chapters = []
+    for title, items in REPORT_CHAPTERS:
+        built = []
+        for section, func in items:
+            built.append((section, func(df)))
+            report('montando', sum(len(c[1]) for c in chapters) + len(built), n_items, section)
+        chapters.append((title, built))
+    sections = [section for _, items in chapters for section, result in items if is_plotly_figure(result)]
+    figures = [result for _, items in chapters for _, result in items if is_plotly_figure(result)]
+
+    rendered_count = [0]
+    count_lock = threading.Lock()
+    def figure_done(i):
+        with count_lock:
+            rendered_count[0] += 1
+            done = rendered_count[0]
+        report('renderizando', done, len(figures), sections[i])
 
-    pdf.section_title("Perfil de Sa\u00fade e Necessidades (Nuvem)")
-    pdf.add_wordcloud(viz.chart_41_health_needs_cloud(df))
+    rendered = rasterize_figures(figures, workers=workers, timeout=timeout, options=image_options(quality),
+                                 on_done=figure_done)
+    images = dict(zip(map(id, figures), rendered))
 
-    # --- GESTÃO ---
+    # 2. Monta as páginas na ordem do relatório
+    pdf = EducafroPDF(quality=quality)
+    pdf.alias_nb_pages()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    
+    # --- PAGE 1: RESUMO ---
     pdf.add_page()
-    pdf.chapter_title("Gest\u00e3o e Operacionaliza\u00e7\u00e3o")
-    pdf.section_title("Entrevistas por Entrevistador(a)")
-    pdf.add_plotly_chart(viz.chart_30_interviewer_balance(df))
+    pdf.chapter_title("Resumo Geral e Indicadores-Chave")
+    
+    # Indicadores e gráficos leem do mesmo cubo: a base é percorrida uma única vez
+    cube = cube_for(df)
+    total = cube.n
+    mulheres = (cube.count_of('Identidade de Gênero', 'Feminina') / total * 100) if total > 0 else 0
+    pcd = cube.count_of('Possui Deficiência?', 'Sim')
+    filhos = cube.count_of('Tem Filhos?', 'Sim')
+    trabalha = cube.answered('Vínculo de Trabalho') - cube.count_of('Vínculo de Trabalho', 'Não')
+
+    pdf.set_font('helvetica', '', 11)
+    text = (f"- Total de estudantes: {total}\n"
+            f"- Representatividade feminina: {mulheres:.1f}%\n"
+            f"- Estudantes com defici\u00eancia: {pcd}\n"
+            f"- Estudantes que s\u00e3o pais/m\u00e3es: {filhos}\n"
+            f"- Estudantes trabalhadores (Risco de evas\u00e3o): {trabalha}\n")
+    pdf.multi_cell(0, 8, text)
+    pdf.ln(5)
+
+    # --- EIXOS 1-4 E GESTÃO (o Eixo 1 continua na página do resumo) ---
+    placed = 0
+    for index, (chapter, items) in enumerate(chapters):
+        if index > 0:
+            pdf.add_page()
+        pdf.chapter_title(chapter)
+        for section, result in items:
+            pdf.section_title(section)
+            if is_plotly_figure(result):
+                pdf.add_plotly_chart(result, image=images[id(result)])
+            else:
+                pdf.add_wordcloud(result)
+            placed += 1
+            report('paginando', placed, n_items, section)
 
+    if errors is not None:
+        errors.extend(pdf.errors)
     return bytes(pdf.output())
@@ -1,26 +1,21 @@
 
 import pandas as pd
-from data_loader import load_data
+from data_cache import load_data_cached
+from aggregates import cube_for
 import os
 
 # Caminho do CSV
 CSV_PATH = 'entrevistas_educafro_consolidated_final_20260308.csv'
-df = load_data(CSV_PATH)
 
 def get_stats(df, column_name):
     if column_name not in df.columns:
         return "  - Sem dados (Coluna não encontrada)"
-    counts = df[column_name].value_counts()
-    if counts.empty:
+    lines = cube_for(df).summary(column_name, template="  - {label}: {count} ({percent:.1f}%)")
+    if not lines:
         return "  - Sem ocorrências"
-    total = len(df)
-    lines = []
-    for label, count in counts.items():
-        percent = (count / total * 100)
-        lines.append(f"  - {label}: {count} ({percent:.1f}%)")
     return "\n".join(lines)
 
-sections = {
+SECTIONS = {
     "Eixo 1: Perfil Sociodemográfico": [
         ('Composição Racial', 'Race_Group'),
         ('Identidade de Gênero', 'Identidade de Gênero'),
@@ -72,16 +67,24 @@ sections = {
     ]
 }
 
-content = ["RELATÓRIO DE DADOS - EDUCAFRO 2026", "="*35, f"Total de Entrevistados: {len(df)}\n"]
+def main():
+    # Só as colunas usadas no relatório são lidas do snapshot limpo
+    report_columns = sorted({col for charts in SECTIONS.values() for _, col in charts})
+    df = load_data_cached(CSV_PATH, columns=report_columns)
 
-for section, charts in sections.items():
-    content.append(f"\n{section}")
-    content.append("-" * len(section))
-    for title, col in charts:
-        content.append(f"\n{title}:")
-        content.append(get_stats(df, col))
+    content = ["RELATÓRIO DE DADOS - EDUCAFRO 2026", "="*35, f"Total de Entrevistados: {len(df)}\n"]
 
-with open('dados dos graficos.txt', 'w', encoding='utf-8') as f:
-    f.write("\n".join(content))
+    for section, charts in SECTIONS.items():
+        content.append(f"\n{section}")
+        content.append("-" * len(section))
+        for title, col in charts:
+            content.append(f"\n{title}:")
+            content.append(get_stats(df, col))
 
-print("Arquivo 'dados dos graficos.txt' regerado com todos os novos campos e gráficos.")
+    with open('dados dos graficos.txt', 'w', encoding='utf-8') as f:
+        f.write("\n".join(content))
+
+    print("Arquivo 'dados dos graficos.txt' regerado com todos os novos campos e gráficos.")
+
+if __name__ == "__main__":
+    main()
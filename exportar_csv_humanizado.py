@@ -1,11 +1,14 @@
 import pandas as pd
-from data_loader import load_data
+from data_cache import load_data_cached
+from snapshot import preferred_source
 import os
 
 def export_humanized_csv():
     # 1. Carrega os dados exatos processados pelo Streamlit no app.py
     CSV_PATH = 'data/entrevistas_consolidated.csv'
-    df = load_data(CSV_PATH)
+    # Snapshot Parquet da base consolidada, se estiver em dia com o CSV
+    source, _ = preferred_source(CSV_PATH)
+    df = load_data_cached(source)
     
     # 2. As colunas já foram renomeadas e reordenadas pelo `data_loader.py` na Priority List
     # Retiramos apenas colunas técnicas criadas pelo sistema que o humano não precisa ler
@@ -15,9 +18,9 @@ def export_humanized_csv():
     df_clean = df[colunas_limpas].copy()
     
     # Substituir os campos faltantes vazios por "Não informado" para melhor legibilidade
-    # Converte tipos numéricos estritos (Int64) para object antes para aceitar string
+    # Converte tipos numéricos estritos (Int64) e categóricos para object antes para aceitar string
     for col in df_clean.columns:
-        if str(df_clean[col].dtype) == 'Int64':
+        if str(df_clean[col].dtype) in ('Int64', 'category'):
             df_clean[col] = df_clean[col].astype(object)
             
     df_clean = df_clean.fillna("Não informado")
@@ -1,12 +1,15 @@
 import pandas as pd
-from data_loader import load_data
+from data_cache import load_data_cached
+from snapshot import preferred_source
 from export_pdf import generate_student_profile_pdf
 import os
 
 def main():
     try:
         print("Carregando dados...")
-        df = load_data('data/entrevistas_consolidated.csv')
+        # Snapshot Parquet da base consolidada, se estiver em dia com o CSV
+        source, _ = preferred_source('data/entrevistas_consolidated.csv')
+        df = load_data_cached(source)
         
         print("Gerando PDF completo (40 graficos)... Isso pode levar alguns segundos.")
         pdf_bytes = generate_student_profile_pdf(df)
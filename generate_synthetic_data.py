@@ -0,0 +1,548 @@
+import json
+import os
+import sys
+import uuid
+import numpy as np
+import pandas as pd
+from text_utils import fold
+
+# Gerador de entrevistas sintéticas no formato do formulário v2 (colunas snake_case
+# do planning.md), para testar carga, gráficos e PDF em escala.
+# Uso: python generate_synthetic_data.py <linhas> <saida.csv|saida.json> [semente]
+# A saída é determinística: cada lote de BATCH_ROWS linhas usa um gerador
+# derivado de (semente, nº do lote), então as primeiras N linhas são as mesmas
+# qualquer que seja o total pedido. Os lotes são gravados um a um (CSV ou array
+# JSON), sem montar a base inteira em memória, o que permite milhões de linhas.
+# As distribuições seguem as proporções da base real; nomes, documentos,
+# contatos e textos livres são inventados. As "sujeiras" que o load_data
+# precisa tratar aparecem de propósito: Sim/Não digitados de vários jeitos,
+# "Outro" com o texto em *_outro, datas em formatos mistos, CPFs com e sem
+# pontuação, CPFs repetidos com updated_at diferente, rascunhos e registros de teste.
+BATCH_ROWS = 10_000
+DEFAULT_SEED = 2026
+FIRST_ID = 100_000
+
+COLUMNS = """id,created_at,updated_at,entrevistador,data_entrevista,telefone,email,data_nascimento,cpf,rg,
+cidade,naturalidade,endereco,bairro,estado_civil,raca_cor,pronomes,genero,trans_travesti,orientacao_sexual,
+orientacao_sexual_outra,escolaridade,escolaridade_curso,escola_publica_privada,nome_mae,profissao_mae,
+escolaridade_mae,nome_pai,profissao_pai,escolaridade_pai,familiar_nucleo,vinculo_familiar,nome_familiar,
+moradia_condicao,moradia_tipo,internet_tem,internet_tipo,internet_sinal,trabalho_renda_semana,
+trabalho_ajuda_familiar,trabalho_vinculo,trabalho_horario_inicio,trabalho_horario_fim,trabalho_uso_dinheiro,
+renda_familiar,beneficios_recebe,beneficios_cadunico,beneficios_tipo,cesta_basica,filhos_tem,pensao_paga,
+pensao_recebe,transporte_veiculo,transporte_meio,transporte_auxilio,saude_plano,saude_servicos,
+saude_servicos_outro,saude_tipo_sanguineo,saude_psicoterapia,saude_psicoterapia_outro,saude_psicoterapia_tempo,
+saude_psicoterapia_encerramento,saude_deficiencia,saude_deficiencia_qual,saude_familiar_deficiencia,
+saude_familia_deficiencia_qual,saude_problemas,saude_problemas_qual,saude_alergias,saude_alergias_qual,
+saude_medicamentos,saude_medicamentos_qual,saude_substancias,saude_substancias_qual,cotidiano_mora_com,
+cotidiano_relacao,cotidiano_historico,objetivo_curso,objetivo_expectativa,objetivo_educafro,objetivo_temas,
+objetivo_frequencia,cotidiano_mora_com_quem,nome_completo,entrevistador_outro,cidade_outra,genero_outro,
+escolaridade_outro,escolaridade_mae_outro,escolaridade_pai_outro,vinculo_familiar_outro,moradia_condicao_outro,
+moradia_tipo_outro,internet_tipo_outro,internet_sinal_outro,trabalho_vinculo_outro,renda_familiar_outro,
+beneficios_outro,transporte_meio_outro,objetivo_educafro_outro,objetivo_frequencia_outro,nome_mesmo_documento,
+nome_civil_documento,form_uuid,status_formulario""".replace('\n', '').split(',')
+
+# Proporções das "sujeiras" e dos tipos de registro
+STATUS = {'completo': 89, 'falta entrevistar': 7.5, 'rascunho': 3.5}
+MESSY_ANSWER_RATE = 0.08    # Sim/Não digitados de outro jeito
+MESSY_TEXT_RATE = 0.3       # texto livre em maiúsculas ou com espaço sobrando
+DUPLICATE_RATE = 0.02       # reenvio do mesmo CPF com updated_at posterior
+SKIPPED_RATE = 0.03         # pergunta deixada em branco numa entrevista completa
+TEST_RECORD_RATE = 0.001    # registros "teste" esquecidos no formulário
+INTERVIEW_PERIOD = ('2026-02-10', '2026-06-30')
+# Idade na entrevista: 15 anos + gama (mediana ~20, cauda até os 60, como na base real)
+AGE_MIN, AGE_SHAPE, AGE_SCALE, AGE_MAX = 15, 1.3, 5.5, 62
+
+YES_VARIANTS = ['SIM', 'sim ', 'Sim (1)', ' Sim']
+NO_VARIANTS = ['NAO', 'nao', 'não ', 'Nao']
+
+# Respostas de múltipla escolha: {valor: peso}, proporções da base real
+CHOICES = {
+    'entrevistador': {'Mariana Costa': 44, 'Rosana Lima': 15, 'Juliana Prado': 6, 'Paulo Teixeira': 3,
+                      'Sandra Alves': 1, 'Mariana Costa, Rosana Lima': 1, 'Mariana Costa, Juliana Prado': 1},
+    'cidade': {'Santos': 53, 'São Vicente': 7, 'Guarujá': 7, 'Cubatão': 1, 'Praia Grande': 1, 'Outro': 1},
+    'estado_civil': {'Solteiro(a)': 58, 'Solteiro/a/e': 2, 'Divorciado(a)': 3, 'União Estável': 2,
+                     'Casado(a)': 1, 'Viúvo(a)': 1},
+    'raca_cor': {'Branco/a/e': 30, 'Preto/a/e': 22, 'Pardo/a/e': 15, 'Indígena': 2},
+    'pronomes': {'Ela/Dela': 2, 'Ele/Dele': 1, 'Elu/Delu': 0.5},
+    'genero': {'Feminina': 48, 'Masculina': 16, 'Não binárie': 2, 'Outro': 1, 'Homem Cis': 1, 'Mulher Cis': 1},
+    'trans_travesti': {'Não': 65, 'Sim': 2},
+    'orientacao_sexual': {'Heterossexual': 54, 'Bissexual': 7, 'Outra': 4, 'Lésbica': 3, 'Gay': 2,
+                          'Prefiro não declarar': 1},
+    'escolaridade': {'Ensino Médio incompleto': 31, 'Ensino Médio Completo': 30, 'Ensino superior incompleto': 4,
+                     'Ensino superior completo': 3, 'Outro': 1},
+    'escola_publica_privada': {'Sempre Pública': 46, 'Mista (Parte Pública / Parte Particular)': 8,
+                               'Sempre Particular (sem bolsa)': 4, 'Sempre Particular (com bolsa)': 3},
+    'escolaridade_mae': {'Ensino Médio Completo': 27, 'Ensino Fundamental incompleto': 20,
+                         'Ensino superior completo': 12, 'Ensino Médio incompleto': 4,
+                         'Ensino Fundamental completo': 4, 'Ensino superior incompleto': 1, 'Prefiro não dizer': 1},
+    'escolaridade_pai': {'Ensino Médio Completo': 24, 'Ensino Fundamental incompleto': 13, 'Prefiro não dizer': 9,
+                         'Ensino superior completo': 8, 'Ensino Médio incompleto': 6,
+                         'Ensino Fundamental completo': 3, 'Ensino superior incompleto': 1,
+                         'Não frequentou a escola': 1, 'Outro': 1, 'Outro:': 1},
+    'familiar_nucleo': {'Não': 60, 'Sim': 9},
+    'vinculo_familiar': {'Irmã': 3, 'Irmão': 2, 'Primo': 1, 'Filha': 1, 'Pai adotivo': 1,
+                         'Outro (por favor, especifique)': 1},
+    'moradia_condicao': {'Própria': 35, 'Alugada': 31, 'Cedida': 2, 'Outro': 1},
+    'moradia_tipo': {'Alvenaria': 57, 'Madeira': 4, 'Mista': 2},
+    'internet_tem': {'Sim': 66, 'Não': 3},
+    'internet_tipo': {'Wi-Fi (Banda Larga)': 61, 'Dados Móveis (Celular)': 3, 'Outro': 3, 'Celular, Wi-fi': 1},
+    'internet_sinal': {'Sim': 55, 'Não': 4, 'Outro': 2},
+    'trabalho_renda_semana': {'Não': 38, 'Sim': 31},
+    'trabalho_ajuda_familiar': {'Não': 48, 'Sim': 18},
+    'trabalho_vinculo': {'Registrado CLT': 14, 'Outro': 11, 'Estágio/Bolsa': 5, 'Autônomo': 5, 'Registrado PJ': 1},
+    'trabalho_horario_inicio': {'06:00': 1, '07:00': 3, '08:00': 8, '09:00': 4, '10:00': 2, '13:00': 1, '14:00': 3},
+    'trabalho_uso_dinheiro': {'Despesas da casa': 17, 'Gastos pessoais': 12, 'Estudos': 1},
+    'renda_familiar': {'De R$ 801,00 a R$ 1.045,00': 5, 'De R$ 1.046,00 R$ 2080,00': 19,
+                       'De R$ 2081,00 a R$ 3.120,00': 19, 'De R$ 3.120,00 a R$ 4.160,00': 8,
+                       'De R$ 4.161,00 a 5.200,00': 6, 'Acima de R$ 5.201,00': 10, 'Outro': 2},
+    'beneficios_recebe': {'Não': 51, 'Sim': 18},
+    'beneficios_cadunico': {'Não': 41, 'Sim': 25},
+    'beneficios_tipo': {'Outro': 7, 'Programa Bolsa Família (PBF)': 3, 'Programa Bolsa Família (PBF); Outro': 3,
+                        'Benefício de Prestação Continuada (BPC)': 2, 'Programa Nossa Família (PNF)': 1,
+                        'Programa Bolsa Família (PBF); Programa de Valorização ao Jovem (PVJ); Outro': 1,
+                        'Benefício de Prestação Continuada (BPC); Programa Bolsa Família (PBF)': 1},
+    'cesta_basica': {'Não': 46, 'Sim': 23},
+    'filhos_tem': {'Não': 58, 'Sim (1)': 9, 'Sim (2)': 2, 'Sim (3)': 1},
+    'pensao_paga': {'Não': 64, 'Sim': 5},
+    'pensao_recebe': {'Não': 57, 'Sim': 12},
+    'transporte_veiculo': {'Não': 51, 'Bicicleta': 10, 'Carro': 4, 'Moto': 3, 'Moto, Bicicleta': 1},
+    'transporte_meio': {'Transporte público (ônibus, VLT)': 52, 'Bicicleta': 6, 'Caminhada': 5, 'Motocicleta': 2,
+                        'Carro próprio': 2, 'Carona de amigos/familiares': 1, 'Outro': 1},
+    'transporte_auxilio': {'Sim': 33, 'Não': 32, 'Talvez': 1},
+    'saude_plano': {'Apenas SUS': 41, 'Apenas plano de saúde': 22, 'Uso os dois': 6},
+    'saude_tipo_sanguineo': {'Não sei': 36, 'A+': 12, 'O+': 10, 'O-': 5, 'B+': 2, 'A-': 2, 'AB+': 1,
+                             'Prefiro não informar': 1},
+    'saude_psicoterapia': {'Sim': 36, 'Não': 33},
+    'saude_deficiencia': {'Não': 59, 'Sim': 8},
+    'saude_familiar_deficiencia': {'Não': 4, 'Sim': 4},
+    'saude_problemas': {'Não': 43, 'Sim': 26},
+    'saude_alergias': {'Não': 47, 'Sim': 20, 'Talvez': 2},
+    'saude_medicamentos': {'Não': 41, 'Sim': 27},
+    'saude_substancias': {'Não': 55, 'Sim': 14},
+    'cotidiano_mora_com': {'Não': 59, 'Sim': 10},
+    'objetivo_frequencia': {'Sábados': 25, 'Intercalar entre dias de semana e fim de semana': 24,
+                            'Dias de semana': 17, 'Outro': 2},
+}
+
+# Perguntas respondidas só por parte dos entrevistados (campo novo no formulário)
+ANSWER_RATES = {'pronomes': 0.04, 'saude_familiar_deficiencia': 0.12}
+
+# Textos livres (e os *_outro), sorteados com a mesma probabilidade
+TEXTS = {
+    'naturalidade': ['Santos', 'Santos-SP', 'São Vicente', 'Guarujá', 'São Paulo', 'Cubatão', 'Salvador',
+                     'Recife', 'Praia Grande', 'Belo Horizonte'],
+    'profissao': ['Do lar', 'Professora', 'Autônomo', 'Pedreiro', 'Diarista', 'Motorista', 'Enfermeira',
+                  'Porteiro', 'Vendedora', 'Estivador', 'Cozinheira', 'Aposentado', 'Desempregado', 'Comerciante'],
+    'cidade_outra': ['Bertioga', 'Mongaguá', 'Itanhaém', 'Peruíbe'],
+    'orientacao_sexual_outra': ['Pansexual', 'Homossexual', 'Assexual'],
+    'genero_outro': ['MULHER TRANS', 'Agênero', 'Homem trans'],
+    'escolaridade_outro': ['Técnico em andamento', 'EJA', 'Supletivo'],
+    'escolaridade_pai_outro': ['Não sabe', 'Técnico'],
+    'vinculo_familiar_outro': ['Amigos', 'Tia', 'Madrinha'],
+    'moradia_condicao_outro': ['Financiada', 'Ocupação'],
+    'internet_tipo_outro': ['Dados móveis e wi-fi', 'Internet do vizinho'],
+    'internet_sinal_outro': ['Oscila', 'Fraco à noite'],
+    'trabalho_vinculo_outro': ['Aprendiz', 'Freelancer', 'Bico como desenhista', 'Contrato temporário',
+                               'Voluntário remunerado'],
+    'renda_familiar_outro': ['7.000', 'R$ 6.500,00', '10.000 a 12.000', 'Não sabe informar'],
+    'beneficios_outro': ['Pé de Meia', 'Pe de meia', 'PÉ-DE-MEIA', 'Pensão por morte', 'Pé de meia e cesta básica'],
+    'transporte_meio_outro': ['Andando', 'Patinete', 'Uber'],
+    'objetivo_educafro_outro': ['ETEC', 'Aprender e ter conhecimento', 'Tirar uma nota boa no ENEM'],
+    'objetivo_frequencia_outro': ['Dias de semana e sábado', 'Segunda a quarta'],
+    'saude_psicoterapia_tempo': ['Início 2024', '3 anos', '6 meses', 'Desde 2023', '1 ano', 'Início 2025'],
+    'saude_psicoterapia_encerramento': ['Até o momento presente', 'Até presente momento.', 'Encerrou em 2025',
+                                        'Parou por falta de vaga', 'Ainda em acompanhamento'],
+    'saude_deficiencia_qual': ['Autismo', 'TDAH', 'Surdez unilateral', 'Deficiência física', 'Baixa visão'],
+    'saude_familia_deficiencia_qual': ['TEA (primo)', 'Mãe e sobrinhos', 'Deficiência física', 'Síndrome de Down'],
+    'saude_problemas_qual': ['Asma', 'Hipertensão', 'Taquicardia', 'Rinite', 'Anemia', 'Enxaqueca', 'Gastrite'],
+    'saude_alergias_qual': ['Dipirona', 'Poeira', 'Rinite alérgica', 'Amoxicilina', 'Camarão', 'Pelo de gato'],
+    'saude_medicamentos_qual': ['Anticoncepcional', 'Omeprazol', 'Losartana', 'Ritalina', 'Sertralina',
+                                'Bombinha para asma'],
+    'saude_substancias_qual': ['Álcool', 'Cigarro', 'Álcool socialmente', 'Álcool e cigarro', 'Vape'],
+    'cotidiano_relacao': ['Relação tranquila', 'Relação boa', 'Relação conflituosa com o padrasto',
+                          'Boa com a mãe, distante do pai', 'Muito unida', 'Relação instável'],
+    'cotidiano_historico': ['Família tranquila, sente falta dos irmãos que moram longe.',
+                            'Pais separados, visita o pai aos fins de semana.',
+                            'Primeira da família a tentar o vestibular.',
+                            'Mudou de cidade no ano passado e ainda está se adaptando.',
+                            'Ajuda a cuidar dos irmãos mais novos.',
+                            'Sonha em trabalhar na área da saúde.'],
+    'objetivo_curso': ['Medicina', 'Psicologia', 'Direito', 'Enfermagem', 'Engenharia Civil', 'Pedagogia',
+                       'Biomedicina', 'Arquitetura', 'Administração', 'Nutrição', 'Odontologia',
+                       'Ciência da Computação', 'Ainda não sei'],
+    'objetivo_expectativa': ['Ficaria muito feliz', 'Apoiaria', 'Ficaria muito alegre', 'Ficariam orgulhosos',
+                             'Ficariam com saudades, mas apoiariam'],
+    'objetivo_temas': ['Saúde mental', 'Racismo', 'Racismo, machismo', 'Política', 'Inclusão social',
+                       'Cronograma de estudos', 'Redação', 'Mercado de trabalho', 'Educação financeira'],
+    'rua': ['Rua Sete de Setembro', 'Avenida Conselheiro Nébias', 'Rua João Pessoa', 'Rua Amador Bueno',
+            'Avenida Afonso Pena', 'Rua Carvalho de Mendonça', 'Rua Campos Sales', 'Rua Goiás',
+            'Avenida Pinheiro Machado', 'Rua Oswaldo Cruz'],
+}
+
+SERVICES = ['UPA – Unidade de Pronto Atendimento', 'UBS – Unidade Básica de Saúde',
+            'AME – Ambulatório Médico de Especialidades', 'CAPS – Centro de Atenção Psicossocial']
+EDUCAFRO_GOALS = ['Preparatório para vestibular', 'Preparatório para o ENEM',
+                  'Preparatório para Concursos Públicos', 'Outro']
+HOUSEHOLD = {'Mãe': 40, 'Pai': 25, 'Padrasto': 8, 'Avó': 8, 'Irmão': 20, 'Irmã': 18, '2 irmãos': 6,
+             'dois irmãos': 2, 'Tia': 4, 'Tio': 3, 'Esposa': 3, 'Marido': 3, 'Filha': 4, 'Filho': 4,
+             'Sogra': 1, 'Namorado': 1, 'Avós': 2}
+HOUSEHOLD_JOINERS = [', ', ' e ', '; ', ' E ']
+
+# Bairros por cidade (os de Santos estão no mapeamento de CRAS)
+NEIGHBOURHOODS = {
+    'Santos': ['Rádio Clube', 'Vila Belmiro', 'Centro', 'Jardim Castelo', 'Areia Branca', 'Bom Retiro',
+               'Campo Grande', 'Embaré', 'Aparecida', 'Gonzaga', 'Macuco', 'Morro do Pacheco', 'São Manoel',
+               'Chico de Paula', 'Nova Cintra', 'Saboó', 'Vila Nova', 'Jd Castelo', 'Vl Belmiro', 'Caneleira'],
+    'São Vicente': ['Vila Voturuá', 'Parque Continental', 'Japuí', 'Centro', 'Humaitá', 'Vila Margarida'],
+    'Guarujá': ['Vicente de Carvalho', 'Enseada', 'Pae Cará', 'Morrinhos'],
+    'Cubatão': ['Vila Natal', 'Jardim Casqueiro'],
+    'Praia Grande': ['Vila Tupi', 'Boqueirão', 'Aviação'],
+    'Outro': ['Centro'],
+}
+
+FEMALE_NAMES = ['Ana', 'Maria', 'Juliana', 'Beatriz', 'Larissa', 'Camila', 'Gabriela', 'Letícia', 'Fernanda',
+                'Vitória', 'Isabela', 'Sofia', 'Yasmin', 'Rafaela', 'Amanda', 'Bruna', 'Jéssica', 'Aline',
+                'Conceição', 'Rosângela', 'Sandra', 'Cláudia', 'Patrícia', 'Adriana']
+MALE_NAMES = ['João', 'Pedro', 'Lucas', 'Gabriel', 'Matheus', 'Rafael', 'Gustavo', 'Felipe', 'Guilherme',
+              'Daniel', 'Vinícius', 'Leonardo', 'Carlos', 'José', 'Antônio', 'Paulo', 'Marcos', 'Francisco']
+SURNAMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Pereira', 'Lima', 'Ferreira', 'Costa', 'Rodrigues',
+            'Almeida', 'Nascimento', 'Carvalho', 'Araújo', 'Ribeiro', 'Barbosa', 'Gomes', 'Martins', 'Rocha',
+            'Conceição', 'Moura', 'Pacheco', 'Teixeira', 'Cardoso', 'Batista']
+
+def _weights(spec):
+    values = np.array(list(spec), dtype=object)
+    weights = np.array(list(spec.values()), dtype=float)
+    return values, weights / weights.sum()
+
+_CHOICES = {col: _weights(spec) for col, spec in CHOICES.items()}
+# Nomes em ASCII minúsculo, para os e-mails
+_ASCII_NAMES = {name: ''.join(c for c in fold(name) if c.isascii() and c.isalpha())
+                for name in FEMALE_NAMES + MALE_NAMES + SURNAMES}
+_HOUSEHOLD = _weights(HOUSEHOLD)
+
+def _choice(rng, col, size):
+    values, p = _CHOICES[col]
+    return values[rng.choice(len(values), size=size, p=p)]
+
+def _pick(rng, options, size):
+    return np.array(options, dtype=object)[rng.integers(0, len(options), size)]
+
+def _messy_text(rng, values):
+    """Parte dos textos em MAIÚSCULAS ou com espaço no fim, como digitado nas entrevistas."""
+    values = values.copy()
+    roll = rng.random(len(values))
+    present = pd.notna(values)  # resposta em branco continua em branco
+    upper = present & (roll < MESSY_TEXT_RATE / 2)
+    trailing = present & (roll >= MESSY_TEXT_RATE / 2) & (roll < MESSY_TEXT_RATE)
+    values[upper] = [str(v).upper() for v in values[upper]]
+    values[trailing] = [f"{v} " for v in values[trailing]]
+    return values
+
+def _messy_answers(rng, values):
+    """Sim/Não digitados de outro jeito ("SIM", "Sim (1)", "NAO"...)."""
+    values = values.copy()
+    messy = rng.random(len(values)) < MESSY_ANSWER_RATE
+    for answer, variants in (('Sim', YES_VARIANTS), ('Não', NO_VARIANTS)):
+        mask = messy & (values == answer)
+        values[mask] = _pick(rng, variants, mask.sum())
+    return values
+
+def _cpf_digits(rng, size):
+    """CPFs com dígitos verificadores válidos, (size, 11)."""
+    base = rng.integers(0, 10, (size, 9))
+    d1 = (base * np.arange(10, 1, -1)).sum(axis=1) * 10 % 11 % 10
+    with_d1 = np.column_stack([base, d1])
+    d2 = (with_d1 * np.arange(11, 1, -1)).sum(axis=1) * 10 % 11 % 10
+    return np.column_stack([with_d1, d2])
+
+def _format_cpf(rng, digits):
+    """Com pontuação (maioria), só números ou separado por espaços."""
+    text = [''.join(map(str, row)) for row in digits]
+    style = rng.random(len(text))
+    return np.array([f"{t[:3]}.{t[3:6]}.{t[6:9]}-{t[9:]}" if s < 0.8 else (t if s < 0.95 else f"{t[:3]} {t[3:6]} {t[6:9]} {t[9:]}")
+                     for t, s in zip(text, style)], dtype=object)
+
+def _random_dates(rng, period, size):
+    start, end = (pd.Timestamp(d).value // 10**9 for d in period)
+    return pd.to_datetime(rng.integers(start, end, size), unit='s')
+
+def _format_dates(rng, dates, mixed=True):
+    """ISO na maioria; com `mixed`, também dd/mm/aaaa e dd-mm-aaaa."""
+    iso = dates.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    if not mixed:
+        return iso
+    style = rng.random(len(iso))
+    slash = dates.strftime('%d/%m/%Y').to_numpy(dtype=object)
+    dash = dates.strftime('%d-%m-%Y').to_numpy(dtype=object)
+    return np.where(style < 0.7, iso, np.where(style < 0.9, slash, dash))
+
+def _full_names(rng, first_names, surnames_from=None):
+    size = len(first_names)
+    last = _pick(rng, SURNAMES, size) if surnames_from is None else surnames_from
+    middle = _pick(rng, SURNAMES, size)
+    with_middle = rng.random(size) < 0.7
+    return np.array([f"{f} {m} {l}" if w else f"{f} {l}" for f, m, l, w in zip(first_names, middle, last, with_middle)],
+                    dtype=object), last
+
+def _household(rng, size):
+    """Texto livre "com quem mora" montado a partir de membros sorteados."""
+    values, p = _HOUSEHOLD
+    counts = rng.choice([1, 2, 3, 4], size=size, p=[0.3, 0.35, 0.25, 0.1])
+    joiners = _pick(rng, HOUSEHOLD_JOINERS, size)
+    alone = rng.random(size) < 0.04
+    texts = []
+    for n, joiner, is_alone in zip(counts, joiners, alone):
+        if is_alone:
+            texts.append('Sozinha' if n % 2 else 'Sozinho')
+            continue
+        members = list(dict.fromkeys(values[rng.choice(len(values), size=n, p=p)]))
+        texts.append(joiner.join(members))
+    return _messy_text(rng, np.array(texts, dtype=object))
+
+def _multi(rng, options, size, p_each, json_list=False):
+    """Respostas de múltipla escolha: lista JSON ('["A","B"]') ou texto separado por vírgula."""
+    picks = rng.random((size, len(options))) < p_each
+    picks[~picks.any(axis=1), 0] = True
+    out = []
+    for row in picks:
+        chosen = [o for o, keep in zip(options, row) if keep]
+        out.append(json.dumps(chosen, ensure_ascii=False) if json_list else ', '.join(chosen))
+    return np.array(out, dtype=object)
+
+def generate_batch(batch_index, size, seed=DEFAULT_SEED):
+    """DataFrame com as linhas do lote `batch_index` (colunas de COLUMNS, texto cru do formulário)."""
+    rng = np.random.default_rng([seed, batch_index])
+    n = size
+    data = {col: np.full(n, None, dtype=object) for col in COLUMNS}
+
+    def answered(col, mask=None):
+        """Máscara de quem respondeu `col` (entre `mask`), com SKIPPED_RATE de brancos."""
+        base = np.ones(n, dtype=bool) if mask is None else mask
+        return base & (rng.random(n) >= SKIPPED_RATE) & (rng.random(n) < ANSWER_RATES.get(col, 1.0))
+
+    def fill(col, values, mask):
+        data[col][mask] = values[mask]
+
+    def fill_choice(col, mask=None, messy=True):
+        values = _choice(rng, col, n)
+        if messy:
+            values = _messy_answers(rng, values)
+        fill(col, values, answered(col, mask))
+        return data[col]
+
+    def fill_text(col, source, mask):
+        fill(col, _messy_text(rng, _pick(rng, TEXTS[source], n)), mask)
+
+    def chose(col, prefix):
+        answers = pd.Series(data[col], dtype=object).str.strip().str.lower()
+        return answers.str.startswith(prefix, na=False).to_numpy(dtype=bool)
+
+    # Identificação e controle
+    data['id'] = FIRST_ID + batch_index * n + np.arange(n)
+    raw = rng.bytes(16 * n)
+    data['form_uuid'] = np.array([str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)],
+                                 dtype=object)
+    status_values, status_p = _weights(STATUS)
+    data['status_formulario'] = status_values[rng.choice(len(status_values), size=n, p=status_p)]
+    created = _random_dates(rng, INTERVIEW_PERIOD, n) + pd.to_timedelta(rng.integers(0, 10**6, n), unit='us')
+    updated = created + pd.to_timedelta(rng.integers(5 * 60, 45 * 60, n), unit='s')
+    data['created_at'] = created.strftime('%Y-%m-%d %H:%M:%S.%f+00').to_numpy(dtype=object)
+    data['updated_at'] = updated.strftime('%Y-%m-%d %H:%M:%S.%f+00').to_numpy(dtype=object)
+    data['data_entrevista'] = _format_dates(rng, created.normalize(), mixed=rng.random() < 0.1)
+
+    female = rng.random(n) < 0.7
+    first = np.where(female, _pick(rng, FEMALE_NAMES, n), _pick(rng, MALE_NAMES, n))
+    data['nome_completo'], family_name = _full_names(rng, first)
+    mother, _ = _full_names(rng, _pick(rng, FEMALE_NAMES, n), family_name)
+    father, _ = _full_names(rng, _pick(rng, MALE_NAMES, n), family_name)
+
+    fill_choice('entrevistador', messy=False)
+    digits = _cpf_digits(rng, n)
+    data['cpf'] = _format_cpf(rng, digits)
+    data['rg'] = np.array([f"{v:09d}" for v in rng.integers(10**7, 10**9, n)], dtype=object)
+    data['telefone'] = np.array([f"(13) 9{a:04d}-{b:04d}" for a, b in rng.integers(0, 10**4, (n, 2))], dtype=object)
+    data['email'] = np.array([f"{_ASCII_NAMES[f]}.{_ASCII_NAMES[l]}{i % 1000}@example.com"
+                              for f, l, i in zip(first, family_name, data['id'])], dtype=object)
+    age_days = np.minimum(AGE_MIN + rng.gamma(AGE_SHAPE, AGE_SCALE, n), AGE_MAX) * 365.25
+    birth = created.normalize() - pd.to_timedelta(age_days.astype(np.int64), unit='D')
+    data['data_nascimento'] = _format_dates(rng, birth)
+
+    # Perfil
+    cidade = fill_choice('cidade', messy=False)
+    fill_text('cidade_outra', 'cidade_outra', cidade == 'Outro')
+    bairros = np.full(n, None, dtype=object)
+    for city, options in NEIGHBOURHOODS.items():
+        in_city = cidade == city
+        bairros[in_city] = _pick(rng, options, in_city.sum())
+    fill('bairro', _messy_text(rng, bairros), answered('bairro'))
+    fill_text('naturalidade', 'naturalidade', answered('naturalidade'))
+    street = _pick(rng, TEXTS['rua'], n)
+    fill('endereco', _messy_text(rng, np.array([f"{s}, {k}" for s, k in zip(street, rng.integers(1, 2000, n))],
+                                                 dtype=object)), answered('endereco'))
+    for col in ('estado_civil', 'raca_cor', 'pronomes', 'trans_travesti', 'escola_publica_privada'):
+        fill_choice(col)
+    genero = fill_choice('genero')
+    fill_text('genero_outro', 'genero_outro', genero == 'Outro')
+    orientacao = fill_choice('orientacao_sexual')
+    fill_text('orientacao_sexual_outra', 'orientacao_sexual_outra', orientacao == 'Outra')
+    escolaridade = fill_choice('escolaridade')
+    fill_text('escolaridade_outro', 'escolaridade_outro', escolaridade == 'Outro')
+
+    # Família e moradia
+    fill('nome_mae', _messy_text(rng, mother), answered('nome_mae'))
+    fill('nome_pai', _messy_text(rng, father), answered('nome_pai', rng.random(n) < 0.85))
+    fill_text('profissao_mae', 'profissao', answered('profissao_mae'))
+    fill_text('profissao_pai', 'profissao', answered('profissao_pai', data['nome_pai'] != None))  # noqa: E711
+    fill_choice('escolaridade_mae')
+    escolaridade_pai = fill_choice('escolaridade_pai')
+    fill_text('escolaridade_pai_outro', 'escolaridade_pai_outro', chose('escolaridade_pai', 'outro'))
+    fill_choice('familiar_nucleo')
+    in_nucleo = chose('familiar_nucleo', 's')
+    fill_choice('vinculo_familiar', in_nucleo, messy=False)
+    fill_text('vinculo_familiar_outro', 'vinculo_familiar_outro', chose('vinculo_familiar', 'outro'))
+    fill('nome_familiar', np.where(female, _pick(rng, FEMALE_NAMES, n), _pick(rng, MALE_NAMES, n)),
+         in_nucleo & (data['vinculo_familiar'] != None))  # noqa: E711
+    fill_choice('moradia_condicao')
+    fill_text('moradia_condicao_outro', 'moradia_condicao_outro', chose('moradia_condicao', 'outro'))
+    fill_choice('moradia_tipo')
+    fill_choice('internet_tem')
+    has_internet = chose('internet_tem', 's')
+    fill_choice('internet_tipo', has_internet, messy=False)
+    fill_text('internet_tipo_outro', 'internet_tipo_outro', chose('internet_tipo', 'outro'))
+    fill_choice('internet_sinal', has_internet)
+    fill_text('internet_sinal_outro', 'internet_sinal_outro', chose('internet_sinal', 'outro'))
+    fill_choice('cotidiano_mora_com')
+    fill('cotidiano_mora_com_quem', _household(rng, n), answered('cotidiano_mora_com_quem') & (rng.random(n) < 0.87))
+    fill_text('cotidiano_relacao', 'cotidiano_relacao', answered('cotidiano_relacao') & (rng.random(n) < 0.8))
+    fill_text('cotidiano_historico', 'cotidiano_historico', answered('cotidiano_historico') & (rng.random(n) < 0.85))
+
+    # Trabalho e renda
+    fill_choice('trabalho_renda_semana')
+    works = chose('trabalho_renda_semana', 's')
+    fill_choice('trabalho_ajuda_familiar')
+    fill_choice('trabalho_vinculo', works, messy=False)
+    fill_text('trabalho_vinculo_outro', 'trabalho_vinculo_outro', chose('trabalho_vinculo', 'outro'))
+    start = fill_choice('trabalho_horario_inicio', works, messy=False)
+    hours = rng.integers(4, 10, n)
+    end = np.array([f"{(int(s[:2]) + h) % 24:02d}:{s[3:]}" if isinstance(s, str) else None for s, h in zip(start, hours)],
+                   dtype=object)
+    fill('trabalho_horario_fim', end, data['trabalho_horario_inicio'] != None)  # noqa: E711
+    fill_choice('trabalho_uso_dinheiro', works, messy=False)
+    fill_choice('renda_familiar')
+    fill_text('renda_familiar_outro', 'renda_familiar_outro', chose('renda_familiar', 'outro'))
+    fill_choice('beneficios_recebe')
+    fill_choice('beneficios_tipo', chose('beneficios_recebe', 's'), messy=False)
+    fill_text('beneficios_outro', 'beneficios_outro', np.array([isinstance(v, str) and 'Outro' in v
+                                                                 for v in data['beneficios_tipo']]))
+    for col in ('beneficios_cadunico', 'cesta_basica', 'filhos_tem', 'pensao_paga', 'pensao_recebe',
+                'transporte_veiculo', 'transporte_auxilio'):
+        fill_choice(col)
+    fill_choice('transporte_meio', messy=False)
+    fill_text('transporte_meio_outro', 'transporte_meio_outro', chose('transporte_meio', 'outro'))
+
+    # Saúde
+    fill_choice('saude_plano', messy=False)
+    json_list = rng.random(n) < 0.5
+    services = np.where(json_list, _multi(rng, SERVICES, n, 0.45, json_list=True),
+                        np.array([s.replace(', ', '; ') for s in _multi(rng, SERVICES, n, 0.45)], dtype=object))
+    fill('saude_servicos', services, answered('saude_servicos') & (rng.random(n) < 0.8))
+    fill_choice('saude_tipo_sanguineo', messy=False)
+    fill_choice('saude_psicoterapia')
+    in_therapy = chose('saude_psicoterapia', 's')
+    fill_text('saude_psicoterapia_tempo', 'saude_psicoterapia_tempo', in_therapy & (rng.random(n) < 0.8))
+    fill_text('saude_psicoterapia_encerramento', 'saude_psicoterapia_encerramento', in_therapy & (rng.random(n) < 0.8))
+    for col, detail in (('saude_deficiencia', 'saude_deficiencia_qual'),
+                        ('saude_familiar_deficiencia', 'saude_familia_deficiencia_qual'),
+                        ('saude_problemas', 'saude_problemas_qual'), ('saude_alergias', 'saude_alergias_qual'),
+                        ('saude_medicamentos', 'saude_medicamentos_qual'),
+                        ('saude_substancias', 'saude_substancias_qual')):
+        fill_choice(col)
+        fill_text(detail, detail, chose(col, 's') & (rng.random(n) < 0.9))
+
+    # Objetivos
+    fill_text('objetivo_curso', 'objetivo_curso', answered('objetivo_curso'))
+    fill_text('objetivo_expectativa', 'objetivo_expectativa', answered('objetivo_expectativa'))
+    fill('objetivo_educafro', _multi(rng, EDUCAFRO_GOALS, n, 0.5), answered('objetivo_educafro'))
+    fill_text('objetivo_educafro_outro', 'objetivo_educafro_outro',
+              np.array([isinstance(v, str) and 'Outro' in v for v in data['objetivo_educafro']]))
+    fill_text('objetivo_temas', 'objetivo_temas', answered('objetivo_temas') & (rng.random(n) < 0.85))
+    fill_choice('objetivo_frequencia', messy=False)
+    fill_text('objetivo_frequencia_outro', 'objetivo_frequencia_outro', chose('objetivo_frequencia', 'outro'))
+    data['nome_mesmo_documento'][answered('nome_mesmo_documento')] = 'Sim'
+
+    # Quem falta entrevistar só tem o nome; rascunhos param no meio do formulário
+    table = np.column_stack([np.asarray(data[col], dtype=object) for col in COLUMNS])
+    position = np.arange(len(COLUMNS))
+    status = data['status_formulario']
+    kept = np.isin(COLUMNS, ['nome_completo', 'status_formulario'])
+    table[np.ix_(status == 'falta entrevistar', ~kept)] = None
+    drafts = status == 'rascunho'
+    stop = rng.integers(10, len(COLUMNS) - 3, n)[:, None]
+    table[drafts[:, None] & (position >= stop) & (position < len(COLUMNS) - 2)] = None
+    col = {name: i for i, name in enumerate(COLUMNS)}
+
+    # Reenvios: mesma pessoa e CPF (às vezes com outra pontuação), updated_at posterior
+    duplicates = np.flatnonzero(rng.random(n) < DUPLICATE_RATE)
+    duplicates = duplicates[duplicates > 0]
+    originals = rng.integers(0, np.maximum(duplicates, 1))
+    complete = (status[duplicates] == 'completo') & (status[originals] == 'completo')
+    duplicates, originals = duplicates[complete], originals[complete]
+    if len(duplicates):
+        same = [col[c] for c in ('nome_completo', 'data_nascimento', 'nome_mae', 'nome_pai', 'telefone', 'email', 'rg')]
+        table[np.ix_(duplicates, same)] = table[np.ix_(originals, same)]
+        table[duplicates, col['cpf']] = _format_cpf(rng, digits[originals])
+        later = updated[originals] + pd.to_timedelta(rng.integers(1, 30 * 24 * 3600, len(duplicates)), unit='s')
+        table[duplicates, col['updated_at']] = later.strftime('%Y-%m-%d %H:%M:%S.%f+00').to_numpy(dtype=object)
+
+    tests = rng.random(n) < TEST_RECORD_RATE
+    table[tests, col['nome_completo']] = _pick(rng, ['teste', 'Teste', 'teste2'], tests.sum())
+    frame = pd.DataFrame(table, columns=COLUMNS)
+    frame['id'] = frame['id'].astype('Int64')
+    return frame
+
+def iter_batches(n_rows, seed=DEFAULT_SEED, batch_rows=BATCH_ROWS):
+    """Gera os DataFrames dos lotes até somar `n_rows` linhas.
+
+    Todo lote é gerado inteiro (o último é cortado), para que as primeiras
+    linhas não dependam do total pedido.
+    """
+    for batch_index, start in enumerate(range(0, n_rows, batch_rows)):
+        frame = generate_batch(batch_index, batch_rows, seed)
+        yield frame.iloc[:n_rows - start]
+
+def _json_records(frame):
+    """Registros do lote no formato do backup JSON (datas ISO, nulos como null)."""
+    frame = frame.copy()
+    for col in ('created_at', 'updated_at'):
+        frame[col] = frame[col].str.replace(' ', 'T', n=1).str.replace(r'\+00$', '+00:00', regex=True)
+    return json.loads(frame.to_json(orient='records', force_ascii=False))
+
+def write_synthetic(path, n_rows, seed=DEFAULT_SEED, batch_rows=BATCH_ROWS):
+    """Grava `n_rows` entrevistas em `path` (.csv ou .json), lote a lote; devolve o caminho."""
+    is_json = str(path).lower().endswith('.json')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        if is_json:
+            f.write('[\n')
+        first = True
+        for frame in iter_batches(n_rows, seed, batch_rows):
+            if is_json:
+                for record in _json_records(frame):
+                    f.write(('' if first else ',\n') + json.dumps(record, ensure_ascii=False, indent=2))
+                    first = False
+            else:
+                frame.to_csv(f, header=first, index=False)
+                first = False
+        if is_json:
+            f.write('\n]\n')
+    os.replace(tmp_path, path)
+    return path
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python generate_synthetic_data.py <linhas> <saida.csv|saida.json> [semente]")
+        sys.exit(1)
+    n_rows = int(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_SEED
+    path = write_synthetic(sys.argv[2], n_rows, seed)
+    print(f"{n_rows} entrevistas sintéticas (semente {seed}) gravadas em {path}")
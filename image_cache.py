@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from importlib.metadata import version, PackageNotFoundError
+from data_cache import CACHE_DIR, enforce_cache_limits
+
+# Cache em disco das imagens dos gráficos (PNG/SVG) endereçado pelo conteúdo.
+# A chave é o hash da especificação serializada da figura + opções de
+# renderização + versões do plotly/kaleido, então um gráfico que não mudou
+# nunca é rasterizado duas vezes, entre relatórios e entre processos.
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, 'imagens')
+MAX_IMAGE_CACHE_BYTES = 128 * 1024 * 1024  # 128 MB
+MAX_IMAGE_CACHE_ENTRIES = 2000
+IMAGE_SUFFIXES = ('.png', '.svg', '.jpeg', '.pdf', '.webp')
+TRIM_RATIO = 0.9  # ao passar do limite, limpa até 90% dele (folga até a próxima limpeza)
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+# A mesma figura pode sair diferente em outra versão do plotly.js/Kaleido
+_RENDERER_VERSIONS = {'plotly': _package_version('plotly'), 'kaleido': _package_version('kaleido')}
+
+_lock = threading.Lock()
+_counters = {'hits': 0, 'misses': 0}
+# Uso estimado de cada diretório [entradas, bytes]: uma varredura na primeira
+# gravação, depois só somas; a limpeza (que lista e lê o tamanho de todos os
+# arquivos) roda apenas quando a estimativa passa de algum limite
+_usage = {}
+
+def figure_key(fig, options):
+    """SHA-256 da figura (JSON do plotly) + opções de renderização."""
+    spec = fig.to_json() if hasattr(fig, 'to_json') else json.dumps(fig, sort_keys=True, default=str)
+    digest = hashlib.sha256(spec.encode('utf-8'))
+    digest.update(json.dumps({'opcoes': options, 'versoes': _RENDERER_VERSIONS}, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def image_path(key, options, cache_dir=IMAGE_CACHE_DIR):
+    return os.path.join(cache_dir, f"{key[:40]}.{options.get('format', 'png')}")
+
+def get(key, options, cache_dir=IMAGE_CACHE_DIR):
+    path = image_path(key, options, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)  # marca como usada recentemente (LRU)
+    except FileNotFoundError:
+        pass
+    return data or None
+
+def put(key, options, data, cache_dir=IMAGE_CACHE_DIR, max_bytes=MAX_IMAGE_CACHE_BYTES, max_entries=MAX_IMAGE_CACHE_ENTRIES):
+    """Grava a imagem (escrita atômica) e aplica os limites de tamanho/quantidade."""
+    path = image_path(key, options, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        try:
+            replaced = os.path.getsize(path)  # a mesma chave já estava no cache
+        except FileNotFoundError:
+            replaced = None
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    if _add_usage(cache_dir, len(data), max_bytes, max_entries, replaced):
+        enforce_cache_limits(cache_dir, int(max_bytes * TRIM_RATIO), int(max_entries * TRIM_RATIO),
+                             suffix=IMAGE_SUFFIXES)
+        usage = _scan(cache_dir)
+        with _lock:
+            _usage[cache_dir] = usage
+    return path
+
+def _scan(cache_dir):
+    """[entradas, bytes] das imagens no diretório."""
+    entries, total = 0, 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(IMAGE_SUFFIXES):
+                try:
+                    total += os.path.getsize(os.path.join(cache_dir, name))
+                    entries += 1
+                except FileNotFoundError:
+                    pass
+    return [entries, total]
+
+def _add_usage(cache_dir, size, max_bytes, max_entries, replaced=None):
+    """Soma a imagem gravada à estimativa; True se ela passou de algum limite.
+
+    `replaced` é o tamanho do arquivo sobrescrito (None se a imagem é nova).
+    """
+    with _lock:
+        usage = _usage.get(cache_dir)
+    if usage is None:
+        usage = _scan(cache_dir)  # já inclui a imagem recém-gravada
+        with _lock:
+            usage = _usage.setdefault(cache_dir, usage)
+    else:
+        with _lock:
+            if replaced is None:
+                usage[0] += 1
+            usage[1] += size - (replaced or 0)
+    return usage[0] > max_entries or usage[1] > max_bytes
+
+def lookup(fig, options, cache_dir=IMAGE_CACHE_DIR):
+    """(chave, bytes da imagem ou None se ela ainda não foi renderizada)."""
+    key = figure_key(fig, options)
+    data = get(key, options, cache_dir)
+    with _lock:
+        _counters['hits' if data is not None else 'misses'] += 1
+    return key, data
+
+def store(key, options, data, cache_dir=IMAGE_CACHE_DIR):
+    try:
+        put(key, options, data, cache_dir)
+    except OSError:
+        pass  # disco cheio/somente leitura: segue sem cache
+    return data
+
+def cached_render(fig, options, render, cache_dir=IMAGE_CACHE_DIR):
+    """Imagem da figura pelo cache; `render()` só é chamado se ela ainda não existir."""
+    key, data = lookup(fig, options, cache_dir)
+    if data is None:
+        data = store(key, options, render(), cache_dir)
+    return data
+
+def stats(cache_dir=IMAGE_CACHE_DIR):
+    entries, total = _scan(cache_dir)
+    with _lock:
+        return dict(_counters, entries=entries, bytes_used=total)
+
+def clear(cache_dir=IMAGE_CACHE_DIR):
+    removed = 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(IMAGE_SUFFIXES):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+    with _lock:
+        _usage.pop(cache_dir, None)
+    return removed
+
+if __name__ == "__main__":
+    # Uso: python image_cache.py           -> mostra o tamanho do cache
+    #      python image_cache.py --limpar  -> apaga as imagens
+    if sys.argv[1:] == ['--limpar']:
+        print(f"{clear()} imagem(ns) removida(s) de {IMAGE_CACHE_DIR}.")
+    else:
+        info = stats()
+        print(f"{info['entries']} imagem(ns), {info['bytes_used'] / 1024 / 1024:.1f} MB em {IMAGE_CACHE_DIR}")
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+# Indicadores por estudante usados na tabela do Resumo Geral e nas fichas
+# individuais (student_sheets.py): tags de perfil, mais os estilos das tabelas
+# do Resumo Geral e do Eixo 0 (a situação no CadÚnico vem de eligibility.py).
+# As versões por linha (get_indicators...) ficam para uso pontual; para a base
+# inteira, `indicator_flags` calcula tudo como máscaras de coluna (regras
+# avaliadas só nos valores distintos) e as tags/estilos saem dessas máscaras.
+STATUS_MISSING = 'falta entrevistar'
+
+# Legenda das tags de perfil
+INDICATOR_TAGS = {
+    '[FIL]': 'Tem Filhos',
+    '[PCD]': 'Deficiência (Estudante/Família)',
+    '[BEN]': 'Recebe Benefícios',
+    '[TRB]': 'Estudante Trabalhador',
+    '[FALTA]': 'Falta Entrevistar',
+}
+
+def _is_yes(row, col):
+    value = row.get(col)
+    return pd.notnull(value) and str(value).strip() == 'Sim'
+
+def get_indicators(row):
+    """Tags de perfil do estudante ("[FIL] [PCD] [BEN] [TRB]")."""
+    tags = []
+    if _is_yes(row, 'Tem Filhos?'):
+        tags.append("[FIL]") # Children
+    if _is_yes(row, 'Possui Deficiência?') or _is_yes(row, 'Familiar com Deficiência?'):
+        tags.append("[PCD]") # Disability
+    if _is_yes(row, 'Recebe Benefícios'):
+        tags.append("[BEN]") # Benefits
+    if row.get('Status_Emprego_Simplificado') == 'Empregado' or row.get('Employment_Status') == 'Empregado':
+        tags.append("[TRB]") # Employment
+    return " ".join(tags)
+
+def is_missing_interview(row):
+    return str(row.get('status_formulario', '')).strip() == STATUS_MISSING
+
+def get_indicators_full(row):
+    """Como `get_indicators`, mas quem ainda não foi entrevistado recebe só [FALTA]."""
+    if is_missing_interview(row):
+        return '[FALTA]'
+    return get_indicators(row)
+
+# ── Versão vetorizada ────────────────────────────────────────────────
+FLAG_COLUMNS = ['FIL', 'PCD', 'BEN', 'TRB', 'FALTA', 'TRABALHADOR']
+
+# Tags de cada combinação de FIL/PCD/BEN/TRB (bit 0 = FIL ... bit 3 = TRB)
+_TAG_BITS = ["[FIL]", "[PCD]", "[BEN]", "[TRB]"]
+_TAG_TABLE = np.array([" ".join(tag for bit, tag in enumerate(_TAG_BITS) if code >> bit & 1) for code in range(16)],
+                      dtype=object)
+
+# Estilos da tabela do Resumo Geral
+STYLE_MISSING = 'background-color: #E2E8F0; color: #718096; font-style: italic'
+STYLE_WORKER = 'background-color: #FED7D7'
+STYLE_NAME_BENEFITS = 'color: #D63031; font-weight: bold'
+STYLE_NAME_DEFAULT = 'color: #2D3436; font-weight: bold'
+
+def _distinct_mask(df, col, predicate):
+    """Máscara booleana de `predicate` avaliado uma vez por valor distinto (ausentes/coluna inexistente = False)."""
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    codes, uniques = pd.factorize(df[col])
+    hits = np.asarray(predicate(pd.Series(uniques, dtype=object)), dtype=bool)
+    return np.append(hits, False)[codes]  # código -1 (ausente) cai no False do fim
+
+def _yes_mask(df, col):
+    return _distinct_mask(df, col, lambda values: values.astype(str).str.strip() == 'Sim')
+
+def indicator_flags(df):
+    """Uma coluna booleana por indicador (FLAG_COLUMNS), com as mesmas regras das funções por linha."""
+    return pd.DataFrame({
+        'FIL': _yes_mask(df, 'Tem Filhos?'),
+        'PCD': _yes_mask(df, 'Possui Deficiência?') | _yes_mask(df, 'Familiar com Deficiência?'),
+        'BEN': _yes_mask(df, 'Recebe Benefícios'),
+        'TRB': (_distinct_mask(df, 'Status_Emprego_Simplificado', lambda v: v == 'Empregado')
+                | _distinct_mask(df, 'Employment_Status', lambda v: v == 'Empregado')),
+        'FALTA': _distinct_mask(df, 'status_formulario', lambda v: v.astype(str).str.strip() == STATUS_MISSING),
+        # Fundo da tabela: qualquer vínculo de trabalho preenchido diferente de 'Não'
+        'TRABALHADOR': _distinct_mask(df, 'Vínculo de Trabalho', lambda v: v != 'Não'),
+    }, index=df.index)
+
+def indicator_tags(flags):
+    """Coluna 'Perfil' ("[FIL] [BEN]", "[FALTA]"...) a partir de `indicator_flags`."""
+    codes = (flags['FIL'].to_numpy(dtype=np.uint8) | flags['PCD'].to_numpy(dtype=np.uint8) << 1
+             | flags['BEN'].to_numpy(dtype=np.uint8) << 2 | flags['TRB'].to_numpy(dtype=np.uint8) << 3)
+    tags = np.where(flags['FALTA'].to_numpy(), '[FALTA]', _TAG_TABLE[codes])
+    return pd.Series(tags, index=flags.index, name='Perfil', dtype=object)
+
+def row_styles(flags, columns, name_column='nome_completo'):
+    """CSS de cada célula (DataFrame no formato de `Styler.apply(axis=None)`) das linhas de `flags`."""
+    missing = flags['FALTA'].to_numpy()
+    row_bg = np.where(flags['TRABALHADOR'].to_numpy(), STYLE_WORKER, '').astype(object)
+    row_css = np.where(missing, STYLE_MISSING, row_bg)
+    styles = np.repeat(row_css[:, None], len(columns), axis=1)
+    if name_column in columns:
+        name_color = np.where(flags['BEN'].to_numpy(), STYLE_NAME_BENEFITS, STYLE_NAME_DEFAULT).astype(object)
+        styles[:, list(columns).index(name_column)] = np.where(missing, STYLE_MISSING, row_bg + '; ' + name_color)
+    return pd.DataFrame(styles, index=flags.index, columns=columns)
+
+# Estilos da tabela do Eixo 0, pela situação no CadÚnico
+STYLE_CADUNICO_HAS = 'background-color: #D4EDDA; color: #155724'
+STYLE_CADUNICO_ELIGIBLE = 'background-color: #CCE5FF; color: #004085'
+STYLE_CADUNICO_CHECK = 'background-color: #FFF3CD; color: #856404'
+STYLE_CADUNICO_NOT_ELIGIBLE = 'background-color: #F8D7DA; color: #721C24'
+
+def eligibility_style(status):
+    status = str(status)
+    if 'Já possui' in status:
+        return STYLE_CADUNICO_HAS
+    if status.startswith('✅'):
+        return STYLE_CADUNICO_ELIGIBLE
+    if status.startswith('⚠️'):
+        return STYLE_CADUNICO_CHECK
+    if status.startswith('❌'):
+        return STYLE_CADUNICO_NOT_ELIGIBLE
+    return ''
+
+def eligibility_styles(status, columns):
+    """CSS das células (formato de `Styler.apply(axis=None)`): a linha inteira na cor da situação."""
+    css = status.map({value: eligibility_style(value) for value in status.unique()}).to_numpy(dtype=object)
+    return pd.DataFrame(np.repeat(css[:, None], len(columns), axis=1), index=status.index, columns=columns)
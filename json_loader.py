@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+import re
+import numpy as np
+import pandas as pd
+
+# Leitura em streaming do backup JSON (data/entrevistas_backup.json).
+# O arquivo é um array JSON de entrevistas; em vez de `json.load` (que cria
+# todos os dicts de uma vez), lemos em blocos, decodificamos um registro por
+# vez e montamos DataFrames em lotes de tamanho fixo. Cada lote passa pelas
+# mesmas regras de tipagem do `pd.read_csv`, para o resultado de `load_data`
+# ser idêntico ao do caminho CSV.
+CHUNK_SIZE = 1024 * 1024  # bytes lidos por vez
+BATCH_SIZE = 5000         # registros por lote
+
+_INT_RE = re.compile(r'^[+-]?\d+$')
+_BOOL_VALUES = {'True', 'False', 'TRUE', 'FALSE', 'true', 'false'}
+
+def iter_json_records(path, chunk_size=CHUNK_SIZE):
+    """Gera os objetos de um array JSON um a um, lendo o arquivo em blocos."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = 0
+        started = False
+        while True:
+            # Pula espaços, a abertura do array e as vírgulas entre registros
+            while pos < len(buffer) and (buffer[pos] in ' \t\r\n,' or (buffer[pos] == '[' and not started)):
+                started = started or buffer[pos] == '['
+                pos += 1
+
+            if pos < len(buffer):
+                if buffer[pos] == ']':
+                    return
+                try:
+                    record, pos_end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield record
+                    pos = pos_end
+                    continue
+            elif eof:
+                return
+
+            # Registro incompleto no fim do bloco: descarta o que já foi lido e lê mais
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+def _as_csv_text(value):
+    """Como o valor apareceria numa célula do export CSV."""
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        # Múltipla escolha: o export CSV junta as opções com "; "
+        return '; '.join(_as_csv_text(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return str(value)
+
+def _records_to_text_frame(records, columns, offset):
+    """Lote de registros -> DataFrame de texto com os mesmos valores ausentes do read_csv."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow([_as_csv_text(record.get(c)) for c in columns])
+    buf.seek(0)
+    frame = pd.read_csv(buf, dtype=str)
+    frame.index = pd.RangeIndex(offset, offset + len(frame))
+    return frame
+
+def _column_evidence(frame):
+    """Para cada coluna: (tem ausentes, todos inteiros, todos numéricos, todos booleanos, algum valor)."""
+    evidence = {}
+    for col in frame.columns:
+        values = frame[col]
+        present = values.dropna()
+        numeric = pd.to_numeric(present, errors='coerce')
+        evidence[col] = (
+            len(present) < len(values),
+            bool(present.str.match(_INT_RE).all()),
+            bool(numeric.notna().all()),
+            bool(present.isin(_BOOL_VALUES).all()),
+            len(present) > 0,
+        )
+    return evidence
+
+def _merge_evidence(total, batch, n_rows_before):
+    for col, (has_na, all_int, all_num, all_bool, any_value) in batch.items():
+        if col not in total:
+            # Coluna que só aparece agora: as linhas anteriores não tinham valor
+            total[col] = (n_rows_before > 0, True, True, True, False)
+        t = total[col]
+        total[col] = (t[0] or has_na, t[1] and all_int, t[2] and all_num, t[3] and all_bool, t[4] or any_value)
+    for col in total:
+        if col not in batch:
+            t = total[col]
+            total[col] = (True,) + t[1:]
+
+def _cast_like_read_csv(values, evidence):
+    has_na, all_int, all_num, all_bool, any_value = evidence
+    if not any_value:
+        return pd.Series(np.nan, index=values.index, dtype='float64')
+    if all_int and not has_na:
+        return pd.to_numeric(values).astype('int64')
+    if all_num:
+        return pd.to_numeric(values).astype('float64')
+    if all_bool:
+        mapped = values.map(lambda v: v.lower() == 'true' if isinstance(v, str) else v)
+        return mapped.astype(bool) if not has_na else mapped.astype(object)
+    return values
+
+def iter_json_batches(path, batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE):
+    """Gera DataFrames (texto) com até `batch_size` registros do array JSON."""
+    batch = []
+    columns = []
+    seen = set()
+    offset = 0
+    for record in iter_json_records(path, chunk_size):
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield _records_to_text_frame(batch, columns, offset)
+            offset += len(batch)
+            batch = []
+    if batch:
+        yield _records_to_text_frame(batch, columns, offset)
+
+def read_json_backup(path, batch_size=BATCH_SIZE, row_filter=None):
+    """Lê o backup JSON em lotes e devolve um DataFrame tipado como o `pd.read_csv` do export.
+
+    `row_filter(frame) -> máscara` descarta linhas já no lote (ex.: rascunhos),
+    sem afetar a inferência de tipos, que considera todas as linhas lidas.
+    """
+    evidence = {}
+    frames = []
+    n_rows = 0
+    for frame in iter_json_batches(path, batch_size):
+        _merge_evidence(evidence, _column_evidence(frame), n_rows)
+        n_rows += len(frame)
+        if row_filter is not None:
+            frame = frame[row_filter(frame)]
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames)
+    for col in df.columns:
+        df[col] = _cast_like_read_csv(df[col], evidence[col])
+    return df
@@ -0,0 +1,140 @@
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Fila de geração do relatório PDF em segundo plano.
+# O script do Streamlit só enfileira o pedido e acompanha o progresso; a
+# geração roda numa thread da fila. Pedidos iguais (mesma versão do dataset e
+# mesmas opções) feitos enquanto um job está na fila ou gerando reaproveitam
+# esse job, e o PDF pronto fica disponível para download até o TTL expirar.
+JOB_WORKERS = int(os.environ.get('EDUCAFRO_PDF_JOBS', '1'))
+JOB_TTL = int(os.environ.get('EDUCAFRO_PDF_JOB_TTL', str(30 * 60)))  # segundos
+
+STATUS_QUEUED = 'na fila'
+STATUS_RUNNING = 'gerando'
+STATUS_DONE = 'concluído'
+STATUS_FAILED = 'erro'
+
+# Peso de cada etapa da geração na barra de progresso
+STAGE_WEIGHTS = {'montando': 0.1, 'renderizando': 0.8, 'paginando': 0.1}
+STAGE_LABELS = {'montando': 'Montando gráficos', 'renderizando': 'Renderizando gráficos',
+                'paginando': 'Paginando'}
+
+class PdfJob:
+    """Estado de uma geração de PDF; atualizado pela thread da fila, lido pelo app."""
+
+    def __init__(self, job_id, key):
+        self.id = job_id
+        self.key = key
+        self.status = STATUS_QUEUED
+        self.stage = None
+        self.done = 0
+        self.total = 0
+        self.item = None
+        self.result = None
+        self.error = None
+        self.render_errors = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.status in (STATUS_QUEUED, STATUS_RUNNING)
+
+    def expired(self, ttl=JOB_TTL, now=None):
+        return self.finished_at is not None and (now or time.time()) - self.finished_at > ttl
+
+    def update(self, stage, done, total, item):
+        """Callback de progresso de `generate_student_profile_pdf`."""
+        with self._lock:
+            self.stage, self.done, self.total, self.item = stage, done, total, item
+
+    def progress(self):
+        """(fração de 0 a 1, descrição) para a barra de progresso."""
+        with self._lock:
+            stage, done, total, item = self.stage, self.done, self.total, self.item
+        if self.status == STATUS_DONE:
+            return 1.0, "PDF pronto"
+        if stage is None:
+            return 0.0, "Na fila..." if self.status == STATUS_QUEUED else "Iniciando..."
+        before = 0.0
+        for name, weight in STAGE_WEIGHTS.items():
+            if name == stage:
+                break
+            before += weight
+        fraction = before + STAGE_WEIGHTS.get(stage, 0) * (done / total if total else 1)
+        return min(fraction, 1.0), f"{STAGE_LABELS.get(stage, stage)} ({done}/{total}): {item}"
+
+class PdfJobQueue:
+    """Executa gerações de PDF fora da thread do script, deduplicando pedidos iguais."""
+
+    def __init__(self, workers=JOB_WORKERS, ttl=JOB_TTL):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pdf-job')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._by_key = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, key, df, **options):
+        """Enfileira a geração (ou devolve o job já existente para a mesma chave)."""
+        with self._lock:
+            self._purge_locked()
+            job = self._by_key.get(key)
+            # Job com erro de renderização não é reaproveitado: o novo pedido tenta de novo
+            if job is not None and (job.active or (job.status == STATUS_DONE and not job.render_errors)):
+                return job
+            job = PdfJob(f"pdf-{next(self._ids)}", key)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+        self._executor.submit(self._run, job, df, options)
+        return job
+
+    def _run(self, job, df, options):
+        job.status = STATUS_RUNNING
+        try:
+            from renderer_pool import renderer_pool
+            # O navegador dos gráficos abre enquanto as figuras são montadas
+            renderer_pool.warm_up()
+            from export_pdf import generate_student_profile_pdf  # fpdf/PIL só quando um PDF é pedido
+            job.result = generate_student_profile_pdf(df, errors=job.render_errors, progress=job.update, **options)
+            job.status = STATUS_DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = STATUS_FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        """Job pelo id, ou None se ele não existir ou já tiver expirado."""
+        with self._lock:
+            self._purge_locked()
+            return self._jobs.get(job_id)
+
+    def purge(self):
+        with self._lock:
+            return self._purge_locked()
+
+    def _purge_locked(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items() if job.expired(self.ttl, now)]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            'jobs': len(jobs),
+            'ativos': sum(job.active for job in jobs),
+            'prontos': sum(job.status == STATUS_DONE for job in jobs),
+            'bytes': sum(len(job.result) for job in jobs if job.result),
+        }
+
+pdf_jobs = PdfJobQueue()
@@ -0,0 +1,18 @@
+import os
+
+# Perfis de qualidade das imagens: resolução na largura impressa e codificação.
+# As imagens vão da memória direto para o PDF (sem arquivos temporários).
+# 'vetorial' embute os gráficos Plotly como SVG (vetores do próprio PDF); nuvens
+# de palavras, e gráficos que o fpdf2 não consiga desenhar, seguem rasterizados.
+# Ficam fora de export_pdf para o app montar o seletor sem carregar fpdf/PIL.
+QUALITY_PROFILES = {
+    'impressao': {'dpi': 300, 'format': 'PNG'},
+    'tela': {'dpi': 110, 'format': 'JPEG', 'jpeg_quality': 82},
+    'vetorial': {'dpi': 200, 'format': 'PNG', 'vector': True},
+}
+QUALITY_LABELS = {
+    'impressao': "Impressão (300 dpi)",
+    'tela': "Tela (arquivo menor)",
+    'vetorial': "Vetorial (gráficos nítidos em qualquer zoom)",
+}
+DEFAULT_QUALITY = os.environ.get('EDUCAFRO_PDF_QUALITY', 'impressao')
@@ -0,0 +1,233 @@
+import asyncio
+import atexit
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+# Pool persistente de renderização de gráficos (Kaleido/Chromium).
+# `pio.to_image` abre e fecha um Chromium a cada figura; aqui um único navegador
+# com `POOL_TABS` abas fica aberto durante toda a vida do processo, num event
+# loop próprio, e é compartilhado por gerações de PDF e sessões do Streamlit.
+# Se o navegador morrer, o pool é reiniciado na próxima renderização.
+# plotly e kaleido só são importados quando o pool é usado, não ao importar o módulo.
+POOL_TABS = int(os.environ.get('EDUCAFRO_RENDER_TABS', '2'))
+START_TIMEOUT = 60      # segundos para abrir o navegador
+FIGURE_TIMEOUT = 90     # tempo limite do Kaleido por figura
+HEALTH_INTERVAL = 60    # segundos sem renderizar antes de refazer o health check
+RESTART_BACKOFF = 30    # após falhar ao abrir o navegador, espera antes de tentar de novo
+LATENCY_WINDOW = 500    # últimas renderizações consideradas nas estatísticas
+
+class RendererPool:
+    """Navegador Kaleido aberto uma vez e reutilizado; thread-safe."""
+
+    def __init__(self, tabs=POOL_TABS, figure_timeout=FIGURE_TIMEOUT):
+        self.tabs = tabs
+        self.figure_timeout = figure_timeout
+        self._kaleido = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.renders = 0
+        self.failures = 0
+        self.restarts = 0
+        self.startup_seconds = None
+        self._last_ok = 0.0
+        self._start_error = None
+        self._start_failed_at = 0.0
+        self._warm_thread = None
+
+    # --- ciclo de vida ---
+
+    def is_alive(self):
+        """O navegador está aberto e o processo do Chromium ainda responde?"""
+        k = self._kaleido
+        if k is None or self._thread is None or not self._thread.is_alive():
+            return False
+        process = getattr(k, 'subprocess', None)
+        return process is not None and process.poll() is None
+
+    def start(self):
+        """Abre o navegador se ele não estiver aberto (reabre se tiver caído)."""
+        with self._lock:
+            if not self.is_alive():
+                self._start_locked()
+
+    def _start_locked(self):
+        if self._start_error is not None and time.monotonic() - self._start_failed_at < RESTART_BACKOFF:
+            raise self._start_error  # ex.: Chrome não instalado; evita abrir um processo por figura
+        if self.startup_seconds is not None:
+            self.restarts += 1
+        self._shutdown()
+        started = time.perf_counter()
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name='renderer-pool', daemon=True)
+        thread.start()
+        self._loop, self._thread = loop, thread
+        try:
+            self._kaleido = self._call(self._open(), START_TIMEOUT)
+        except BaseException as e:
+            self._shutdown()
+            if isinstance(e, Exception):
+                self._start_error, self._start_failed_at = e, time.monotonic()
+            raise
+        self._start_error = None
+        self.startup_seconds = time.perf_counter() - started
+
+    async def _open(self):
+        import kaleido
+        import plotly.io as pio
+
+        # Mesmas opções globais que o pio.to_image repassa ao Kaleido
+        kopts = {}
+        if pio.defaults.plotlyjs:
+            kopts['plotlyjs'] = pio.defaults.plotlyjs
+        if pio.defaults.mathjax:
+            kopts['mathjax'] = pio.defaults.mathjax
+        k = kaleido.Kaleido(n=self.tabs, timeout=self.figure_timeout, **kopts)
+        await k.open()
+        return k
+
+    def _call(self, coroutine, timeout):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            future.cancel()
+            raise TimeoutError(f"renderização não terminou em {timeout:g}s") from None
+
+    def _shutdown(self):
+        """Fecha navegador e event loop (chamado com `_lock` adquirido)."""
+        k, loop, thread = self._kaleido, self._loop, self._thread
+        self._kaleido = self._loop = self._thread = None
+        if loop is None:
+            return
+        if k is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(k.close(), loop).result(timeout=10)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        if not thread.is_alive():
+            loop.close()
+
+    def stop(self):
+        with self._lock:
+            self._shutdown()
+
+    def restart(self):
+        with self._lock:
+            self._start_locked()
+
+    def warm_up(self):
+        """Abre o navegador em segundo plano (uma vez por processo); erros ficam para a 1a renderização."""
+        if self._warm_thread is not None or self.is_alive():
+            return
+        def run():
+            try:
+                self.start()
+            except Exception:
+                pass
+        self._warm_thread = threading.Thread(target=run, name='renderer-pool-warmup', daemon=True)
+        self._warm_thread.start()
+
+    # --- renderização ---
+
+    def render(self, fig, format='png', width=None, height=None, scale=1, timeout=None):
+        """Bytes da imagem da figura, reiniciando o navegador uma vez se ele tiver caído."""
+        import plotly.io as pio
+
+        fig_dict = fig.to_dict() if hasattr(fig, 'to_dict') else fig
+        layout = fig_dict.get('layout', {})
+        opts = dict(format=format,
+                    width=width or layout.get('width') or pio.defaults.default_width,
+                    height=height or layout.get('height') or pio.defaults.default_height,
+                    scale=scale)
+        timeout = timeout or self.figure_timeout
+
+        for attempt in (1, 2):
+            try:
+                self.start()
+                k, started = self._kaleido, time.perf_counter()
+                image = self._call(k.calc_fig(fig_dict, opts=opts), timeout)
+            except Exception:
+                # Erro da figura (navegador vivo) ou do próprio início não se resolve reiniciando
+                if attempt == 2 or self.is_alive() or self._start_error is not None:
+                    with self._stats_lock:
+                        self.failures += 1
+                    raise
+                continue
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self.renders += 1
+                self._latencies.append(elapsed)
+            self._last_ok = time.monotonic()
+            return image
+
+    def health_check(self, timeout=15):
+        """Renderiza uma figura mínima; reinicia o pool se ela falhar. Retorna True se saudável."""
+        probe = {'data': [{'type': 'bar', 'x': [1], 'y': [1]}], 'layout': {}}
+        try:
+            self.render(probe, width=50, height=50, timeout=timeout)
+            return True
+        except Exception:
+            try:
+                self.restart()
+            except Exception:
+                return False
+            return self.is_alive()
+
+    def ensure_healthy(self, max_age=HEALTH_INTERVAL):
+        """Health check só se o pool não renderizou nada com sucesso nos últimos `max_age` s."""
+        if self.is_alive() and time.monotonic() - self._last_ok < max_age:
+            return True
+        return self.health_check()
+
+    def stats(self):
+        """Contadores e latência por figura (ms) nas últimas renderizações."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            renders, failures = self.renders, self.failures
+        stats = {
+            'alive': self.is_alive(),
+            'tabs': self.tabs,
+            'renders': renders,
+            'failures': failures,
+            'restarts': self.restarts,
+            'startup_ms': self.startup_seconds * 1000 if self.startup_seconds is not None else None,
+            'mean_ms': None, 'p50_ms': None, 'p95_ms': None, 'max_ms': None,
+        }
+        if latencies:
+            stats.update({
+                'mean_ms': statistics.fmean(latencies) * 1000,
+                'p50_ms': latencies[len(latencies) // 2] * 1000,
+                'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                'max_ms': latencies[-1] * 1000,
+            })
+        return stats
+
+renderer_pool = RendererPool()
+atexit.register(renderer_pool.stop)
+
+if __name__ == "__main__":
+    # Uso: python renderer_pool.py [figuras]  -> renderiza os gráficos da base e mostra a latência
+    import warnings
+    import visualizations as viz
+    from data_loader import load_data
+
+    warnings.simplefilter('ignore')
+    n_figures = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    data = load_data('data/entrevistas_backup.csv')
+    charts = [getattr(viz, name) for name in dir(viz) if name.startswith('chart_')]
+    figures = [f for f in (chart(data) for chart in charts) if hasattr(f, 'to_json')][:n_figures]
+    for fig in figures:
+        renderer_pool.render(fig, width=1000, height=600, scale=2)
+    print(f"Saudável: {renderer_pool.health_check()}")
+    for key, value in renderer_pool.stats().items():
+        print(f"{key:>12}: {value:.1f}" if isinstance(value, float) else f"{key:>12}: {value}")
@@ -0,0 +1,107 @@
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+# Cache em memória compartilhado por todas as sessões do Streamlit no mesmo processo.
+# O módulo é importado uma única vez pelo servidor, então `shared_cache` abaixo
+# é visto por todos os usuários logados ao mesmo tempo.
+DEFAULT_BUDGET_MB = int(os.environ.get('EDUCAFRO_SHARED_CACHE_MB', '256'))
+
+def estimate_size(value):
+    """Estimativa (em bytes) do espaço ocupado por um valor cacheado."""
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, io.BytesIO):
+        return value.getbuffer().nbytes
+    if hasattr(value, 'to_json'):  # Plotly figure
+        return len(value.to_json())
+    try:
+        return len(pickle.dumps(value))
+    except Exception:
+        return 0
+
+class SharedCache:
+    """LRU thread-safe com orçamento de memória e contadores de acertos/falhas."""
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_used = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            return default
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes_used -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # maior que o orçamento inteiro: não cacheia
+            self._entries[key] = (value, size)
+            self.bytes_used += size
+            while self.bytes_used > self.max_bytes and self._entries:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.bytes_used -= old_size
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Retorna o valor cacheado ou calcula uma única vez, mesmo com sessões concorrentes."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Outra sessão pode ter calculado enquanto esperávamos
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+            try:
+                return self.put(key, compute())
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total * 100) if total else 0.0,
+                'entries': len(self._entries),
+                'evictions': self.evictions,
+                'bytes_used': self.bytes_used,
+                'max_bytes': self.max_bytes,
+            }
+
+shared_cache = SharedCache()
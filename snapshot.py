@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Snapshot colunar (Parquet) da base de entrevistas.
+# O schema do Arrow viaja dentro do arquivo (tipos preservados: Int64, datas,
+# categóricas) junto com metadados próprios: tipo do snapshot ('bruto' = export
+# do formulário, 'limpo' = saída de load_data) e versão das regras de limpeza.
+# CSV continua sendo só formato de importação/exportação.
+SNAPSHOT_EXTENSIONS = ('.parquet', '.pq')
+METADATA_KEY = b'educafro'
+KIND_RAW = 'bruto'
+KIND_CLEAN = 'limpo'
+
+def is_snapshot(path):
+    return str(path).lower().endswith(SNAPSHOT_EXTENSIONS)
+
+def write_snapshot(df, path, kind=KIND_RAW, source=None, compression='zstd'):
+    """Grava o DataFrame como Parquet com schema e metadados embutidos (escrita atômica)."""
+    from data_loader import CLEANING_RULES_VERSION
+    from data_cache import file_fingerprint
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps({
+        'tipo': kind,
+        'regras_limpeza': CLEANING_RULES_VERSION if kind == KIND_CLEAN else None,
+        'origem': os.path.basename(source) if source else None,
+        # Conteúdo do arquivo de origem: permite saber se o snapshot ficou para trás
+        'origem_sha256': file_fingerprint(source) if source and os.path.exists(source) else None,
+        'linhas': len(df),
+        'gerado_em': datetime.now(timezone.utc).isoformat(),
+    }).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(table, tmp_path, compression=compression)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+def snapshot_info(path):
+    """Lê só o rodapé do arquivo: metadados Educafro + nomes/tipos das colunas."""
+    schema = pq.read_schema(path)
+    raw = (schema.metadata or {}).get(METADATA_KEY)
+    info = json.loads(raw) if raw else {}
+    info['colunas'] = {field.name: str(field.type) for field in schema}
+    return info
+
+def snapshot_matches_source(snapshot_path, source_path):
+    """True se o snapshot foi gerado a partir do conteúdo atual de `source_path`."""
+    from data_cache import file_fingerprint
+
+    try:
+        recorded = snapshot_info(snapshot_path).get('origem_sha256')
+    except Exception:
+        return False
+    return recorded is not None and recorded == file_fingerprint(source_path)
+
+def preferred_source(csv_path, snapshot_path=None):
+    """Caminho a ler: o snapshot, se existir e estiver em dia com o CSV; senão o próprio CSV.
+
+    Devolve (caminho, desatualizado), onde `desatualizado` indica que havia um
+    snapshot, mas gerado a partir de outra versão do CSV.
+    """
+    snapshot_path = snapshot_path or os.path.splitext(csv_path)[0] + '.parquet'
+    if not os.path.exists(snapshot_path):
+        return csv_path, False
+    if not os.path.exists(csv_path):
+        return snapshot_path, False  # o snapshot é a única cópia da base
+    if snapshot_matches_source(snapshot_path, csv_path):
+        return snapshot_path, False
+    return csv_path, True
+
+def read_snapshot(path, columns=None, expected_kind=None):
+    """Lê o snapshot; com `columns`, só as colunas pedidas são decodificadas."""
+    if expected_kind is not None:
+        kind = snapshot_info(path).get('tipo')
+        if kind != expected_kind:
+            raise ValueError(f"{path} é um snapshot '{kind}', esperado '{expected_kind}'.")
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in available]
+    return pq.read_table(path, columns=columns).to_pandas()
+
+def csv_to_snapshot(csv_path, snapshot_path=None):
+    """Importa um export CSV do formulário para um snapshot bruto."""
+    snapshot_path = snapshot_path or os.path.splitext(csv_path)[0] + '.parquet'
+    return write_snapshot(pd.read_csv(csv_path), snapshot_path, kind=KIND_RAW, source=csv_path)
+
+def snapshot_to_csv(snapshot_path, csv_path=None):
+    """Exporta um snapshot de volta para CSV."""
+    csv_path = csv_path or os.path.splitext(snapshot_path)[0] + '.csv'
+    read_snapshot(snapshot_path).to_csv(csv_path, index=False)
+    return csv_path
+
+if __name__ == "__main__":
+    # Uso: python snapshot.py importar data/entrevistas_backup.csv [saida.parquet]
+    #      python snapshot.py exportar data/entrevistas_backup.parquet [saida.csv]
+    #      python snapshot.py info data/entrevistas_backup.parquet
+    if len(sys.argv) < 3 or sys.argv[1] not in ('importar', 'exportar', 'info'):
+        print("Uso: python snapshot.py importar|exportar|info <arquivo> [destino]")
+        sys.exit(1)
+    command, target = sys.argv[1], sys.argv[2]
+    output = sys.argv[3] if len(sys.argv) > 3 else None
+    if command == 'importar':
+        print(f"Snapshot gravado em {csv_to_snapshot(target, output)}")
+    elif command == 'exportar':
+        print(f"CSV gravado em {snapshot_to_csv(target, output)}")
+    else:
+        print(json.dumps(snapshot_info(target), indent=2, ensure_ascii=False))
@@ -0,0 +1,270 @@
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+from fpdf import FPDF
+from indicators import indicator_flags, indicator_tags, INDICATOR_TAGS
+from eligibility import evaluate as evaluate_eligibility
+from batch_reports import slugify
+
+# Fichas individuais (uma página por estudante) para as equipes de atendimento.
+# O layout (seções, rótulos e larguras) é montado uma vez por processo; cada
+# estudante viaja para os processos do pool como uma tupla só com as colunas
+# da ficha, já com as tags de perfil e a situação no CadÚnico calculadas.
+# Saída em .zip (um PDF por estudante, gerado em paralelo) ou num único PDF.
+SHEET_SECTIONS = [
+    ('Identificação', [
+        ('Idade', 'Idade', 1), ('Nascimento', 'data_nascimento', 1), ('Telefone', 'telefone', 1),
+        ('E-mail', 'email', 1), ('Cidade', 'Cidade', 1), ('Bairro', 'Bairro', 1),
+        ('CRAS de referência', 'CRAS de Referência', 1), ('Entrevistador(a)', 'Entrevistador', 1),
+        ('Data da entrevista', 'data_entrevista', 1),
+    ]),
+    ('Perfil', [
+        ('Raça/cor', 'Race_Group', 1), ('Identidade de gênero', 'Identidade de Gênero', 1),
+        ('Estado civil', 'Estado Civil', 1), ('Tem filhos?', 'Tem Filhos?', 1),
+        ('Escolaridade', 'Escolaridade', 1), ('Tipo de escola', 'Tipo de Escola', 1),
+        ('Curso pretendido', 'Qual curso pretende?', 2), ('Mora com', 'cotidiano_mora_com_quem', 2),
+    ]),
+    ('Trabalho, renda e assistência', [
+        ('Situação de trabalho', 'Employment_Status', 1), ('Vínculo de trabalho', 'Vínculo de Trabalho', 1),
+        ('Renda familiar', 'Renda Familiar', 1), ('Ajuda no sustento?', 'Ajuda no Sustento Familiar?', 1),
+        ('Recebe benefícios', 'Recebe Benefícios', 1), ('Benefícios', 'beneficios_tipo', 2),
+        ('CadÚnico', 'CadÚnico', 1), ('Pode requerer CadÚnico?', 'Pode Requerer CadÚnico?', 1),
+        ('Moradia', 'Condição de Moradia', 1), ('Internet', 'Possui Internet?', 1),
+    ]),
+    ('Saúde', [
+        ('Plano de saúde', 'Plano de Saúde', 1), ('Serviços que utiliza', 'saude_servicos', 2),
+        ('Deficiência', 'Possui Deficiência?', 1), ('Detalhe da deficiência', 'Detalhe Deficiência', 2),
+        ('Deficiência na família', 'Detalhe Deficiência Familiar', 2),
+        ('Problemas de saúde', 'saude_problemas_qual', 2), ('Alergias', 'saude_alergias_qual', 2),
+        ('Medicamentos', 'saude_medicamentos_qual', 2), ('Psicoterapia', 'Psicoterapia', 1),
+        ('Uso de substâncias', 'saude_substancias_qual', 2),
+    ]),
+]
+SHEET_PROCESSES = int(os.environ.get('EDUCAFRO_SHEET_PROCESSES', str(min(4, os.cpu_count() or 1))))
+CHUNK_SIZE = 100        # fichas por tarefa do pool
+OUTPUT_DIR = os.path.join('artifacts', 'fichas')
+
+# Geometria da página (mm). As posições são fixas: o que não cabe nas linhas
+# reservadas ao campo é cortado com reticências, e a ficha sempre ocupa uma página.
+MARGIN_MM = 12
+LABEL_WIDTH_MM = 48
+LINE_MM = 4.1
+SECTION_MM = 8
+VALUE_FONT_PT = 8.5
+LABEL_FONT_PT = 7.5
+
+# Caracteres comuns fora do latin-1 (fontes padrão do PDF)
+_PDF_TRANSLATION = str.maketrans({'–': '-', '—': '-', '“': '"', '”': '"', '‘': "'", '’': "'",
+                                  '…': '...', '•': '-'})
+
+def pdf_text(value):
+    """Texto do valor pronto para as fontes padrão do PDF (latin-1), sem emojis."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime('%d/%m/%Y')
+    text = str(value).translate(_PDF_TRANSLATION)
+    return ' '.join(text.encode('latin-1', 'ignore').decode('latin-1').split())
+
+def sheet_columns():
+    return ['nome_completo', 'Perfil'] + [col for _, fields in SHEET_SECTIONS for _, col, _ in fields]
+
+def sheet_records(df):
+    """(colunas, tuplas) com só o que a ficha mostra; tags e CadÚnico já calculados."""
+    frame = df.copy()
+    frame['Perfil'] = indicator_tags(indicator_flags(frame))
+    frame['Pode Requerer CadÚnico?'] = evaluate_eligibility(frame).labels
+    columns = [c for c in sheet_columns() if c in frame.columns]
+    records = [tuple(pdf_text(v) for v in row)
+               for row in frame[columns].astype(object).itertuples(index=False, name=None)]
+    return columns, records
+
+class _TextFitter:
+    """Quebra de linha com a tabela de larguras da fonte (bem mais leve que multi_cell)."""
+
+    def __init__(self, widths, size_pt):
+        self.widths = widths
+        self.scale = size_pt * 25.4 / 72 / 1000  # unidades da fonte -> mm
+
+    def width(self, text):
+        widths = self.widths
+        return sum(widths.get(c, 500) for c in text) * self.scale
+
+    def ellipsize(self, text, width):
+        while text and self.width(text + '...') > width:
+            text = text[:-1]
+        return text.rstrip() + '...'
+
+    def lines(self, text, width, max_lines):
+        """Até `max_lines` linhas de no máximo `width` mm; o excedente vira reticências."""
+        lines, current = [], ''
+        for word in text.split(' '):
+            candidate = f"{current} {word}" if current else word
+            if self.width(candidate) <= width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            current = word
+            if len(lines) >= max_lines:
+                break
+        else:
+            lines.append(current)
+            current = None
+        lines = [line if self.width(line) <= width else self.ellipsize(line, width) for line in lines[:max_lines]]
+        if current is not None and not lines[-1].endswith('...'):
+            lines[-1] = self.ellipsize(lines[-1], width)  # texto não coube
+        return lines
+
+@lru_cache(maxsize=None)
+def sheet_layout(columns):
+    """Modelo da página, calculado uma vez por processo.
+
+    Devolve (textos fixos [(x, y, estilo, tamanho, cor, texto)], faixas das seções [y],
+    campos [(x, y, posição na tupla, linhas)], posição do nome, posição das tags).
+    """
+    position = {col: i for i, col in enumerate(columns)}
+    statics, bars, fields = [], [], []
+    y = MARGIN_MM + 6
+    statics.append((MARGIN_MM, y, 'B', 13, (29, 53, 87), 'Educafro | Ficha do Estudante 2026'))
+    y += 20  # linha do cabeçalho + nome + tags
+    for title, section_fields in SHEET_SECTIONS:
+        present = [(pdf_text(label), position[col], lines) for label, col, lines in section_fields if col in position]
+        if not present:
+            continue
+        bars.append(y)
+        statics.append((MARGIN_MM + 2, y + 4.3, 'B', 10, (29, 53, 87), pdf_text(title)))
+        y += SECTION_MM
+        for label, pos, lines in present:
+            statics.append((MARGIN_MM, y + 3, 'B', LABEL_FONT_PT, (108, 117, 125), label))
+            fields.append((MARGIN_MM + LABEL_WIDTH_MM, y + 3, pos, lines))
+            y += LINE_MM * lines
+        y += 2
+    legend = '  '.join(f"{tag} {pdf_text(text)}" for tag, text in INDICATOR_TAGS.items())
+    statics.append((MARGIN_MM, y + 4, 'I', 7, (108, 117, 125), legend))
+    return tuple(statics), tuple(bars), tuple(fields), position.get('nome_completo'), position.get('Perfil')
+
+class StudentSheetPDF(FPDF):
+    def __init__(self, generated_at):
+        super().__init__(format='A4')
+        self.generated_at = pdf_text(f'Uso restrito da equipe de atendimento - gerado em {generated_at}')
+        self.set_auto_page_break(auto=False)
+        self.set_margins(MARGIN_MM, MARGIN_MM)
+        self.set_title('Educafro | Fichas dos Estudantes')
+        self.set_font('helvetica', '', VALUE_FONT_PT)
+        self._fitter = _TextFitter(self.current_font.cw, VALUE_FONT_PT)
+
+    def add_sheet(self, record, layout):
+        statics, bars, fields, name_pos, tags_pos = layout
+        self.add_page()
+        right = self.w - MARGIN_MM
+
+        # Parte fixa do modelo
+        self.set_draw_color(29, 53, 87)
+        self.line(MARGIN_MM, MARGIN_MM + 9, right, MARGIN_MM + 9)
+        self.set_fill_color(233, 236, 239)
+        for y in bars:
+            self.rect(MARGIN_MM, y, right - MARGIN_MM, SECTION_MM - 2, style='F')
+        for x, y, style, size, color, text in statics:
+            self.set_font('helvetica', style, size)
+            self.set_text_color(*color)
+            self.text(x, y, text)
+        self.set_font('helvetica', 'I', 7)
+        self.set_text_color(169, 169, 169)
+        self.text(MARGIN_MM, self.h - MARGIN_MM + 4, self.generated_at)
+
+        # Dados do estudante
+        name = record[name_pos].title() if name_pos is not None else ''
+        self.set_font('helvetica', 'B', 14)
+        self.set_text_color(33, 37, 41)
+        self.text(MARGIN_MM, MARGIN_MM + 16, name or 'Sem nome')
+        if tags_pos is not None and record[tags_pos]:
+            self.set_font('helvetica', 'B', 10)
+            self.set_text_color(214, 48, 49)
+            self.text(MARGIN_MM, MARGIN_MM + 22, record[tags_pos])
+
+        self.set_font('helvetica', '', VALUE_FONT_PT)
+        self.set_text_color(33, 37, 41)
+        value_width = right - MARGIN_MM - LABEL_WIDTH_MM
+        for x, y, pos, max_lines in fields:
+            for i, line in enumerate(self._fitter.lines(record[pos] or '-', value_width, max_lines)):
+                self.text(x, y + i * LINE_MM, line)
+
+def render_sheets(columns, records, generated_at):
+    """Um PDF com uma página por registro."""
+    layout = sheet_layout(tuple(columns))
+    pdf = StudentSheetPDF(generated_at)
+    for record in records:
+        pdf.add_sheet(record, layout)
+    return bytes(pdf.output())
+
+def _render_chunk(columns, chunk, generated_at):
+    """Tarefa do pool: [(nome do arquivo, bytes do PDF)] de um bloco de fichas."""
+    name_pos = columns.index('nome_completo') if 'nome_completo' in columns else None
+    files = []
+    for index, record in chunk:
+        name = slugify(record[name_pos]) if name_pos is not None else 'estudante'
+        files.append((f"{index + 1:05d}_{name}.pdf", render_sheets(columns, [record], generated_at)))
+    return files
+
+def generate_sheets_zip(df, path, processes=SHEET_PROCESSES, chunk_size=CHUNK_SIZE):
+    """Zip com um PDF por estudante, gerados em paralelo; devolve o nº de fichas."""
+    columns, records = sheet_records(df)
+    generated_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+    indexed = list(enumerate(records))
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        # PDFs já são comprimidos: ZIP_STORED evita recomprimir
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+            if processes > 1 and len(chunks) > 1:
+                with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as executor:
+                    results = executor.map(_render_chunk, [columns] * len(chunks), chunks,
+                                           [generated_at] * len(chunks))
+                    for files in results:  # em ordem; cada bloco é gravado e liberado
+                        for name, data in files:
+                            archive.writestr(name, data)
+            else:
+                for chunk in chunks:
+                    for name, data in _render_chunk(columns, chunk, generated_at):
+                        archive.writestr(name, data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(records)
+
+def generate_sheets_pdf(df):
+    """Todas as fichas num único PDF (bytes)."""
+    columns, records = sheet_records(df)
+    return render_sheets(columns, records, datetime.now().strftime('%d/%m/%Y %H:%M'))
+
+if __name__ == "__main__":
+    # Uso: python student_sheets.py [zip|pdf] [arquivo.csv] [processos]
+    from data_cache import load_data_cached
+
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'zip'
+    source = sys.argv[2] if len(sys.argv) > 2 else 'data/entrevistas_backup.csv'
+    n_processes = int(sys.argv[3]) if len(sys.argv) > 3 else SHEET_PROCESSES
+    if mode not in ('zip', 'pdf'):
+        print("Uso: python student_sheets.py [zip|pdf] [arquivo.csv] [processos]")
+        sys.exit(1)
+
+    data = load_data_cached(source, compact=True)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d')
+    start = time.perf_counter()
+    if mode == 'zip':
+        output_path = os.path.join(OUTPUT_DIR, f"Fichas_Educafro_{stamp}.zip")
+        count = generate_sheets_zip(data, output_path, processes=n_processes)
+    else:
+        output_path = os.path.join(OUTPUT_DIR, f"Fichas_Educafro_{stamp}.pdf")
+        with open(output_path, 'wb') as f:
+            f.write(generate_sheets_pdf(data))
+        count = len(data)
+    print(f"{count} ficha(s) em {output_path} ({time.perf_counter() - start:.1f}s)")
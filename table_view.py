@@ -0,0 +1,216 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from text_utils import fold
+
+# Tabelas paginadas do dashboard (Resumo Geral, Eixo 0).
+# Busca, filtros e ordenação rodam no servidor, sobre um índice da versão do
+# dataset: cada coluna vira códigos inteiros (pd.factorize) + valores distintos,
+# então a busca e os filtros avaliam só os valores distintos e a ordenação é um
+# argsort por coluna calculado uma vez. O resultado de uma consulta é a lista
+# de posições das linhas; só a página visível é montada, estilizada e enviada
+# ao navegador, e o tamanho de cada interação não cresce com a base.
+PAGE_ROWS = 200          # linhas por página (o Styler cresce com o nº de células)
+QUERY_CACHE_SIZE = 64    # consultas (busca + filtros + ordem) mantidas por índice
+NO_SORT = "Ordem da planilha"
+
+class _IndexedColumn:
+    """Códigos por linha, valores distintos e ordenações de uma coluna."""
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series)
+        self.codes = codes
+        self.values = pd.Series(uniques).astype(object).to_numpy()
+        self.numeric = (pd.api.types.is_numeric_dtype(series.dtype)
+                        or pd.api.types.is_datetime64_any_dtype(series.dtype))
+        self._folded = None
+        self._orders = {}
+
+    def folded(self):
+        """Valores distintos em minúsculas e sem acentos (busca e ordem alfabética)."""
+        if self._folded is None:
+            self._folded = pd.Series([fold(str(v)) for v in self.values], dtype=object)
+        return self._folded
+
+    def order(self, ascending=True):
+        """Posições das linhas ordenadas pela coluna (ordenação estável, ausentes no fim)."""
+        if ascending not in self._orders:
+            keys = self.values if self.numeric else self.folded().to_numpy()
+            ranks = np.empty(len(self.values) + 1, dtype=np.int64)
+            ranks[np.argsort(keys, kind='stable')] = np.arange(len(self.values))
+            if not ascending:
+                ranks[:-1] = len(self.values) - 1 - ranks[:-1]
+            ranks[-1] = len(self.values)  # código -1 (ausente) cai no fim do vetor
+            self._orders[ascending] = np.argsort(ranks[self.codes], kind='stable')
+        return self._orders[ascending]
+
+    def matches(self, term):
+        """Máscara das linhas cujo valor contém `term` (já dobrado)."""
+        hits = self.folded().str.contains(term, regex=False).to_numpy(dtype=bool)
+        return np.append(hits, False)[self.codes]
+
+    def isin(self, selected):
+        selected = set(selected)
+        hits = np.fromiter((v in selected for v in self.values), dtype=bool, count=len(self.values))
+        return np.append(hits, False)[self.codes]
+
+class TableIndex:
+    """Índice de uma versão do dataset para as tabelas paginadas; colunas indexadas sob demanda."""
+
+    def __init__(self, df):
+        self.n = len(df)
+        self._df = weakref.ref(df)
+        self._lock = threading.Lock()
+        self._columns = {}
+        self._derived = {}
+        self._queries = OrderedDict()
+
+    def derive(self, name, compute, version=None):
+        """Registra uma coluna calculada (ex.: 'Perfil'); `compute(df)` roda só quando ela é usada.
+
+        Se `version` mudar (ex.: nova versão das regras que geram a coluna), a
+        coluna é reindexada e as consultas guardadas são descartadas.
+        """
+        with self._lock:
+            current = self._derived.get(name)
+            if current is not None and current[1] == version:
+                return
+            self._derived[name] = (compute, version)
+            if current is not None:
+                self._columns.pop(name, None)
+                self._queries.clear()
+
+    def has(self, col):
+        df = self._df()
+        return col in self._derived or (df is not None and col in df.columns)
+
+    def column(self, col):
+        if col not in self._columns:
+            df = self._df()
+            if df is None:
+                raise RuntimeError("O DataFrame deste índice não existe mais.")
+            with self._lock:
+                if col not in self._columns:
+                    series = self._derived[col][0](df) if col in self._derived else df[col]
+                    self._columns[col] = _IndexedColumn(series)
+        return self._columns[col]
+
+    def options(self, col):
+        """Valores distintos (sem ausentes) da coluna, em ordem alfabética, para os filtros."""
+        column = self.column(col)
+        return [column.values[i] for i in np.argsort(column.folded().to_numpy(), kind='stable')]
+
+    def query(self, search='', search_columns=(), filters=None, sort=None, ascending=True):
+        """Posições (np.ndarray) das linhas que passam na busca e nos filtros, já na ordem pedida.
+
+        A busca é feita palavra por palavra, sem acentos/maiúsculas: cada palavra
+        precisa aparecer em ao menos uma das `search_columns`. `filters` é
+        {coluna: valores aceitos}; filtros vazios não restringem nada.
+        """
+        words = tuple(fold(search).split())
+        filters = tuple(sorted((col, tuple(values)) for col, values in (filters or {}).items() if values))
+        key = (words, tuple(search_columns), filters, sort, ascending)
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return self._queries[key]
+
+        mask = np.ones(self.n, dtype=bool)
+        for col, values in filters:
+            mask &= self.column(col).isin(values)
+        for word in words:
+            found = np.zeros(self.n, dtype=bool)
+            for col in search_columns:
+                found |= self.column(col).matches(word)
+            mask &= found
+        if sort is None:
+            positions = np.flatnonzero(mask)
+        else:
+            order = self.column(sort).order(ascending)
+            positions = order[mask[order]]
+
+        with self._lock:
+            self._queries[key] = positions
+            while len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return positions
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def index_for(df):
+    """Índice da versão do dataset `df` (mesma regra de identidade do `aggregates.cube_for`)."""
+    key = id(df)
+    index = _indexes.get(key)
+    if index is not None and index._df() is df:
+        return index
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index._df() is not df:
+            index = TableIndex(df)
+            _indexes[key] = index
+            weakref.finalize(df, _discard, key, index)
+    return index
+
+def _discard(key, index):
+    with _indexes_lock:
+        if _indexes.get(key) is index:
+            del _indexes[key]
+
+def page_slice(total, page, page_rows=PAGE_ROWS):
+    """slice das posições da página `page` (1 = primeira), limitado às páginas existentes."""
+    n_pages = max(1, -(-total // page_rows))
+    page = min(max(int(page), 1), n_pages)
+    return slice((page - 1) * page_rows, min(page * page_rows, total))
+
+def paged_table(df, key, prepare, search_columns=(), filter_columns=(), sort_columns=None,
+                page_rows=PAGE_ROWS, label="Estudantes"):
+    """Tabela paginada com busca, filtros e ordenação no servidor.
+
+    `prepare(positions)` recebe as posições (iloc) das linhas da página e devolve
+    o DataFrame ou Styler a exibir. Colunas calculadas usadas na busca, nos
+    filtros ou na ordem devem ser registradas antes com `index_for(df).derive`.
+    """
+    import streamlit as st
+
+    index = index_for(df)
+    search_columns = [c for c in search_columns if index.has(c)]
+    filter_columns = [c for c in filter_columns if index.has(c)]
+    sort_columns = [c for c in (sort_columns if sort_columns is not None else df.columns) if index.has(c)]
+
+    col_search, col_sort, col_desc = st.columns([3, 2, 1])
+    search = col_search.text_input("Buscar", key=f"{key}_busca",
+                                   placeholder=f"Busca em: {', '.join(search_columns)}") if search_columns else ''
+    sort = col_sort.selectbox("Ordenar por", [NO_SORT] + sort_columns, key=f"{key}_ordem")
+    descending = col_desc.toggle("Decrescente", key=f"{key}_desc", disabled=sort == NO_SORT)
+    filters = {}
+    if filter_columns:
+        with st.expander("Filtros"):
+            for col in filter_columns:
+                filters[col] = st.multiselect(col, index.options(col), key=f"{key}_filtro_{col}")
+
+    positions = index.query(search, search_columns, filters,
+                            sort=None if sort == NO_SORT else sort, ascending=not descending)
+    total = len(positions)
+    if total == 0:
+        st.info("Nenhum registro encontrado com a busca e os filtros atuais.")
+        return positions
+
+    # Nova busca/filtro/ordem volta para a primeira página
+    n_pages = max(1, -(-total // page_rows))
+    query_state = (search, tuple((c, tuple(v)) for c, v in filters.items()), sort, descending)
+    page_key = f"{key}_pagina"
+    if st.session_state.get(f"{key}_consulta") != query_state:
+        st.session_state[f"{key}_consulta"] = query_state
+        st.session_state[page_key] = 1
+    elif st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = st.number_input(f"Página (de {n_pages})", min_value=1, max_value=n_pages, key=page_key) if n_pages > 1 else 1
+
+    rows = page_slice(total, page, page_rows)
+    st.dataframe(prepare(positions[rows]), use_container_width=True, hide_index=True)
+    filtered = f" (filtrados de {index.n})" if total < index.n else ""
+    st.caption(f"{label} {rows.start + 1}–{rows.stop} de {total}{filtered}")
+    return positions
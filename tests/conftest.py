@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+BACKUP_CSV = 'data/entrevistas_backup.csv'
+
+@pytest.fixture
+def interviews_csv(tmp_path):
+    """Entrevistas completas da base real, com as datas de nascimento trocadas pelo teste."""
+    def write(birth_dates):
+        base = pd.read_csv(BACKUP_CSV, dtype=str)
+        rows = base[base['status_formulario'] == 'completo'].head(len(birth_dates)).copy()
+        rows['nome_completo'] = [f"Estudante {i}" for i in range(len(rows))]
+        rows['cpf'] = [f"{i:011d}" for i in range(len(rows))]
+        rows['data_nascimento'] = birth_dates
+        path = tmp_path / 'entrevistas.csv'
+        rows.to_csv(path, index=False)
+        return path
+    return write
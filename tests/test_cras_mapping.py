@@ -0,0 +1,11 @@
+import pandas as pd
+from cras_mapping import BairroResolver
+
+def test_match_without_trailing_number_goes_to_curation():
+    resolver = BairroResolver()
+    assert resolver.match('Vila Nova')[3] == 'exato'
+    cras, reference, confidence, method = resolver.match('Vila Nova 2')
+    assert (cras, reference, method) == ('SECRAS Centro', 'vila nova', 'sem número')
+    assert confidence < 1.0
+    report = resolver.report(pd.Series(['Vila Nova', 'Vila Nova 2']))
+    assert report.loc[report['Método'] != 'exato', 'Bairro'].tolist() == ['Vila Nova 2']
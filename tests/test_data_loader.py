@@ -0,0 +1,16 @@
+import pandas as pd
+from data_loader import load_data, parse_birth_dates
+
+REFERENCE_DATE = '2026-10-17'
+
+def test_parse_birth_dates_keeps_iso_day_and_month():
+    values = pd.Series(['2007-08-03', '03/08/2007', '03-08-2007', None, 'sem data'])
+    parsed = parse_birth_dates(values)
+    assert parsed[:3].tolist() == [pd.Timestamp('2007-08-03')] * 3
+    assert parsed[3:].isna().all()
+
+def test_age_from_iso_birth_date_with_day_up_to_12(interviews_csv):
+    df = load_data(interviews_csv(['2008-11-06', '2008-04-12']), reference_date=REFERENCE_DATE)
+    assert df['data_nascimento'].tolist() == [pd.Timestamp('2008-11-06'), pd.Timestamp('2008-04-12')]
+    assert df['Idade'].tolist() == [17, 18]
+    assert df['Faixa Etária'].astype(str).tolist() == ['Menor que 18 anos', '18 a 30 anos']
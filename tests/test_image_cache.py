@@ -0,0 +1,9 @@
+import image_cache
+
+def test_overwriting_a_key_does_not_inflate_the_usage_estimate(tmp_path):
+    cache_dir = str(tmp_path)
+    options = {'format': 'png'}
+    for size in (100, 300, 200):
+        image_cache.put('a' * 64, options, b'x' * size, cache_dir=cache_dir)
+    image_cache.put('b' * 64, options, b'y' * 50, cache_dir=cache_dir)
+    assert image_cache._usage[cache_dir] == image_cache._scan(cache_dir) == [2, 250]
@@ -0,0 +1,20 @@
+import pandas as pd
+from data_loader import load_data
+
+REFERENCE_DATE = '2026-10-17'
+# Nomes corrigidos à mão no export CSV (digitação), sem passar pelo formulário:
+# é a única coluna em que os dois backups diferem nas mesmas entrevistas
+HAND_CORRECTED = ['nome_completo']
+
+def test_json_backup_loads_like_csv_backup():
+    from_csv = load_data('data/entrevistas_backup.csv', reference_date=REFERENCE_DATE).set_index('form_uuid')
+    from_json = load_data('data/entrevistas_backup.json', reference_date=REFERENCE_DATE).set_index('form_uuid')
+    shared = from_csv.index.intersection(from_json.index)
+    assert len(shared) > 0
+    assert list(from_json.columns) == list(from_csv.columns)
+
+    columns = [c for c in from_csv.columns if c not in HAND_CORRECTED]
+    # check_dtype=False: 'id' é int num backup e float no outro (só um deles tem linhas sem id)
+    pd.testing.assert_frame_equal(from_json.loc[shared, columns], from_csv.loc[shared, columns], check_dtype=False)
+    services = from_json.loc[shared, 'saude_servicos'].dropna()
+    assert not services.str.startswith('[').any()
@@ -0,0 +1,14 @@
+import pandas as pd
+from snapshot import csv_to_snapshot, preferred_source
+
+def test_preferred_source_ignores_snapshot_of_older_csv(tmp_path):
+    csv_path = tmp_path / 'entrevistas.csv'
+    snapshot_path = str(tmp_path / 'entrevistas.parquet')
+    pd.DataFrame({'nome_completo': ['Ana'], 'status_formulario': ['completo']}).to_csv(csv_path, index=False)
+    assert preferred_source(str(csv_path), snapshot_path) == (str(csv_path), False)
+
+    csv_to_snapshot(str(csv_path), snapshot_path)
+    assert preferred_source(str(csv_path), snapshot_path) == (snapshot_path, False)
+
+    pd.DataFrame({'nome_completo': ['Ana', 'Bia'], 'status_formulario': ['completo'] * 2}).to_csv(csv_path, index=False)
+    assert preferred_source(str(csv_path), snapshot_path) == (str(csv_path), True)
@@ -0,0 +1,12 @@
+from data_loader import load_data
+from student_sheets import sheet_records, render_sheets
+
+REFERENCE_DATE = '2026-10-17'
+
+def test_sheet_prints_iso_birth_date_with_day_up_to_12(interviews_csv):
+    df = load_data(interviews_csv(['2007-08-03']), reference_date=REFERENCE_DATE)
+    columns, records = sheet_records(df)
+    sheet = dict(zip(columns, records[0]))
+    assert sheet['data_nascimento'] == '03/08/2007'
+    assert sheet['Idade'] == '19'
+    assert render_sheets(columns, records, '17/10/2026 12:00').startswith(b'%PDF')
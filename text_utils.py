@@ -0,0 +1,9 @@
+import unicodedata
+
+# Utilitários de texto sem dependências do resto do projeto (busca, filtros,
+# mapeamento de bairros, nuvens de palavras, regras de elegibilidade).
+
+def fold(text):
+    """Minúsculas e sem acentos ('Saúde' -> 'saude')."""
+    text = unicodedata.normalize('NFD', text.lower())
+    return ''.join(c for c in text if unicodedata.category(c) != 'Mn')
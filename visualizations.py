@@ -1,9 +1,8 @@
 import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import io
 import pandas as pd
+from aggregates import cube_for, value_counts, GENDER_MODEL_A
+from wordclouds import term_frequencies, wordcloud_image
 
 # Core Color Palette (Premium)
 COLORS = {
@@ -29,21 +28,12 @@ def get_summary_stats(df, column_name):
     """Retorna uma string formatada com os valores reais e percentuais de uma coluna."""
     if column_name not in df.columns:
         return ""
-    
-    counts = df[column_name].value_counts()
-    total = len(df)
-    
-    stats_list = []
-    for label, count in counts.items():
-        percent = (count / total * 100)
-        stats_list.append(f"{label}: {count} ({percent:.1f}%)")
-    
-    return " | ".join(stats_list)
+    return " | ".join(cube_for(df).summary(column_name))
 
 def chart_1_race_composition(df):
     """1. Gráfico de Composição Racial (Raça/Povo) - Padrão Institucional"""
     # 1. Normalização e contagem
-    counts = df['Race_Group'].value_counts()
+    counts = cube_for(df).counts('Race_Group')
     
     # 2. Dados básicos
     pretos_val = counts.get('Pretos(as)', 0)
@@ -141,11 +131,8 @@ def chart_1_race_composition(df):
 
 def chart_2_gender_distribution(df):
     """2. Gráfico de Distribuição por Gênero - Barras horizontais (Modelo A)"""
-    col = 'Identidade de Gênero'
-    # Modelo A: agrupar variantes trans em 'Feminina' (ver nota metodológica)
-    trans_variantes = ['MULHER TRANS', 'Mulher trans', 'mulher trans', 'Mulher Trans']
-    genero = df[col].replace(trans_variantes, 'Feminina')
-    counts = genero.value_counts().reset_index()
+    # Modelo A: variantes trans agrupadas em 'Feminina' (ver nota metodológica)
+    counts = cube_for(df).counts(GENDER_MODEL_A).reset_index()
     counts.columns = ['Gênero', 'Total']
     total = counts['Total'].sum()
 
@@ -200,12 +187,8 @@ def chart_2_gender_distribution(df):
 def chart_3_race_by_gender(df):
     """3. Composição Raça/Povo por Gênero (Percentual Empilhado Institucional)"""
 
-    # Agrupar variantes trans em 'Feminina'
-    trans_variantes = ['MULHER TRANS', 'Mulher trans', 'mulher trans', 'Mulher Trans']
-    genero_series = df['Identidade de Gênero'].replace(trans_variantes, 'Feminina')
-
-    # 1. Tabela de frequências absolutas
-    df_counts = pd.crosstab(genero_series, df['Race_Group'])
+    # 1. Tabela de frequências absolutas (gênero no Modelo A: trans em 'Feminina')
+    df_counts = cube_for(df).crosstab(GENDER_MODEL_A, 'Race_Group')
     
     # 2. Tabela de percentuais para os rótulos
     df_pct = (df_counts.div(df_counts.sum(axis=1), axis=0) * 100).round(1)
@@ -267,7 +250,7 @@ def chart_3_race_by_gender(df):
 
 def chart_4_age_groups(df):
     """4. Gráfico de Estudantes por Faixa Etária"""
-    counts = df['Faixa Etária'].value_counts().reset_index()
+    counts = cube_for(df).counts('Faixa Etária').reset_index()
     counts.columns = ['Faixa', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Faixa', hole=0.6,
@@ -277,7 +260,7 @@ def chart_4_age_groups(df):
 
 def chart_5_geography(df):
     """5. Mapa Infográfico de Localização Geográfica (as Bar Chart)"""
-    counts = df['Cidade'].value_counts().reset_index()
+    counts = cube_for(df).counts('Cidade').reset_index()
     counts.columns = ['Cidade', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Cidade', y='Total', title=f"Distribuição Geográfica dos Estudantes (N={total_n})",
@@ -286,7 +269,7 @@ def chart_5_geography(df):
 
 def chart_6_employment_general(df):
     """6. Gráfico de Situação de Trabalho (Geral)"""
-    counts = df['Employment_Status'].value_counts().reset_index()
+    counts = cube_for(df).counts('Employment_Status').reset_index()
     counts.columns = ['Situação', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Situação', hole=0.6,
@@ -297,12 +280,13 @@ def chart_6_employment_general(df):
 def chart_7_employment_by_gender(df):
     """7. Gráfico de Distribuição de Emprego por Gênero"""
     # Calculate percentages within each gender
-    df_emp = df.groupby(['Identidade de Gênero', 'Employment_Status']).size().reset_index(name='count')
-    total_per_gender = df.groupby('Identidade de Gênero').size().reset_index(name='total')
-    df_emp = df_emp.merge(total_per_gender, on='Identidade de Gênero')
+    cube = cube_for(df)
+    df_emp = cube.crosstab('Identidade de Gênero', 'Employment_Status').stack()
+    df_emp = df_emp[df_emp > 0].reset_index(name='count')
+    df_emp['total'] = df_emp['Identidade de Gênero'].map(cube.counts('Identidade de Gênero'))
     df_emp['percent'] = (df_emp['count'] / df_emp['total'] * 100).round(1)
     
-    total_n = len(df[['Identidade de Gênero', 'Employment_Status']].dropna())
+    total_n = int(df_emp['count'].sum())
     fig = px.bar(df_emp, x="Identidade de Gênero", y="percent", color="Employment_Status",
                  barmode='group', title=f"Taxa de Emprego por Gênero (%) (N={total_n})",
                  text='percent', color_discrete_map={'Empregado': COLORS['primary'], 'Fora da força de trabalho': COLORS['dark']})
@@ -310,7 +294,7 @@ def chart_7_employment_by_gender(df):
 
 def chart_8_job_categories(df):
     """8. Gráfico de Categorias de Trabalho (Grau de Precarização)"""
-    counts = df['Vínculo de Trabalho'].value_counts().reset_index()
+    counts = cube_for(df).counts('Vínculo de Trabalho').reset_index()
     counts.columns = ['Vínculo', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Vínculo', hole=0.6,
@@ -319,11 +303,11 @@ def chart_8_job_categories(df):
 
 def chart_8b_job_wordcloud(df):
     """8b. Nuvem de Palavras: Vínculos de Trabalho (Outros)"""
-    return generate_wordcloud(df['Vínculo de Trabalho (Outro)'], "Descrição de Vínculos de Trabalho (Outros)")
+    return wordcloud_image(cube_for(df).terms('Vínculo de Trabalho (Outro)'), "Descrição de Vínculos de Trabalho (Outros)")
 
 def chart_9_household_income(df):
     """9. Gráfico de Renda Familiar (Valores Brutos) - Sincronizado com CSV"""
-    counts = df['Renda Familiar'].value_counts().reset_index()
+    counts = cube_for(df).counts('Renda Familiar').reset_index()
     counts.columns = ['Faixa', 'Total']
     total_n = counts['Total'].sum()
     
@@ -343,7 +327,7 @@ def chart_9_household_income(df):
 
 def chart_10_money_usage(df):
     """10. Destino da Renda (Uso do Dinheiro)"""
-    counts = df['Uso do Dinheiro (Trabalho)'].dropna().value_counts().reset_index()
+    counts = cube_for(df).counts('Uso do Dinheiro (Trabalho)').reset_index()
     counts.columns = ['Uso', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Uso', hole=0.6,
@@ -353,7 +337,7 @@ def chart_10_money_usage(df):
 
 def chart_10b_cadunico(df):
     """10b. Inscrição no CadÚnico"""
-    counts = df['CadÚnico'].value_counts().reset_index()
+    counts = cube_for(df).counts('CadÚnico').reset_index()
     counts.columns = ['Inscrito', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Inscrito', hole=0.6,
@@ -363,7 +347,7 @@ def chart_10b_cadunico(df):
 
 def chart_11_tech_access(df):
     """11. Gráficos de Acesso à Tecnologia (Internet)"""
-    counts = df['Possui Internet?'].value_counts().reset_index()
+    counts = cube_for(df).counts('Possui Internet?').reset_index()
     counts.columns = ['Internet', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Internet', hole=0.6,
@@ -372,7 +356,7 @@ def chart_11_tech_access(df):
 
 def chart_11b_device_quality(df):
     """11b. Qualidade do Equipamento"""
-    counts = df['Tipo de Internet'].value_counts().reset_index()
+    counts = cube_for(df).counts('Tipo de Internet').reset_index()
     counts.columns = ['Tipo', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Tipo', hole=0.6,
@@ -381,7 +365,7 @@ def chart_11b_device_quality(df):
 
 def chart_12_housing(df):
     """12. Gráfico de Condição de Moradia"""
-    counts = df['Condição de Moradia'].value_counts().reset_index()
+    counts = cube_for(df).counts('Condição de Moradia').reset_index()
     counts.columns = ['Condição', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Condição', hole=0.6,
@@ -390,7 +374,7 @@ def chart_12_housing(df):
 
 def chart_13_attendance_general(df):
     """13. Gráfico de Infrequência Geral (Based on Mock)"""
-    counts = df['Frequência'].value_counts().reset_index()
+    counts = cube_for(df).counts('Frequência').reset_index()
     counts.columns = ['Status', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Status', hole=0.6,
@@ -400,7 +384,7 @@ def chart_13_attendance_general(df):
 
 def chart_14_busca_ativa(df):
     """14. Gráfico de Resultado da Busca Ativa (Based on Mock)"""
-    counts = df['Busca_Ativa_Result'].value_counts().reset_index()
+    counts = cube_for(df).counts('Busca_Ativa_Result').reset_index()
     counts.columns = ['Resultado', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Resultado', hole=0.6,
@@ -409,47 +393,32 @@ def chart_14_busca_ativa(df):
 
 def chart_15_attendance_by_job(df):
     """15. Gráfico de Infrequência por Situação de Trabalho"""
-    df_cross = pd.crosstab(df['Employment_Status'], df['Frequência'], normalize='index') * 100
+    df_counts = cube_for(df).crosstab('Employment_Status', 'Frequência')
+    df_cross = df_counts.div(df_counts.sum(axis=1), axis=0) * 100
     df_cross = df_cross.reset_index()
     df_melt = df_cross.melt(id_vars='Employment_Status', var_name='Frequência', value_name='Percentual')
     
-    total_n = len(df[['Employment_Status', 'Frequência']].dropna())
+    total_n = int(df_counts.values.sum())
     fig = px.bar(df_melt, x='Percentual', y='Employment_Status', color='Frequência',
                  orientation='h', title=f"Infrequência vs Situação de Trabalho (%) (N={total_n})",
                  color_discrete_map={'Frequente': '#2A9D8F', 'Infrequente': '#E76F51'})
     return fig
 
 def generate_wordcloud(text_list, title):
-    """Generates a word cloud from a list of strings."""
-    text = " ".join([str(t) for t in text_list if pd.notnull(t)])
-    if not text.strip():
-        return None
-    
-    wc = WordCloud(width=800, height=400, background_color='white', 
-                   colormap='RdBu', max_words=50).generate(text)
-    
-    plt.figure(figsize=(10, 5))
-    plt.imshow(wc, interpolation='bilinear')
-    plt.axis('off')
-    plt.title(title)
-    
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close()
-    return buf
+    """Generates a word cloud (PNG in a BytesIO) from a list of strings, or None if there is no text."""
+    return wordcloud_image(term_frequencies(text_list), title)
 
 def chart_16_interests(df):
     """16. Nuvem de Palavras: Temas de Interesse Coletivo"""
-    return generate_wordcloud(df['Temas de interesse'], "Temas de Interesse Coletivo")
+    return wordcloud_image(cube_for(df).terms('Temas de interesse'), "Temas de Interesse Coletivo")
 
 def chart_17_courses(df):
     """17. Nuvem de Palavras: Cursos Desejados"""
-    return generate_wordcloud(df['Qual curso pretende?'], "Cursos de Interesse (Graduação)")
+    return wordcloud_image(cube_for(df).terms('Qual curso pretende?'), "Cursos de Interesse (Graduação)")
 
 def chart_18_orientation(df):
     """18. Distribuição de Orientação Sexual"""
-    counts = df['Orientação Sexual'].value_counts().reset_index()
+    counts = cube_for(df).counts('Orientação Sexual').reset_index()
     counts.columns = ['Orientação', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Orientação', hole=0.6,
@@ -459,7 +428,7 @@ def chart_18_orientation(df):
 
 def chart_19_school_type(df):
     """19. Tipo de Escola (Ensino Médio)"""
-    counts = df['Tipo de Escola'].value_counts().reset_index()
+    counts = cube_for(df).counts('Tipo de Escola').reset_index()
     counts.columns = ['Tipo', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Tipo', y='Total', title=f"Trajetória Escolar (Tipo de Escola de Origem) (N={total_n})",
@@ -468,13 +437,13 @@ def chart_19_school_type(df):
 
 def chart_20_parental_education(df):
     """20. Escolaridade Parental Comparada"""
-    mae = df['Escolaridade da Mãe'].value_counts().reset_index()
+    mae = cube_for(df).counts('Escolaridade da Mãe').reset_index()
     mae.columns = ['Escolaridade', 'Mãe']
-    pai = df['Escolaridade do Pai'].value_counts().reset_index()
+    pai = cube_for(df).counts('Escolaridade do Pai').reset_index()
     pai.columns = ['Escolaridade', 'Pai']
     
     comp = pd.merge(mae, pai, on='Escolaridade', how='outer').fillna(0)
-    total_n = len(df[['Escolaridade da Mãe', 'Escolaridade do Pai']].dropna(how='all'))
+    total_n = cube_for(df).present(['Escolaridade da Mãe', 'Escolaridade do Pai'], how='all')
     fig = px.bar(comp, x='Escolaridade', y=['Mãe', 'Pai'], barmode='group',
                  title=f"Escolaridade dos Pais (N={total_n})",
                  color_discrete_map={'Mãe': COLORS['primary'], 'Pai': COLORS['dark']})
@@ -482,7 +451,7 @@ def chart_20_parental_education(df):
 
 def chart_21_health_access(df):
     """21. Acesso à Saúde (Plano vs SUS)"""
-    counts = df['Plano de Saúde'].value_counts().reset_index()
+    counts = cube_for(df).counts('Plano de Saúde').reset_index()
     counts.columns = ['Acesso', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Acesso', hole=0.6,
@@ -492,7 +461,7 @@ def chart_21_health_access(df):
 
 def chart_22_social_benefits(df):
     """22. Recebimento de Benefícios Sociais"""
-    counts = df['Recebe Benefícios'].value_counts().reset_index()
+    counts = cube_for(df).counts('Recebe Benefícios').reset_index()
     counts.columns = ['Recebe', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Recebe', hole=0.6,
@@ -502,7 +471,7 @@ def chart_22_social_benefits(df):
 
 def chart_23_transport_modes(df):
     """23. Meios de Transporte"""
-    counts = df['Meio de Transporte'].value_counts().reset_index()
+    counts = cube_for(df).counts('Meio de Transporte').reset_index()
     counts.columns = ['Meio', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Meio', y='Total', title=f"Meios de Transporte Utilizados (N={total_n})",
@@ -511,7 +480,7 @@ def chart_23_transport_modes(df):
 
 def chart_25_internet_signal(df):
     """25. Qualidade do Sinal de Internet"""
-    counts = df['Sinal de Internet'].value_counts().reset_index()
+    counts = cube_for(df).counts('Sinal de Internet').reset_index()
     counts.columns = ['Sinal', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Sinal', y='Total', title=f"Qualidade do Sinal de Internet (N={total_n})",
@@ -520,7 +489,7 @@ def chart_25_internet_signal(df):
 
 def chart_26_housing_type(df):
     """26. Tipo de Moradia (Construção)"""
-    counts = df['Tipo de Moradia'].value_counts().reset_index()
+    counts = cube_for(df).counts('Tipo de Moradia').reset_index()
     counts.columns = ['Tipo', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Tipo', hole=0.6,
@@ -529,7 +498,7 @@ def chart_26_housing_type(df):
 
 def chart_27_parenthood(df):
     """27. Estudantes com Filhos"""
-    counts = df['Tem Filhos?'].value_counts().reset_index()
+    counts = cube_for(df).counts('Tem Filhos?').reset_index()
     counts.columns = ['Possui', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Possui', hole=0.6,
@@ -549,11 +518,11 @@ def chart_28_disability(df):
     df_familiar = df[df['Familiar com Deficiência?'] == 'Sim']
     
     # Count specific disabilities
-    est_counts = df_estudante['Detalhe Deficiência'].value_counts().reset_index()
+    est_counts = value_counts(df_estudante['Detalhe Deficiência']).reset_index()
     est_counts.columns = ['Deficiência', 'Total']
     est_counts['Tipo'] = 'Estudante'
     
-    fam_counts = df_familiar['Detalhe Deficiência Familiar'].value_counts().reset_index()
+    fam_counts = value_counts(df_familiar['Detalhe Deficiência Familiar']).reset_index()
     fam_counts.columns = ['Deficiência', 'Total']
     fam_counts['Tipo'] = 'Familiar'
     
@@ -581,7 +550,7 @@ def chart_28_disability(df):
 
 def chart_29_blood_type(df):
     """29. Distribuição de Tipo Sanguíneo"""
-    counts = df['Tipo Sanguíneo'].value_counts().reset_index()
+    counts = cube_for(df).counts('Tipo Sanguíneo').reset_index()
     counts.columns = ['Tipo', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Tipo', y='Total', title=f"Conhecimento do Tipo Sanguíneo (N={total_n})",
@@ -590,7 +559,7 @@ def chart_29_blood_type(df):
 
 def chart_30_interviewer_balance(df):
     """30. Volume de Entrevistas por Entrevistador"""
-    counts = df['Entrevistador'].value_counts().reset_index()
+    counts = cube_for(df).counts('Entrevistador').reset_index()
     counts.columns = ['Entrevistador', 'Total']
     fig = px.bar(counts, y='Entrevistador', x='Total', orientation='h',
                  title="Distribuição de Entrevistas por Entrevistador(a)",
@@ -599,7 +568,7 @@ def chart_30_interviewer_balance(df):
 
 def chart_31_marital_status(df):
     """31. Distribuição de Estado Civil"""
-    counts = df['Estado Civil'].value_counts().reset_index()
+    counts = cube_for(df).counts('Estado Civil').reset_index()
     counts.columns = ['Estado Civil', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Estado Civil', 
@@ -639,7 +608,7 @@ def chart_33_benefits_breakdown(df):
 
 def chart_34_substance_use(df):
     """34. Uso de Substâncias (Álcool, Cigarro, etc.)"""
-    counts = df['Uso de Substâncias'].value_counts().reset_index()
+    counts = cube_for(df).counts('Uso de Substâncias').reset_index()
     counts.columns = ['Uso', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Uso', y='Total', title=f"Relato de Uso de Substâncias (N={total_n})",
@@ -648,7 +617,7 @@ def chart_34_substance_use(df):
 
 def chart_35_family_context(df):
     """35. Configuração Familiar (Com quem mora)"""
-    counts = df['cotidiano_mora_com_quem'].value_counts().head(8).reset_index()
+    counts = cube_for(df).counts('cotidiano_mora_com_quem').head(8).reset_index()
     counts.columns = ['Com quem mora', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Total', y='Com quem mora', orientation='h',
@@ -659,7 +628,7 @@ def chart_35_family_context(df):
 
 def chart_36_household_sustenance(df):
     """36. Estudantes que ajudam no sustento familiar"""
-    counts = df['Ajuda no Sustento Familiar?'].value_counts().reset_index()
+    counts = cube_for(df).counts('Ajuda no Sustento Familiar?').reset_index()
     counts.columns = ['Ajuda?', 'Total']
     total_n = counts['Total'].sum()
     fig = px.pie(counts, values='Total', names='Ajuda?', 
@@ -669,7 +638,7 @@ def chart_36_household_sustenance(df):
 
 def chart_37_transport_subsidy(df):
     """37. Necessidade de Auxílio Transporte"""
-    counts = df['transporte_auxilio'].value_counts().reset_index()
+    counts = cube_for(df).counts('transporte_auxilio').reset_index()
     counts.columns = ['Necessita Auxílio?', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Necessita Auxílio?', y='Total', 
@@ -679,19 +648,11 @@ def chart_37_transport_subsidy(df):
 
 def chart_38_parental_professions_cloud(df):
     """38. Nuvem de Palavras: Profissões dos Pais"""
-    professions = []
-    for col in ['profissao_mae', 'profissao_pai']:
-        if col in df.columns:
-            professions.extend(df[col].dropna().astype(str).tolist())
-    
-    if not professions:
-        return None
-        
-    return generate_wordcloud(professions, "Origem Profissional Familiar")
+    return wordcloud_image(cube_for(df).terms('profissao_mae', 'profissao_pai'), "Origem Profissional Familiar")
 
 def chart_39_food_security(df):
     """39. Segurança Alimentar (Recebimento de Cesta Básica)"""
-    counts = df['cesta_basica'].value_counts().reset_index()
+    counts = cube_for(df).counts('cesta_basica').reset_index()
     counts.columns = ['Recebe Cesta Básica?', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Recebe Cesta Básica?', y='Total', 
@@ -701,7 +662,7 @@ def chart_39_food_security(df):
 
 def chart_40_study_availability(df):
     """40. Disponibilidade para Estudo (Frequência)"""
-    counts = df['objetivo_frequencia'].value_counts().reset_index()
+    counts = cube_for(df).counts('objetivo_frequencia').reset_index()
     counts.columns = ['Frequência Preferida', 'Total']
     total_n = counts['Total'].sum()
     fig = px.bar(counts, x='Frequência Preferida', y='Total', 
@@ -711,15 +672,8 @@ def chart_40_study_availability(df):
 
 def chart_41_health_needs_cloud(df):
     """41. Nuvem de Palavras: Necessidades de Saúde (Medicamentos/Alergias)"""
-    health_notes = []
-    for col in ['saude_medicamentos_qual', 'saude_alergias_qual', 'saude_problemas_qual']:
-        if col in df.columns:
-            health_notes.extend(df[col].dropna().astype(str).tolist())
-            
-    if not health_notes:
-        return None
-        
-    return generate_wordcloud(health_notes, "Perfil de Medicamentos e Alergias")
+    terms = cube_for(df).terms('saude_medicamentos_qual', 'saude_alergias_qual', 'saude_problemas_qual')
+    return wordcloud_image(terms, "Perfil de Medicamentos e Alergias")
 
 def chart_42_work_start_hours(df):
     """42. Histograma de Horário de Início do Trabalho"""
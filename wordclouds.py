@@ -0,0 +1,105 @@
+import io
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from importlib.metadata import version, PackageNotFoundError
+import pandas as pd
+import image_cache
+from text_utils import fold
+
+# Nuvens de palavras a partir de tabelas de frequência de termos.
+# Cada valor distinto de texto livre é tokenizado uma única vez (stopwords em
+# português, comparação sem acentos/maiúsculas) e a tabela de uma coluna é a
+# soma das contagens dos seus valores, então uma nova versão da base só
+# tokeniza os textos novos. A imagem sai direto das frequências (sem
+# matplotlib) e fica no cache de imagens, endereçada pelo hash da tabela.
+MAX_WORDS = 50
+CLOUD_SIZE = (800, 400)
+CANVAS_SIZE = (1000, 500)   # mesmo tamanho do PNG gerado antes pelo matplotlib
+TITLE_FONT_PX = 22
+TOKEN_CACHE_SIZE = 50_000   # textos distintos tokenizados mantidos em memória
+
+# Tons escuros da escala RdBu (os tons claros somem no fundo branco)
+PALETTE = ['#67001f', '#b2182b', '#d6604d', '#f4a582', '#92c5de', '#4393c3', '#2166ac', '#053061']
+
+# Sem acentos, pois a comparação é feita sobre o texto já "dobrado"
+PT_STOPWORDS = frozenset("""
+a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela delas dele deles
+depois do dos e ela elas ele eles em entre era eram essa essas esse esses esta estas este estes
+eu foi foram ha isso isto ja la lhe lhes mais mas me mesmo meu meus minha minhas muito na nas
+nao nem no nos nossa nossas nosso nossos num numa o os ou para pela pelas pelo pelos por qual
+quando que quem se sem ser seu seus so sua suas tambem te tem ter teu tua um uma umas uns voce
+voces vou pra pro etc sim outro outra outros outras nada nenhum nenhuma
+""".split())
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+(?:[-'][^\W\d_]+)*")
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+# Entra na chave do cache: outra versão do wordcloud pode dispor as palavras de outro jeito
+RENDER_OPTIONS = {'format': 'png', 'tipo': 'nuvem', 'max_palavras': MAX_WORDS,
+                  'tamanho': CANVAS_SIZE, 'wordcloud': _package_version('wordcloud')}
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def tokenize(text):
+    """((termo sem acento, forma original em minúsculas), ...) de um texto, sem stopwords."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        surface = match.group()
+        key = fold(surface)
+        if len(key) > 1 and key not in PT_STOPWORDS:
+            tokens.append((key, surface))
+    return tuple(tokens)
+
+def term_frequencies(*columns):
+    """{termo: ocorrências} de uma ou mais séries de texto, em ordem decrescente.
+
+    Variantes com/sem acento contam juntas e aparecem com a grafia mais usada.
+    """
+    counts = Counter()
+    forms = defaultdict(Counter)
+    for column in columns:
+        for value, n in pd.Series(column, dtype=object).dropna().astype(str).value_counts().items():
+            for key, surface in tokenize(value):
+                counts[key] += n
+                forms[key][surface] += n
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return {forms[key].most_common(1)[0][0]: n for key, n in ranked}
+
+def _palette_color(word, font_size, position, orientation, random_state=None, **kwargs):
+    return PALETTE[random_state.randint(0, len(PALETTE) - 1)]
+
+def render_wordcloud(frequencies, title):
+    """PNG (bytes) da nuvem com o título em cima, desenhado direto com o Pillow."""
+    from PIL import Image, ImageDraw, ImageFont
+    from wordcloud import WordCloud
+    from wordcloud.wordcloud import FONT_PATH
+
+    cloud = WordCloud(width=CLOUD_SIZE[0], height=CLOUD_SIZE[1], background_color='white',
+                      max_words=MAX_WORDS, color_func=_palette_color, random_state=42)
+    cloud = cloud.generate_from_frequencies(frequencies).to_image()
+
+    canvas = Image.new('RGB', CANVAS_SIZE, 'white')
+    draw = ImageDraw.Draw(canvas)
+    font = ImageFont.truetype(FONT_PATH, TITLE_FONT_PX)
+    title_width = draw.textlength(title, font=font)
+    draw.text(((CANVAS_SIZE[0] - title_width) / 2, 25), title, fill='black', font=font)
+    canvas.paste(cloud, ((CANVAS_SIZE[0] - CLOUD_SIZE[0]) // 2, 70))
+
+    out = io.BytesIO()
+    canvas.save(out, format='PNG')
+    return out.getvalue()
+
+def wordcloud_image(frequencies, title):
+    """BytesIO com o PNG da nuvem (do cache de imagens, se a tabela já foi desenhada), ou None."""
+    if not frequencies:
+        return None
+    # O WordCloud só usa os MAX_WORDS termos mais frequentes: são eles que definem a imagem
+    top = dict(list(frequencies.items())[:MAX_WORDS])
+    spec = {'titulo': title, 'termos': list(top.items())}
+    data = image_cache.cached_render(spec, RENDER_OPTIONS, lambda: render_wordcloud(top, title))
+    return io.BytesIO(data)